@@ -0,0 +1,231 @@
+import asyncio
+import os
+from typing import Optional, Dict, Any, List, Iterable, Union
+
+import httpx
+
+from src.api.env import load_env
+from src.api.id_journal import IdJournal
+from src.models.schemas import (
+    ItemCreate, ItemUpdate, ItemResponse,
+    ItemsListResponse, TokenResponse
+)
+
+
+class AsyncItemsAPIClient:
+    """Асинхронный клиент для работы с Items API
+
+    Использование:
+        async with AsyncItemsAPIClient(concurrency=50) as client:
+            items = await client.create_many(payloads)
+    """
+
+    def __init__(
+            self,
+            concurrency: int = 20,
+            timeout: float = 30.0,
+            transport: Optional[httpx.AsyncBaseTransport] = None,
+            username: Optional[str] = None,
+            password: Optional[str] = None,
+            journal: bool = True
+    ):
+        """
+        concurrency - максимум одновременных запросов в bulk-операциях
+        timeout - таймаут одного запроса в секундах
+        transport - альтернативный транспорт httpx (например, для локального стенда)
+        username, password - учётная запись (по умолчанию первая из load_credentials:
+            USER_CREDENTIALS_FILE, USER_CREDENTIALS или USER_EMAIL/USER_PASSWORD)
+        journal - журнал ID созданных элементов, общий с ItemsAPIClient (ITEMS_JOURNAL_DIR)
+        """
+        load_env()
+        self.base_url = os.getenv("BASE_URL", "https://api.fast-api.senior-pomidorov.ru")
+        if username is None:
+            from src.api.credential_pool import load_credentials
+
+            username, password = load_credentials()[0]
+        self.username = username
+        self._password = password
+        self.journal = IdJournal.acquire(self.base_url, self.username) if journal else None
+        self.concurrency = concurrency
+        self.token: Optional[str] = None
+        self.headers: Dict[str, str] = {
+            "Content-Type": "application/json",
+            "Accept": "application/json"
+        }
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=concurrency,
+                max_keepalive_connections=concurrency
+            ),
+            transport=transport
+        )
+
+    async def __aenter__(self):
+        await self.login()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def close(self):
+        """Закрытие пула соединений"""
+        await self._client.aclose()
+        if self.journal is not None:
+            self.journal.release()
+            self.journal = None
+
+    async def login(self) -> str:
+        """Получение токена авторизации"""
+        auth_data = {
+            "username": self.username,
+            "password": self._password
+        }
+
+        print(f"🔐 Getting token for user: {auth_data['username']}")
+
+        response = await self._client.post(
+            "/api/v1/login/access-token",
+            data=auth_data,
+            headers={"Content-Type": "application/x-www-form-urlencoded"}
+        )
+
+        if response.status_code != 200:
+            raise Exception(f"Auth failed: {response.status_code} - {response.text}")
+
+        token_response = TokenResponse.parse_obj(response.json())
+        self.token = token_response.access_token
+        self.headers["Authorization"] = f"Bearer {self.token}"
+        print(f"✅ Async API Client initialized for {self.base_url}")
+        return self.token
+
+    async def _create(self, item_data: Dict[str, Any]) -> ItemResponse:
+        ItemCreate(**item_data)
+
+        response = await self._client.post("/api/v1/items/", json=item_data, headers=self.headers)
+
+        if response.status_code not in [200, 201]:
+            response.raise_for_status()
+
+        item = ItemResponse.parse_obj(response.json())
+        if self.journal is not None:
+            self.journal.created(item.id)
+        return item
+
+    async def _delete(self, item_id: str) -> bool:
+        response = await self._client.delete(f"/api/v1/items/{item_id}", headers=self.headers)
+
+        if response.status_code not in [200, 204]:
+            response.raise_for_status()
+
+        if self.journal is not None:
+            self.journal.deleted(item_id)
+        return True
+
+    async def create_item(self, item_data: Dict[str, Any]) -> ItemResponse:
+        """POST /api/v1/items/ - создание элемента"""
+        print(f"📝 Creating item: {item_data['title'][:30]}...")
+
+        try:
+            return await self._create(item_data)
+        except httpx.HTTPStatusError as e:
+            print(f"❌ Create failed: {e.response.status_code} - {e.response.text}")
+            raise
+
+    async def get_items(
+            self,
+            page: int = 1,
+            size: int = 10,
+            sort_by: Optional[str] = None,
+            order: str = "asc",
+            search: Optional[str] = None
+    ) -> ItemsListResponse:
+        """GET /api/v1/items/ - получение списка элементов"""
+        params = {"page": page, "size": size}
+        if sort_by:
+            params.update({"sort_by": sort_by, "order": order})
+        if search:
+            params["search"] = search
+
+        print(f"📋 Getting items page {page}, size {size}")
+
+        response = await self._client.get("/api/v1/items/", params=params, headers=self.headers)
+
+        if response.status_code != 200:
+            print(f"❌ Get items failed: {response.status_code} - {response.text}")
+            response.raise_for_status()
+
+        return ItemsListResponse.parse_obj(response.json())
+
+    async def update_item(self, item_id: str, item_data: Dict[str, Any]) -> ItemResponse:
+        """PUT /api/v1/items/{id} - полное обновление элемента"""
+        ItemUpdate(**item_data)
+
+        print(f"🔄 Updating item {item_id}")
+
+        response = await self._client.put(f"/api/v1/items/{item_id}", json=item_data, headers=self.headers)
+
+        if response.status_code != 200:
+            print(f"❌ Update failed: {response.status_code} - {response.text}")
+            response.raise_for_status()
+
+        return ItemResponse.parse_obj(response.json())
+
+    async def delete_item(self, item_id: str) -> bool:
+        """DELETE /api/v1/items/{id} - удаление элемента"""
+        print(f"🗑️ Deleting item {item_id}")
+
+        try:
+            await self._delete(item_id)
+        except httpx.HTTPStatusError as e:
+            print(f"❌ Delete failed: {e.response.status_code} - {e.response.text}")
+            raise
+
+        print(f"✅ Item {item_id} deleted")
+        return True
+
+    async def get_item_by_id(self, item_id: str) -> ItemResponse:
+        """Получение элемента по ID (для проверки)"""
+        response = await self._client.get(f"/api/v1/items/{item_id}", headers=self.headers)
+
+        if response.status_code != 200:
+            print(f"❌ Get item failed: {response.status_code} - {response.text}")
+            response.raise_for_status()
+
+        return ItemResponse.parse_obj(response.json())
+
+    async def _bounded(self, coro):
+        async with self._semaphore:
+            return await coro
+
+    async def create_many(
+            self,
+            items: Iterable[Dict[str, Any]],
+            return_exceptions: bool = False
+    ) -> List[Union[ItemResponse, BaseException]]:
+        """Параллельное создание элементов (не более concurrency запросов одновременно)"""
+        payloads = list(items)
+        results = await asyncio.gather(
+            *(self._bounded(self._create(data)) for data in payloads),
+            return_exceptions=return_exceptions
+        )
+        failed = sum(1 for r in results if isinstance(r, BaseException))
+        print(f"📦 Created {len(payloads) - failed}/{len(payloads)} items")
+        return results
+
+    async def delete_many(
+            self,
+            item_ids: Iterable[str],
+            return_exceptions: bool = False
+    ) -> List[Union[bool, BaseException]]:
+        """Параллельное удаление элементов (не более concurrency запросов одновременно)"""
+        ids = list(item_ids)
+        results = await asyncio.gather(
+            *(self._bounded(self._delete(item_id)) for item_id in ids),
+            return_exceptions=return_exceptions
+        )
+        failed = sum(1 for r in results if isinstance(r, BaseException))
+        print(f"🗑️ Deleted {len(ids) - failed}/{len(ids)} items")
+        return results
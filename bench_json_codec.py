@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк JSON-кодеков и gzip на страницах ItemsListResponse разного размера
+
+Для каждого установленного кодека (json, ujson, orjson) измеряется
+кодирование и декодирование страницы, а также стоимость и выигрыш gzip.
+"""
+import gzip
+import sys
+import timeit
+from pathlib import Path
+
+current_dir = Path(__file__).parent
+sys.path.insert(0, str(current_dir))
+
+from src.api import json_codec
+from bench_validation import make_payload
+
+
+def bench(sizes=(100, 1000, 10000), repeat: int = 5):
+    print(f"Кодек по умолчанию: {json_codec.NAME}; доступны: {', '.join(json_codec.CODECS)}\n")
+    print(f"{'size':>7} | {'codec':<7} | {'encode, мс':>10} | {'decode, мс':>10} | "
+          f"{'gzip, мс':>9} | {'gunzip, мс':>10} | {'raw, КБ':>8} | {'gzip, КБ':>8}")
+    print("-" * 92)
+    for size in sizes:
+        payload = json_codec.CODECS["json"][1](make_payload(size))
+        number = max(1, 20000 // size)
+
+        def best(stmt) -> float:
+            return min(timeit.repeat(stmt, number=number, repeat=repeat)) / number * 1000
+
+        body = json_codec.CODECS["json"][0](payload)
+        compressed = gzip.compress(body, compresslevel=5)
+        gzip_ms = best(lambda: gzip.compress(body, compresslevel=5))
+        gunzip_ms = best(lambda: gzip.decompress(compressed))
+
+        for name, (dumps, loads) in json_codec.CODECS.items():
+            encoded = dumps(payload)
+            encode_ms = best(lambda: dumps(payload))
+            decode_ms = best(lambda: loads(encoded))
+            print(f"{size:>7} | {name:<7} | {encode_ms:>10.2f} | {decode_ms:>10.2f} | "
+                  f"{gzip_ms:>9.2f} | {gunzip_ms:>10.2f} | {len(body) / 1024:>8.1f} | {len(compressed) / 1024:>8.1f}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Бенчмарк JSON-кодеков и gzip для ItemsListResponse")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000],
+                        help="Размеры страниц (по умолчанию: 100 1000 10000)")
+    parser.add_argument("--repeat", type=int, default=5, help="Количество повторов (по умолчанию: 5)")
+    args = parser.parse_args()
+    bench(args.sizes, args.repeat)
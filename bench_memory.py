@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк памяти для больших выгрузок элементов
+
+Сравнивает объём, удерживаемый результатом, и время построения:
+  models   - ItemsListResponse.parse_obj (validation="full")
+  construct - модели через construct() (validation="none")
+  raw      - словари из JSON (get_items(raw=True))
+  columnar - ColumnarItems (scan_items)
+Память считается через tracemalloc: сколько остаётся занято после
+построения, когда разобранный JSON уже освобождён.
+"""
+import gc
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+current_dir = Path(__file__).parent
+sys.path.insert(0, str(current_dir))
+
+from src.api import json_codec
+from src.api.items_client import build_model
+from src.models.columnar_items import ColumnarItems
+from src.models.schemas import ItemsListResponse
+from bench_validation import make_payload
+
+VARIANTS = {
+    "models": lambda payload: build_model(ItemsListResponse, payload, validate=True),
+    "construct": lambda payload: build_model(ItemsListResponse, payload, validate=False),
+    "raw": lambda payload: payload,
+    "columnar": lambda payload: ColumnarItems(payload["data"])
+}
+
+
+def rows(result):
+    if isinstance(result, dict):
+        return result["data"]
+    return getattr(result, "data", result)
+
+
+def measure(build, body: bytes):
+    """(удерживаемые байты, время построения в секундах, время обхода всех строк в секундах)"""
+    # Время - без tracemalloc (он сильно замедляет выделение памяти), память - отдельным построением
+    payload = json_codec.loads(body)
+    started = time.perf_counter()
+    build(payload)
+    built = time.perf_counter() - started
+    del payload
+
+    gc.collect()
+    tracemalloc.start()
+    result = build(json_codec.loads(body))
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    started = time.perf_counter()
+    for _ in rows(result):
+        pass
+    return retained, built, time.perf_counter() - started
+
+
+def bench(sizes=(10000, 100000), variants=tuple(VARIANTS)):
+    print(f"{'items':>8} | {'variant':<9} | {'retained, МБ':>12} | {'байт/элемент':>12} | "
+          f"{'build, с':>8} | {'iterate, с':>10}")
+    print("-" * 76)
+    for size in sizes:
+        body = make_payload(size)
+        for name in variants:
+            retained, built, iterated = measure(VARIANTS[name], body)
+            print(f"{size:>8} | {name:<9} | {retained / 2 ** 20:>12.1f} | {retained / size:>12.0f} | "
+                  f"{built:>8.2f} | {iterated:>10.2f}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Бенчмарк памяти: модели, словари и колоночный список")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000],
+                        help="Количество элементов (по умолчанию: 10000 100000)")
+    parser.add_argument("--variants", nargs="+", choices=list(VARIANTS), default=list(VARIANTS),
+                        help="Варианты для сравнения (по умолчанию: все)")
+    args = parser.parse_args()
+    bench(args.sizes, args.variants)
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк старта: время импорта модулей и время до первого теста pytest
+
+Каждый замер - отдельный процесс Python, берётся минимум и медиана по
+нескольким повторам. Время до первого теста считается от запуска процесса
+до начала первого теста (этот файл подключается к pytest как плагин).
+"""
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+current_dir = Path(__file__).parent
+
+MODULES = (
+    "src.api.items_client",
+    "src.api.async_items_client",
+    "src.models.schemas",
+    "requests",
+    "pydantic",
+    "dotenv",
+    "faker",
+    "allure"
+)
+FIRST_TEST = "test_item_negative.py::TestItemsNegative::test_get_items_without_token"
+STARTED_ENV = "BENCH_STARTUP_STARTED"
+REPORT_ENV = "BENCH_STARTUP_REPORT"
+IMPORT_TIME_RE = re.compile(r"import time:\s+\d+ \|\s+(\d+) \| (.+)$")
+
+
+def pytest_runtest_call(item):
+    """Хук плагина: момент начала первого теста (только при запуске из бенчмарка)"""
+    report = os.getenv(REPORT_ENV)
+    if report and not os.path.exists(report):
+        with open(report, "w") as f:
+            f.write(str(time.time() - float(os.environ[STARTED_ENV])))
+
+
+def import_time(module: str) -> float:
+    """Кумулятивное время импорта модуля в чистом интерпретаторе, мс"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=current_dir, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    for line in reversed(result.stderr.splitlines()):
+        match = IMPORT_TIME_RE.match(line)
+        if match and match.group(2).strip() == module:
+            return int(match.group(1)) / 1000
+    raise RuntimeError(f"No import time reported for {module}")
+
+
+def time_to_first_test(pytest_args) -> float:
+    """Время от запуска pytest до начала первого теста, мс"""
+    report = current_dir / f".bench_startup.{os.getpid()}"
+    env = dict(os.environ, **{STARTED_ENV: repr(time.time()), REPORT_ENV: str(report)})
+    try:
+        subprocess.run(
+            [sys.executable, "-m", "pytest", "-q", "-p", "bench_startup", "-p", "no:cacheprovider", *pytest_args],
+            cwd=current_dir, env=env, capture_output=True
+        )
+        if not report.exists():
+            raise RuntimeError(f"No test started for: pytest {' '.join(pytest_args)}")
+        return float(report.read_text()) * 1000
+    finally:
+        report.unlink(missing_ok=True)
+
+
+def measure(func, *args, repeat: int):
+    samples = [func(*args) for _ in range(repeat)]
+    return min(samples), statistics.median(samples)
+
+
+def bench(modules=MODULES, pytest_args=(FIRST_TEST, "--fake-api"), repeat: int = 5):
+    print(f"{'module':<28} | {'min, мс':>8} | {'median, мс':>10}")
+    print("-" * 52)
+    for module in modules:
+        try:
+            best, median = measure(import_time, module, repeat=repeat)
+        except RuntimeError as e:
+            print(f"{module:<28} | {'-':>8} | {'-':>10}  ({e})")
+            continue
+        print(f"{module:<28} | {best:>8.1f} | {median:>10.1f}")
+
+    best, median = measure(time_to_first_test, list(pytest_args), repeat=repeat)
+    print(f"\n⏱️ До первого теста ({' '.join(pytest_args)}): min {best:.0f} мс, median {median:.0f} мс")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Бенчмарк времени импорта и старта pytest")
+    parser.add_argument("--modules", nargs="+", default=list(MODULES),
+                        help="Модули для замера времени импорта")
+    parser.add_argument("--repeat", type=int, default=5, help="Количество повторов (по умолчанию: 5)")
+    parser.add_argument("pytest_args", nargs="*", default=[FIRST_TEST, "--fake-api"],
+                        help=f"Аргументы pytest для замера до первого теста (по умолчанию: {FIRST_TEST} --fake-api)")
+    args = parser.parse_args()
+    bench(args.modules, args.pytest_args, args.repeat)
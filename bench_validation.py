@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Микро-бенчмарк режимов валидации ответа ItemsListResponse
+
+Сравнивает на синтетических страницах разного размера:
+  full - ItemsListResponse.parse_obj (режим validation="full")
+  none - construct() без валидации (режим validation="none")
+  raw  - только словарь из JSON (get_items(raw=True))
+"""
+import json
+import sys
+import timeit
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+current_dir = Path(__file__).parent
+sys.path.insert(0, str(current_dir))
+
+from src.api.items_client import build_model
+from src.models.schemas import ItemsListResponse
+
+
+def make_payload(size: int) -> bytes:
+    """JSON страницы списка с size элементами"""
+    owner_id = str(uuid.uuid4())
+    now = datetime.now(timezone.utc).isoformat()
+    data = [
+        {
+            "id": str(uuid.uuid4()),
+            "title": f"Test Item {i}: Benchmark",
+            "description": "Lorem ipsum dolor sit amet, consectetur adipiscing elit." * 2,
+            "owner_id": owner_id,
+            "created_at": now,
+            "updated_at": now
+        }
+        for i in range(size)
+    ]
+    return json.dumps({"data": data, "count": size}).encode()
+
+
+def bench(sizes=(100, 1000, 10000), repeat: int = 5):
+    print(f"{'size':>7} | {'full, мс':>10} | {'none, мс':>10} | {'raw, мс':>10} | {'full/none':>9}")
+    print("-" * 60)
+    for size in sizes:
+        body = make_payload(size)
+        number = max(1, 20000 // size)
+
+        def best(stmt) -> float:
+            return min(timeit.repeat(stmt, number=number, repeat=repeat)) / number * 1000
+
+        full = best(lambda: build_model(ItemsListResponse, json.loads(body), validate=True))
+        none = best(lambda: build_model(ItemsListResponse, json.loads(body), validate=False))
+        raw = best(lambda: json.loads(body))
+        print(f"{size:>7} | {full:>10.2f} | {none:>10.2f} | {raw:>10.2f} | {full / none:>8.1f}x")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Бенчмарк режимов валидации ItemsListResponse")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000],
+                        help="Размеры страниц (по умолчанию: 100 1000 10000)")
+    parser.add_argument("--repeat", type=int, default=5, help="Количество повторов (по умолчанию: 5)")
+    args = parser.parse_args()
+    bench(args.sizes, args.repeat)
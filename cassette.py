@@ -0,0 +1,176 @@
+import base64
+import json
+import threading
+from datetime import timedelta
+from pathlib import Path
+from typing import Dict, List, Any
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+CASSETTE_MODES = ("record", "replay")
+LOGIN_PATH = "/api/v1/login/access-token"
+# Заголовки, которые не имеет смысла сохранять в кассету
+SKIPPED_HEADERS = {"content-encoding", "transfer-encoding", "connection", "keep-alive", "date"}
+# Токен из ответа логина в кассету не пишется; при replay клиенту достаточно любой строки
+REDACTED_TOKEN = "redacted"
+
+
+class CassetteMiss(requests.ConnectionError):
+    """В кассете нет ответа на запрос (replay)"""
+
+
+def _normalize_body(path: str, body: Any, content_type: str) -> str:
+    if path == LOGIN_PATH or not body:
+        # Учётные данные в ключ (и в файл) не попадают
+        return ""
+    if isinstance(body, bytes):
+        body = body.decode("utf-8", errors="replace")
+    if "json" in content_type:
+        try:
+            # ensure_ascii: одиночные суррогаты (fuzz) не записываются в UTF-8 файл как есть
+            return json.dumps(json.loads(body), sort_keys=True, separators=(",", ":"))
+        except (ValueError, RecursionError):
+            return body
+    if "x-www-form-urlencoded" in content_type:
+        return urlencode(sorted(parse_qsl(body, keep_blank_values=True)))
+    return body
+
+
+def _redact_login(path: str, body: str) -> str:
+    if path != LOGIN_PATH:
+        return body
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        return body
+    if not isinstance(payload, dict) or "access_token" not in payload:
+        return body
+    payload["access_token"] = REDACTED_TOKEN
+    return json.dumps(payload)
+
+
+def make_key(request: requests.PreparedRequest) -> str:
+    """Ключ записи: метод, путь, отсортированный query и нормализованное тело (без хоста)"""
+    url = urlsplit(request.url)
+    query = urlencode(sorted(parse_qsl(url.query, keep_blank_values=True)))
+    body = _normalize_body(url.path, request.body, request.headers.get("Content-Type", ""))
+    return f"{request.method} {url.path}?{query} {body}".replace("\t", " ").replace("\n", " ")
+
+
+class Cassette:
+    """Запись и воспроизведение HTTP-обменов в JSONL-кассете
+
+    Каждая строка файла - "<ключ>\\t<JSON ответа>". При загрузке для replay
+    разбирается только ключ, JSON ответа декодируется при первом обращении,
+    поэтому даже десятки тысяч записей индексируются за доли секунды.
+    Одинаковые запросы воспроизводятся в порядке записи, последний ответ
+    повторяется, если запросов больше, чем записей.
+    """
+
+    def __init__(self, path: str, mode: str = "replay", append: bool = False):
+        """append - дописывать в существующую кассету (record), а не начинать её заново"""
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"Cassette mode must be one of {CASSETTE_MODES}, got {mode!r}")
+        self.path = Path(path)
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._index: Dict[str, List[str]] = {}
+        self._cursors: Dict[str, int] = {}
+        self._file = None
+        if mode == "replay":
+            self._load()
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "a" if append else "w", encoding="utf-8")
+
+    def _load(self):
+        index = self._index
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                key, _, record = line.rstrip("\n").partition("\t")
+                entries = index.get(key)
+                if entries is None:
+                    index[key] = [record]
+                else:
+                    entries.append(record)
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._index.values())
+
+    def __contains__(self, request: requests.PreparedRequest) -> bool:
+        """Есть ли в кассете (replay) ответ на такой запрос"""
+        return make_key(request) in self._index
+
+    def record(self, request: requests.PreparedRequest, response: requests.Response):
+        content = response.content
+        try:
+            body, encoding = _redact_login(urlsplit(request.url).path, content.decode("utf-8")), "utf-8"
+        except UnicodeDecodeError:
+            body, encoding = base64.b64encode(content).decode(), "base64"
+        record = {
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": {k: v for k, v in response.headers.items() if k.lower() not in SKIPPED_HEADERS},
+            "body": body,
+            "encoding": encoding
+        }
+        line = f"{make_key(request)}\t{json.dumps(record)}\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+
+    def replay(self, request: requests.PreparedRequest) -> requests.Response:
+        key = make_key(request)
+        with self._lock:
+            entries = self._index.get(key)
+            if not entries:
+                raise CassetteMiss(f"No recorded response for {key!r} in {self.path}", request=request)
+            cursor = self._cursors.get(key, 0)
+            self._cursors[key] = cursor + 1
+            raw = entries[min(cursor, len(entries) - 1)]
+
+        record = json.loads(raw)
+        response = requests.Response()
+        response.status_code = record["status"]
+        response.reason = record.get("reason")
+        response.headers = CaseInsensitiveDict(record["headers"])
+        body = record["body"]
+        response._content = base64.b64decode(body) if record["encoding"] == "base64" else body.encode("utf-8")
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        response.elapsed = timedelta(0)
+        return response
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class CassetteAdapter(HTTPAdapter):
+    """Транспорт requests, пишущий обмены в кассету или отвечающий из неё"""
+
+    def __init__(self, cassette: Cassette, **kwargs):
+        super().__init__(**kwargs)
+        self.cassette = cassette
+
+    def send(self, request, **kwargs):
+        if self.cassette.mode == "replay":
+            response = self.cassette.replay(request)
+            response.connection = self
+            return response
+        response = super().send(request, **kwargs)
+        self.cassette.record(request, response)
+        return response
+
+
+def mount_cassette(session: requests.Session, cassette: Cassette, **adapter_kwargs) -> requests.Session:
+    """Подключение кассеты ко всем запросам сессии"""
+    adapter = CassetteAdapter(cassette, **adapter_kwargs)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
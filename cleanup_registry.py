@@ -0,0 +1,96 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import List, Dict, Any
+
+from requests import HTTPError
+
+# Ответы, означающие, что элемента уже нет (удалён тестом или никогда не существовал)
+ALREADY_GONE_STATUSES = (404, 422)
+
+
+class CleanupRegistry:
+    """Отложенное пакетное удаление созданных в тестах элементов
+
+    Тесты и фикстуры только регистрируют ID, а удаление выполняется
+    параллельно пачками - при достижении порога batch_size (в фоне)
+    и в конце сессии (close).
+    """
+
+    def __init__(self, client, batch_size: int = 50, workers: int = 8):
+        self.client = client
+        self.batch_size = batch_size
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="cleanup")
+        self._lock = threading.Lock()
+        self._pending: List[str] = []
+        self._in_flight: List[Future] = []
+        self.registered = 0
+        self.deleted = 0
+        self.already_gone = 0
+        self.failed: Dict[str, str] = {}
+
+    def register(self, item_id: str):
+        """Поставить элемент в очередь на удаление"""
+        with self._lock:
+            self._pending.append(item_id)
+            self.registered += 1
+            batch = self._take_batch() if len(self._pending) >= self.batch_size else []
+        if batch:
+            self._submit(batch)
+
+    def _take_batch(self) -> List[str]:
+        batch, self._pending = self._pending, []
+        return batch
+
+    def _submit(self, batch: List[str]):
+        futures = [self._executor.submit(self._delete, item_id) for item_id in batch]
+        with self._lock:
+            self._in_flight.extend(futures)
+
+    def _delete(self, item_id: str):
+        try:
+            self.client.delete_item(item_id)
+        except HTTPError as e:
+            status = e.response.status_code if e.response is not None else None
+            with self._lock:
+                if status in ALREADY_GONE_STATUSES:
+                    self.already_gone += 1
+                else:
+                    self.failed[item_id] = str(e)
+            return
+        except Exception as e:
+            with self._lock:
+                self.failed[item_id] = str(e)
+            return
+        with self._lock:
+            self.deleted += 1
+
+    def flush(self):
+        """Удалить всё, что накопилось, и дождаться завершения"""
+        with self._lock:
+            batch = self._take_batch()
+        if batch:
+            self._submit(batch)
+        with self._lock:
+            in_flight, self._in_flight = self._in_flight, []
+        for future in in_flight:
+            future.result()
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "registered": self.registered,
+                "deleted": self.deleted,
+                "already_gone": self.already_gone,
+                "leaked": sorted(self.failed)
+            }
+
+    def close(self) -> Dict[str, Any]:
+        """Финальная уборка; возвращает сводку, в leaked - ID, которые удалить не удалось"""
+        self.flush()
+        self._executor.shutdown(wait=True)
+        summary = self.summary()
+        print(f"\n🧹 Cleanup: registered {summary['registered']}, deleted {summary['deleted']}, "
+              f"already gone {summary['already_gone']}, leaked {len(summary['leaked'])}")
+        for item_id in summary["leaked"]:
+            print(f"⚠️ Leaked item {item_id}: {self.failed[item_id]}")
+        return summary
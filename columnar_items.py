@@ -0,0 +1,188 @@
+from array import array
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, Any, Iterable, Iterator, List, NamedTuple, Union
+
+from src.models.schemas import ItemResponse
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+# Значение колонки времени для None
+_NO_TIME = -(2 ** 63)
+
+# Флаги строки
+_DESCRIPTION_NONE = 1
+_CREATED_NAIVE = 2
+_UPDATED_NAIVE = 4
+
+
+def _field(item: Any, name: str) -> Any:
+    return item.get(name) if isinstance(item, dict) else getattr(item, name)
+
+
+class _TextColumn:
+    """Строки одним UTF-8 буфером со смещениями - без отдельного объекта str на строку"""
+
+    def __init__(self):
+        self.blob = bytearray()
+        self.offsets = array("Q", [0])
+
+    def append(self, value: str):
+        self.blob += value.encode("utf-8", "surrogatepass")
+        self.offsets.append(len(self.blob))
+
+    def __getitem__(self, row: int) -> str:
+        return self.blob[self.offsets[row]:self.offsets[row + 1]].decode("utf-8", "surrogatepass")
+
+    def nbytes(self) -> int:
+        return len(self.blob) + self.offsets.itemsize * len(self.offsets)
+
+
+class ColumnarItems:
+    """Компактный список элементов: поля хранятся колонками, ItemResponse строится при обращении
+
+    id - 16 байт UUID (нестандартная запись ID хранится как есть), owner_id -
+    индекс в таблице уникальных владельцев, created_at/updated_at - целые
+    микросекунды от эпохи, title/description - UTF-8 буферы. Строки,
+    полученные из списка, не кэшируются: каждое обращение строит новую модель.
+    """
+
+    def __init__(self, items: Iterable[Any] = ()):
+        self._ids = bytearray()
+        self._odd_ids: Dict[int, str] = {}
+        self._titles = _TextColumn()
+        self._descriptions = _TextColumn()
+        self._owners: List[str] = []
+        self._owner_index: Dict[str, int] = {}
+        self._owner_rows = array("I")
+        self._created = array("q")
+        self._updated = array("q")
+        self._flags = bytearray()
+        self.extend(items)
+
+    @staticmethod
+    def _time(value: Union[str, datetime, None]):
+        """(микросекунды, без часового пояса ли значение)"""
+        if value is None:
+            return _NO_TIME, False
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        naive = value.tzinfo is None
+        if naive:
+            value = value.replace(tzinfo=timezone.utc)
+        return (value - _EPOCH) // _MICROSECOND, naive
+
+    @staticmethod
+    def _datetime(micros: int, naive: bool) -> Optional[datetime]:
+        if micros == _NO_TIME:
+            return None
+        value = _EPOCH + timedelta(microseconds=micros)
+        return value.replace(tzinfo=None) if naive else value
+
+    @staticmethod
+    def _pack_id(item_id: str) -> Optional[bytes]:
+        """16 байт канонического UUID (строчные hex с дефисами) или None для любой другой записи"""
+        if (
+                isinstance(item_id, str) and len(item_id) == 36
+                and item_id[8] == item_id[13] == item_id[18] == item_id[23] == "-"
+                and item_id == item_id.lower()
+        ):
+            try:
+                return bytes.fromhex(item_id.replace("-", ""))
+            except ValueError:
+                return None
+        return None
+
+    def append(self, item: Union[Dict[str, Any], ItemResponse]):
+        """Добавление элемента (словарь из JSON ответа или ItemResponse)"""
+        row = len(self._flags)
+        item_id = _field(item, "id")
+        packed = self._pack_id(item_id)
+        if packed is None:
+            packed = bytes(16)
+            self._odd_ids[row] = item_id
+        self._ids += packed
+
+        self._titles.append(_field(item, "title"))
+        description = _field(item, "description")
+        self._descriptions.append(description or "")
+
+        owner_id = _field(item, "owner_id")
+        owner = self._owner_index.get(owner_id)
+        if owner is None:
+            owner = self._owner_index[owner_id] = len(self._owners)
+            self._owners.append(owner_id)
+        self._owner_rows.append(owner)
+
+        created_at = _field(item, "created_at")
+        updated_at = _field(item, "updated_at")
+        created, created_naive = self._time(created_at)
+        # У нового элемента created_at и updated_at обычно совпадают
+        updated, updated_naive = (created, created_naive) if updated_at == created_at else self._time(updated_at)
+        self._created.append(created)
+        self._updated.append(updated)
+        self._flags.append(
+            (_DESCRIPTION_NONE if description is None else 0)
+            | (_CREATED_NAIVE if created_naive else 0)
+            | (_UPDATED_NAIVE if updated_naive else 0)
+        )
+
+    def extend(self, items: Iterable[Any]):
+        for item in items:
+            self.append(item)
+
+    def __len__(self) -> int:
+        return len(self._flags)
+
+    def id(self, row: int) -> str:
+        odd = self._odd_ids.get(row)
+        if odd is not None:
+            return odd
+        h = self._ids[row * 16:row * 16 + 16].hex()
+        return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+    def ids(self) -> Iterator[str]:
+        """ID по порядку без построения моделей (например, для сравнения выгрузок)"""
+        return (self.id(row) for row in range(len(self)))
+
+    def _row(self, row: int) -> ItemResponse:
+        flags = self._flags[row]
+        return ItemResponse.construct(
+            id=self.id(row),
+            title=self._titles[row],
+            description=None if flags & _DESCRIPTION_NONE else self._descriptions[row],
+            owner_id=self._owners[self._owner_rows[row]],
+            created_at=self._datetime(self._created[row], bool(flags & _CREATED_NAIVE)),
+            updated_at=self._datetime(self._updated[row], bool(flags & _UPDATED_NAIVE))
+        )
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[ItemResponse, List[ItemResponse]]:
+        if isinstance(index, slice):
+            return [self._row(row) for row in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("ColumnarItems index out of range")
+        return self._row(index)
+
+    def __iter__(self) -> Iterator[ItemResponse]:
+        return (self._row(row) for row in range(len(self)))
+
+    def nbytes(self) -> int:
+        """Приблизительный объём колонок в байтах (без таблицы владельцев и нестандартных ID)"""
+        return (
+            len(self._ids) + self._titles.nbytes() + self._descriptions.nbytes()
+            + self._owner_rows.itemsize * len(self._owner_rows)
+            + self._created.itemsize * len(self._created) + self._updated.itemsize * len(self._updated)
+            + len(self._flags)
+        )
+
+
+class ColumnarItemsList(NamedTuple):
+    """Аналог ItemsListResponse с колоночным data"""
+    data: ColumnarItems
+    count: int
+
+    @classmethod
+    def from_response(cls, payload: Dict[str, Any]) -> "ColumnarItemsList":
+        """Из словаря get_items(raw=True)"""
+        return cls(ColumnarItems(payload["data"]), payload["count"])
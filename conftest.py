@@ -1,69 +1,297 @@
 import pytest
-import allure
 import sys
 import os
+import json
+import uuid
 from pathlib import Path
-from faker import Faker
 
 # Добавляем корневую директорию в путь Python
 root_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(root_dir))
 
-try:
-    from src.api.items_client import ItemsAPIClient
-except ImportError:
-    print("⚠️  Warning: Could not import ItemsAPIClient. Make sure src/ directory exists.")
+# Клиент и Allure импортируются лениво - при первом реальном использовании,
+# чтобы сбор и запуск отдельных тестов не платил за всё сразу (см. bench_startup.py)
+
+# Контроль регрессий латентности (--perf-baseline, см. perf_gate.py)
+pytest_plugins = ["perf_gate"]
+
+
+def pytest_addoption(parser):
+    from src.api.env import load_env
+
+    # .env нужен уже здесь: значения опций по умолчанию берутся из окружения
+    load_env()
+    parser.addoption(
+        "--fake-api",
+        action="store_true",
+        default=False,
+        help="Запустить локальный fake-сервер Items API вместо BASE_URL (или FAKE_API=1)"
+    )
+    parser.addoption(
+        "--cassette",
+        default=os.getenv("ITEMS_CASSETTE"),
+        help="JSONL-кассета HTTP-обменов (или ITEMS_CASSETTE)"
+    )
+    parser.addoption(
+        "--cassette-mode",
+        choices=("record", "replay"),
+        default=os.getenv("ITEMS_CASSETTE_MODE", "replay"),
+        help="record - писать обмены в кассету, replay - отвечать из неё (по умолчанию: replay)"
+    )
+
+
+def _is_xdist_worker(config) -> bool:
+    return hasattr(config, "workerinput")
+
+
+def _run_title_prefix() -> str:
+    """Общий префикс заголовков всех элементов текущего прогона"""
+    return f"[{os.environ['ITEMS_RUN_ID']}-"
+
+
+def _worker_index(worker_id: str) -> int:
+    """Номер xdist-воркера (gw3 -> 3), без xdist - 0"""
+    return int(worker_id[2:]) if worker_id.startswith("gw") else 0
+
+
+def _use_fake_api(config) -> bool:
+    return config.getoption("--fake-api") or os.getenv("FAKE_API", "").lower() in ("1", "true", "yes")
+
+
+def _cassette_replay(config) -> bool:
+    cassette = getattr(config, "_items_cassette", None)
+    return cassette is not None and cassette.mode == "replay"
+
+
+def pytest_configure(config):
+    """Кассета, идентификатор прогона и старт локального fake-сервера до создания клиентов
+
+    Кассета открывается в каждом процессе, остальное - только в главном:
+    xdist-воркеры наследуют ITEMS_RUN_ID и BASE_URL через окружение.
+    """
+    cassette_path = config.getoption("--cassette")
+    if cassette_path:
+        from src.api.cassette import Cassette
+
+        # Запись начинает кассету заново в главном процессе, xdist-воркеры дописывают в неё
+        config._items_cassette = Cassette(
+            cassette_path, config.getoption("--cassette-mode"), append=_is_xdist_worker(config)
+        )
+        # Тела запросов входят в ключ кассеты, поэтому данные прогона должны быть воспроизводимы
+        os.environ.setdefault("ITEMS_RUN_ID", "cassette")
+
+    if _is_xdist_worker(config):
+        return
+
+    os.environ.setdefault("ITEMS_RUN_ID", uuid.uuid4().hex[:8])
+
+    if not _use_fake_api(config):
+        return
+
+    from fake_server import FakeItemsServer
+
+    server = FakeItemsServer().start()
+    config._fake_items_server = server
+    os.environ["BASE_URL"] = server.url
+    os.environ.setdefault("USER_EMAIL", "tester@example.com")
+    os.environ.setdefault("USER_PASSWORD", "tester-password")
+    print(f"\n🚀 Fake Items API started at {server.url}")
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """Единая уборка элементов прогона после завершения всех воркеров"""
+    if _is_xdist_worker(session.config) or _cassette_replay(session.config):
+        return
+
+    from src.api.credential_pool import make_client
+
+    prefix = _run_title_prefix()
+    try:
+        # Воркеры работают от разных учётных записей - обходим элементы всех
+        with make_client() as client:
+            leaked = [item.id for item in client.iter_items(search=prefix) if item.title.startswith(prefix)]
+            for item_id in leaked:
+                try:
+                    client.delete_item(item_id)
+                except Exception as e:
+                    print(f"⚠️ Could not delete item {item_id}: {e}")
+    except Exception as e:
+        print(f"\n⚠️ Session cleanup skipped: {e}")
+        return
+
+    if leaked:
+        print(f"\n🧹 Session cleanup: removed {len(leaked)} items with prefix {prefix}")
+
+
+def pytest_unconfigure(config):
+    server = getattr(config, "_fake_items_server", None)
+    if server is not None:
+        server.stop()
+    cassette = getattr(config, "_items_cassette", None)
+    if cassette is not None:
+        cassette.close()
+
+
+@pytest.fixture(scope="session")
+def worker_id() -> str:
+    """Имя xdist-воркера (gw0, gw1, ...) или master без xdist"""
+    return os.getenv("PYTEST_XDIST_WORKER", "master")
+
+
+@pytest.fixture(scope="session")
+def title_prefix(worker_id) -> str:
+    """Префикс заголовков элементов этого воркера - для поиска только своих данных"""
+    return f"{_run_title_prefix()}{worker_id}] "
+
+
+@pytest.fixture(scope="session")
+def offline_api(pytestconfig) -> bool:
+    """Тесты идут против локального fake-сервера или кассеты, а не общего BASE_URL"""
+    return _use_fake_api(pytestconfig) or _cassette_replay(pytestconfig)
+
+
+@pytest.fixture(scope="session")
+def api_metrics(pytestconfig):
+    """Метрики всех вызовов API за сессию (прикрепляются к Allure-отчёту)"""
+    from src.api.metrics import MetricsCollector
+
+    collector = MetricsCollector()
+    pytestconfig._items_api_metrics = collector
+    return collector
+
+
+@pytest.fixture(scope="session")
+def cassette(pytestconfig):
+    """Кассета HTTP-обменов (--cassette) или None"""
+    return getattr(pytestconfig, "_items_cassette", None)
+
+
+@pytest.fixture(scope="session")
+def http_session(cassette):
+    """Сессия requests для «сырых» запросов в тестах (пишется в кассету вместе с клиентом)"""
+    import requests
+
+    session = requests.Session()
+    if cassette is not None:
+        from src.api.cassette import mount_cassette
+
+        mount_cassette(session, cassette)
+    yield session
+    session.close()
+
+
+@pytest.fixture(scope="session")
+def account(worker_id):
+    """Учётная запись воркера: при нескольких (USER_CREDENTIALS) воркеры распределяются по ним по кругу"""
+    from src.api.credential_pool import load_credentials
+
+    credentials = load_credentials()
+    return credentials[_worker_index(worker_id) % len(credentials)]
 
 
 @pytest.fixture(scope="session")
-def api_client():
-    """Фикстура API клиента"""
+def api_client(api_metrics, cassette, account, perf_gate):
+    """Фикстура API клиента (токен общий для всех воркеров через дисковый кэш, логин - при первом запросе)"""
+    from src.api.items_client import ItemsAPIClient
+
     print("\n" + "=" * 50)
     print("Setting up API client...")
-    client = ItemsAPIClient()
+    # С кассетой логин всегда идёт через неё, а не через дисковый кэш токенов
+    client = ItemsAPIClient(
+        hooks=[api_metrics] + ([perf_gate] if perf_gate is not None else []),
+        cassette=cassette,
+        token_cache=cassette is None,
+        username=account.username,
+        password=account.password,
+        # Воспроизведённые из кассеты ID на сервере не существуют - журналировать нечего
+        journal=cassette is None or cassette.mode != "replay"
+    )
     yield client
+    client.close()
     print("\n" + "=" * 50)
     print("API client teardown complete")
 
 
+@pytest.fixture(scope="session")
+def payload_pool():
+    """Пул заранее сгенерированных payload'ов (seed и размер - PAYLOAD_SEED, PAYLOAD_POOL_SIZE)"""
+    from src.models.payload_pool import PayloadPool
+
+    return PayloadPool(
+        count=int(os.getenv("PAYLOAD_POOL_SIZE", "1000")),
+        seed=int(os.getenv("PAYLOAD_SEED", "4203"))
+    )
+
+
 @pytest.fixture
-def item_data():
+def item_data(request, title_prefix, cassette, payload_pool):
     """Фикстура данных для создания элемента"""
-    fake = Faker()
-    data = {
-        "title": fake.sentence(nb_words=3)[:50],
-        "description": fake.text(max_nb_chars=200)
-    }
+    # С кассетой данные теста не должны зависеть от порядка и набора запущенных тестов
+    data = payload_pool.pick(request.node.nodeid) if cassette is not None else payload_pool.take()
+    data["title"] = title_prefix + data["title"]
     print(f"📦 Generated item data: {data['title'][:30]}...")
     return data
 
 
+@pytest.fixture(scope="session")
+def items_snapshot(api_client, title_prefix):
+    """Снимок элементов этого воркера (по префиксу) для сверки ответов списка без повторной выгрузки"""
+    from src.api.items_snapshot import ItemsSnapshot
+
+    return ItemsSnapshot.load(api_client, scope=title_prefix)
+
+
+@pytest.fixture(scope="session")
+def cleanup_registry(api_client):
+    """Реестр отложенного удаления: элементы удаляются пачками параллельно"""
+    from cleanup_registry import CleanupRegistry
+
+    registry = CleanupRegistry(api_client)
+    yield registry
+    registry.close()
+
+
 @pytest.fixture
-def created_item(api_client, item_data):
-    """Фикстура созданного элемента (удаляется после теста)"""
+def created_item(api_client, item_data, cleanup_registry):
+    """Фикстура созданного элемента (удаляется пачкой в конце сессии)"""
     print(f"\n🛠️ Creating test item...")
     item = api_client.create_item(item_data)
     print(f"✅ Created item ID: {item.id}")
+    cleanup_registry.register(item.id)
 
-    yield item
+    return item
 
-    # Очистка после теста
-    print(f"\n🧹 Cleaning up item {item.id}...")
-    try:
-        api_client.delete_item(item.id)
-        print(f"✅ Item {item.id} cleaned up")
-    except Exception as e:
-        print(f"⚠️ Could not delete item {item.id}: {e}")
+
+@pytest.fixture(scope="session")
+def item_pool(api_client, title_prefix, cassette, payload_pool):
+    """Пул переиспользуемых элементов воркера (размер - ITEM_POOL_SIZE), удаляется в конце сессии"""
+    from item_pool import ItemPool
+
+    def make_data(index: int):
+        data = payload_pool.pick(f"item_pool:{index}") if cassette is not None else payload_pool.take()
+        data["title"] = title_prefix + data["title"]
+        return data
+
+    pool = ItemPool(api_client, make_data, size=int(os.getenv("ITEM_POOL_SIZE", "1")))
+    yield pool
+    pool.close()
+
+
+@pytest.fixture
+def pooled_item(item_pool):
+    """Элемент из пула в исходном состоянии; после теста возвращается в пул одним update_item
+
+    Тестам, которым нужен новый элемент (например, удаление), - created_item или item_data.
+    """
+    item = item_pool.lease()
+    yield item
+    item_pool.release(item)
 
 
 @pytest.fixture
 def unauthorized_session():
     """Неавторизованная сессия (без токена)"""
     import requests
-    import os
-    from dotenv import load_dotenv
-
-    load_dotenv()
 
     session = requests.Session()
     session.headers.update({
@@ -74,13 +302,44 @@ def unauthorized_session():
     return session
 
 
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    """Метрики API только за время самого теста (общий сборщик копит всю сессию)"""
+    metrics = getattr(item.config, "_items_api_metrics", None)
+    if metrics is None:
+        yield
+        return
+    with metrics.scope() as scoped:
+        yield
+    item._api_metrics = scoped
+
+
 # Хуки для Allure
 def pytest_runtest_makereport(item, call):
     """Хук для Allure отчетов"""
     if call.when == "call":
+        import allure
+
         if call.excinfo is not None:
             allure.attach(
                 str(call.excinfo.value),
                 name="Error",
                 attachment_type=allure.attachment_type.TEXT
+            )
+
+        metrics = getattr(item, "_api_metrics", None)
+        if metrics is not None:
+            allure.attach(
+                metrics.to_json(),
+                name="API metrics",
+                attachment_type=allure.attachment_type.JSON
+            )
+
+        # Сравнение с baseline заполняет плагин perf_gate (только с --perf-baseline)
+        perf_report = getattr(item, "_perf_report", None)
+        if perf_report is not None:
+            allure.attach(
+                json.dumps(perf_report, indent=2, ensure_ascii=False),
+                name=f"Performance vs baseline: {perf_report['test']['status']}",
+                attachment_type=allure.attachment_type.JSON
             )
\ No newline at end of file
@@ -2,17 +2,29 @@
 """
 Скрипт для создания тестовых данных для пагинации
 """
+import math
 import sys
 import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import redirect_stdout
 from pathlib import Path
+from typing import Any, Callable, List, Optional
 
 # Добавляем src в путь Python
 current_dir = Path(__file__).parent
 sys.path.insert(0, str(current_dir))
 
 try:
+    from src.api.credential_pool import make_client
+    from src.api.credential_pool import load_credentials
+    from src.api.env import load_env
+    from src.api.id_journal import IdJournal, find_leaks, remove_journals
     from src.api.items_client import ItemsAPIClient
-    from faker import Faker
+    from src.api.rate_limiter import TokenBucket, parse_retry_after
+    from src.models.payload_pool import PayloadPool
+    from requests import HTTPError
 except ImportError as e:
     print(f"❌ Ошибка импорта: {e}")
     print("\nУбедитесь, что:")
@@ -24,14 +36,18 @@ except ImportError as e:
     sys.exit(1)
 
 
-def create_test_items(count: int = 20):
-    """Создание тестовых элементов"""
-    print(f"🎯 Создание {count} тестовых элементов...")
-    print("=" * 60)
-
+def _make_client(**kwargs) -> Optional[ItemsAPIClient]:
+    """Создание клиента (или пула, если задано несколько учётных записей) с подсказками при ошибке"""
+    client = None
     try:
-        client = ItemsAPIClient()
+        client = make_client(**kwargs)
+        # Логин ленивый: выполняем его здесь, чтобы ошибки авторизации и сети дошли до подсказок
+        for account in getattr(client, "clients", [client]):
+            account.token
+        return client
     except Exception as e:
+        if client is not None:
+            client.close()
         print(f"❌ Ошибка при создании клиента: {e}")
         print("\n🔧 Возможные причины:")
         print("1. Проверьте файл .env в корне проекта")
@@ -39,24 +55,104 @@ def create_test_items(count: int = 20):
         print("   - BASE_URL=https://api.fast-api.senior-pomidorov.ru")
         print("   - USER_EMAIL=ваш_настоящий_email")
         print("   - USER_PASSWORD=ваш_настоящий_пароль")
+        print("   - или USER_CREDENTIALS=email1:пароль1,email2:пароль2 (USER_CREDENTIALS_FILE=файл)")
         print("3. Проверьте интернет-соединение")
+        return None
+
+
+def _print_total_count(client: ItemsAPIClient, check_pagination: bool = True):
+    """Проверка общего количества элементов"""
+    try:
+        if hasattr(client, "count_items"):
+            total = client.count_items()
+            print(f"\n📈 Всего элементов у {len(client)} учётных записей: {total}")
+        else:
+            total = client.get_items(size=1).count
+            print(f"\n📈 Всего элементов в системе: {total}")
+
+        if not check_pagination:
+            return
+        if total >= 15:
+            print("🎉 Достаточно элементов для тестирования пагинации!")
+        else:
+            print(f"⚠️  Мало элементов ({total}) для полноценного тестирования пагинации")
+            print("   Создайте еще элементов через UI или запустите скрипт снова")
+
+    except Exception as e:
+        print(f"\n⚠️  Ошибка при проверке количества: {e}")
+
+
+def _print_account_stats(client):
+    """Нагрузка по учётным записям (только для пула)"""
+    if hasattr(client, "print_stats"):
+        print()
+        client.print_stats()
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    """Перцентиль по отсортированному списку (nearest-rank)"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, math.ceil(q / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def _call_throttled(
+        call: Callable[[], Any],
+        bucket: Optional[TokenBucket],
+        max_429_retries: int,
+        on_throttled: Optional[Callable[[], None]] = None
+) -> Any:
+    """Вызов API под token bucket; после 429 ждёт Retry-After и повторяет"""
+    for attempt in range(max_429_retries + 1):
+        if bucket is not None:
+            bucket.acquire()
+        try:
+            return call()
+        except HTTPError as e:
+            response = e.response
+            if response is None or response.status_code != 429 or attempt == max_429_retries:
+                raise
+            delay = parse_retry_after(response.headers.get("Retry-After"))
+            if on_throttled is not None:
+                on_throttled()
+            if bucket is not None:
+                bucket.pause(delay)
+            else:
+                time.sleep(delay)
+
+
+def _seed_payloads(count: int, seed: int) -> List[dict]:
+    """Payload'ы для заполнения: из дискового пула, Faker - только при первом запуске с этим seed"""
+    pool = PayloadPool(count=count, seed=seed)
+    return [
+        {
+            "title": f"Test Item {i + 1}: {payload['title']}",
+            "description": payload["description"]
+        }
+        for i, payload in enumerate(pool.payloads)
+    ]
+
+
+def create_test_items(count: int = 20, seed: int = 4203):
+    """Создание тестовых элементов"""
+    print(f"🎯 Создание {count} тестовых элементов...")
+    print("=" * 60)
+
+    client = _make_client()
+    if client is None:
         return
 
-    fake = Faker()
+    payloads = _seed_payloads(count, seed)
 
     created_count = 0
     failed_count = 0
 
-    for i in range(count):
+    for i, item_data in enumerate(payloads):
         try:
-            item_data = {
-                "title": f"Test Item {i + 1}: {fake.word().capitalize()}",
-                "description": fake.sentence()
-            }
-
             item = client.create_item(item_data)
             created_count += 1
-            print(f"✅ [{i + 1:2d}/{count}] Создан элемент ID={item.id:4d}: '{item.title[:40]}...'")
+            print(f"✅ [{i + 1:2d}/{count}] Создан элемент ID={item.id}: '{item.title[:40]}...'")
 
         except Exception as e:
             failed_count += 1
@@ -68,20 +164,252 @@ def create_test_items(count: int = 20):
     print(f"   Успешно создано: {created_count}")
     print(f"   Не удалось создать: {failed_count}")
     print(f"   Всего попыток: {count}")
+    # Скрипт дошёл до конца - созданные данные нужны, журнал для уборки после сбоя больше не нужен
+    IdJournal.forget_all()
 
     # Проверяем общее количество
-    try:
-        items = client.get_items(size=1)
-        print(f"\n📈 Всего элементов в системе: {items.count}")
+    _print_total_count(client)
+    client.close()
 
-        if items.count >= 15:
-            print("🎉 Достаточно элементов для тестирования пагинации!")
-        else:
-            print(f"⚠️  Мало элементов ({items.count}) для полноценного тестирования пагинации")
-            print("   Создайте еще элементов через UI или запустите скрипт снова")
 
-    except Exception as e:
-        print(f"\n⚠️  Ошибка при проверке количества: {e}")
+def create_test_items_parallel(
+        count: int,
+        workers: int = 8,
+        rps: Optional[float] = None,
+        ids_file: str = "created_ids.txt",
+        max_429_retries: int = 5,
+        seed: int = 4203
+):
+    """Параллельное создание тестовых элементов через пул потоков
+
+    workers - число потоков (и соединений в пуле клиента)
+    rps - ограничение частоты запросов (token bucket), None - без ограничения
+    ids_file - файл, куда дописываются ID созданных элементов (по одному в строке)
+    max_429_retries - сколько раз повторять запрос после 429 Too Many Requests
+    seed - seed пула payload'ов (одинаковый seed - одинаковые данные)
+    """
+    print(f"🎯 Создание {count} тестовых элементов: {workers} потоков, "
+          f"лимит {rps if rps else '∞'} RPS...")
+    print("=" * 60)
+
+    client = _make_client(pool_connections=1, pool_maxsize=workers)
+    if client is None:
+        return
+
+    payloads = _seed_payloads(count, seed)
+
+    bucket = TokenBucket(rps, burst=workers) if rps else None
+    ids_lock = threading.Lock()
+    latencies: List[float] = []
+    throttled = 0
+
+    def on_throttled():
+        nonlocal throttled
+        with ids_lock:
+            throttled += 1
+
+    def create_one(item_data):
+        started = time.perf_counter()
+        item = _call_throttled(lambda: client.create_item(item_data), bucket, max_429_retries, on_throttled)
+        elapsed = time.perf_counter() - started
+        with ids_lock:
+            latencies.append(elapsed)
+            ids_out.write(f"{item.id}\n")
+        return item
+
+    created_count = 0
+    failed_count = 0
+    started_at = time.perf_counter()
+
+    with open(ids_file, "a", encoding="utf-8") as ids_out, \
+            ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(create_one, data) for data in payloads]
+        for done, future in enumerate(as_completed(futures), start=1):
+            try:
+                future.result()
+                created_count += 1
+            except Exception as e:
+                failed_count += 1
+                print(f"❌ [{done}/{count}] Ошибка: {str(e)[:80]}...")
+            if done % max(1, count // 10) == 0:
+                print(f"⏳ Обработано {done}/{count}")
+
+    total_time = time.perf_counter() - started_at
+    latencies.sort()
+
+    print("=" * 60)
+    print(f"📊 ИТОГ:")
+    print(f"   Успешно создано: {created_count}")
+    print(f"   Не удалось создать: {failed_count}")
+    print(f"   Ответов 429 (повторено): {throttled}")
+    print(f"   Время: {total_time:.2f} c, пропускная способность: {created_count / total_time:.1f} элементов/с")
+    print(f"   Латентность p50/p95/p99: "
+          f"{_percentile(latencies, 50) * 1000:.0f} / "
+          f"{_percentile(latencies, 95) * 1000:.0f} / "
+          f"{_percentile(latencies, 99) * 1000:.0f} мс")
+    print(f"   ID созданных элементов: {ids_file}")
+    IdJournal.forget_all()
+    _print_account_stats(client)
+
+    _print_total_count(client)
+    client.close()
+
+
+def purge_test_items(
+        prefix: Optional[str] = "Test Item ",
+        search: Optional[str] = None,
+        workers: int = 8,
+        rps: Optional[float] = None,
+        dry_run: bool = False,
+        max_429_retries: int = 5
+):
+    """Параллельное удаление тестовых элементов
+
+    prefix - удалять только элементы, чей заголовок начинается с prefix (None - без фильтра)
+    search - параметр search для GET /api/v1/items/ (по умолчанию - prefix)
+    dry_run - только показать, что будет удалено
+    """
+    search = search or (prefix.strip() if prefix else None)
+    print(f"🧹 Поиск элементов для удаления (prefix={prefix!r}, search={search!r})...")
+    print("=" * 60)
+
+    client = _make_client(pool_connections=1, pool_maxsize=workers)
+    if client is None:
+        return
+
+    # Сначала собираем ID: удаление во время обхода сдвигает страницы
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        matched = [
+            item for item in client.iter_items(search=search)
+            if prefix is None or item.title.startswith(prefix)
+        ]
+    print(f"🔎 Найдено элементов: {len(matched)}")
+
+    if dry_run:
+        for item in matched[:20]:
+            print(f"   {item.id}: '{item.title[:50]}'")
+        if len(matched) > 20:
+            print(f"   ... и ещё {len(matched) - 20}")
+        print("ℹ️  --dry-run: ничего не удалено")
+        client.close()
+        return
+
+    bucket = TokenBucket(rps, burst=workers) if rps else None
+    deleted_count = 0
+    failed_count = 0
+    started_at = time.perf_counter()
+
+    def delete_one(item_id: str):
+        try:
+            return _call_throttled(lambda: client.delete_item(item_id), bucket, max_429_retries)
+        except HTTPError as e:
+            # Элемент уже удалён кем-то другим - цель достигнута
+            if e.response is not None and e.response.status_code == 404:
+                return True
+            raise
+
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull), \
+            ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(delete_one, item.id): item.id for item in matched}
+        errors = []
+        for future in as_completed(futures):
+            try:
+                future.result()
+                deleted_count += 1
+            except Exception as e:
+                failed_count += 1
+                errors.append(f"{futures[future]}: {str(e)[:80]}")
+
+    total_time = time.perf_counter() - started_at
+    for error in errors[:20]:
+        print(f"❌ {error}")
+
+    print("=" * 60)
+    print(f"📊 ИТОГ:")
+    print(f"   Удалено: {deleted_count}")
+    print(f"   Не удалось удалить: {failed_count}")
+    print(f"   Время: {total_time:.2f} c, скорость: {deleted_count / total_time if total_time else 0:.1f} элементов/с")
+    _print_account_stats(client)
+
+    _print_total_count(client, check_pagination=False)
+    client.close()
+
+
+def recover_leaked_items(workers: int = 8, rps: Optional[float] = None, dry_run: bool = False,
+                         force: bool = False, max_429_retries: int = 5):
+    """Удаление элементов, оставшихся после аварийно завершённых прогонов (по журналам ID)
+
+    Удаляются ровно «живые» ID из журналов завершившихся процессов - без обхода
+    всей коллекции. force - включить журналы работающих процессов и других хостов.
+    """
+    leaks = find_leaks(force=force)
+    total = sum(len(group.item_ids) for group in leaks)
+    print(f"🔎 Журналов: {sum(len(group.paths) for group in leaks)}, неудалённых элементов: {total}")
+    print("=" * 60)
+    if dry_run:
+        for group in leaks:
+            print(f"   {group.username} @ {group.base_url}: {len(group.item_ids)}")
+            for item_id in group.item_ids[:5]:
+                print(f"      {item_id}")
+        print("ℹ️  --dry-run: ничего не удалено")
+        return
+
+    passwords = {c.username: c.password for c in load_credentials()}
+    bucket = TokenBucket(rps, burst=workers) if rps else None
+    started_at = time.perf_counter()
+    deleted_count = 0
+    gone_count = 0
+    failed_count = 0
+
+    for group in leaks:
+        if group.username not in passwords:
+            print(f"⚠️  Нет пароля для {group.username} (USER_CREDENTIALS) - пропущено {len(group.item_ids)}")
+            failed_count += len(group.item_ids)
+            continue
+
+        client = ItemsAPIClient(username=group.username, password=passwords[group.username],
+                                pool_maxsize=workers, journal=False)
+        client.base_url = group.base_url
+
+        def delete_one(item_id: str) -> bool:
+            try:
+                _call_throttled(lambda: client.delete_item(item_id), bucket, max_429_retries)
+                return True
+            except HTTPError as e:
+                if e.response is not None and e.response.status_code in (404, 422):
+                    return False
+                raise
+
+        group_failed = 0
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull), \
+                ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(delete_one, item_id): item_id for item_id in group.item_ids}
+            errors = []
+            for future in as_completed(futures):
+                try:
+                    if future.result():
+                        deleted_count += 1
+                    else:
+                        gone_count += 1
+                except Exception as e:
+                    group_failed += 1
+                    errors.append(f"{futures[future]}: {str(e)[:80]}")
+        client.close()
+
+        for error in errors[:20]:
+            print(f"❌ {error}")
+        failed_count += group_failed
+        # Журналы с неудалёнными элементами остаются для следующей попытки
+        if not group_failed:
+            remove_journals(group.paths)
+
+    total_time = time.perf_counter() - started_at
+    print("=" * 60)
+    print(f"📊 ИТОГ:")
+    print(f"   Удалено: {deleted_count}")
+    print(f"   Уже удалены: {gone_count}")
+    print(f"   Не удалось удалить: {failed_count}")
+    print(f"   Время: {total_time:.2f} c")
 
 
 if __name__ == "__main__":
@@ -95,6 +423,11 @@ if __name__ == "__main__":
   python create_test_data.py          # Создать 20 элементов
   python create_test_data.py -n 30    # Создать 30 элементов
   python create_test_data.py --number 15  # Создать 15 элементов
+  python create_test_data.py -n 10000 --workers 16 --rps 200  # Параллельно, не более 200 запросов/с
+  python create_test_data.py --purge --dry-run    # Показать, что будет удалено
+  python create_test_data.py --purge -w 16 --rps 100  # Удалить все "Test Item ..." элементы
+  python create_test_data.py --recover --dry-run  # Элементы, оставшиеся после упавших прогонов
+  python create_test_data.py --recover -w 16      # Удалить их (по журналам ID, без обхода коллекции)
 
 Для работы скрипта нужен файл .env с настройками:
   BASE_URL=https://api.fast-api.senior-pomidorov.ru
@@ -110,5 +443,76 @@ if __name__ == "__main__":
         help="Количество элементов для создания (по умолчанию: 20)"
     )
 
+    parser.add_argument(
+        "-w", "--workers",
+        type=int,
+        default=None,
+        help="Количество параллельных потоков (по умолчанию: 1 - последовательно, для --purge и --recover: 8)"
+    )
+
+    parser.add_argument(
+        "--rps",
+        type=float,
+        default=None,
+        help="Ограничение запросов в секунду (только для параллельного режима)"
+    )
+
+    parser.add_argument(
+        "--ids-file",
+        default="created_ids.txt",
+        help="Файл для ID созданных элементов (по умолчанию: created_ids.txt)"
+    )
+
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=4203,
+        help="Seed генератора данных (по умолчанию: 4203)"
+    )
+
+    parser.add_argument(
+        "--purge",
+        action="store_true",
+        help="Удалить тестовые элементы вместо создания"
+    )
+
+    parser.add_argument(
+        "--recover",
+        action="store_true",
+        help="Удалить элементы, оставшиеся после аварийно завершённых прогонов (по журналам ID)"
+    )
+
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Для --recover: учитывать и журналы работающих процессов"
+    )
+
+    parser.add_argument(
+        "--prefix",
+        default="Test Item ",
+        help="Удалять элементы с таким началом заголовка (по умолчанию: 'Test Item ', '' - без фильтра)"
+    )
+
+    parser.add_argument(
+        "--search",
+        default=None,
+        help="Значение search для поиска удаляемых элементов (по умолчанию: prefix)"
+    )
+
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Только показать элементы, которые будут удалены (для --purge и --recover)"
+    )
+
     args = parser.parse_args()
-    create_test_items(args.number)
\ No newline at end of file
+    load_env()
+    if args.recover:
+        recover_leaked_items(max(args.workers or 8, 1), args.rps, args.dry_run, args.force)
+    elif args.purge:
+        purge_test_items(args.prefix or None, args.search, max(args.workers or 8, 1), args.rps, args.dry_run)
+    elif (args.workers or 1) > 1 or args.rps:
+        create_test_items_parallel(args.number, max(args.workers or 1, 1), args.rps, args.ids_file, seed=args.seed)
+    else:
+        create_test_items(args.number, seed=args.seed)
\ No newline at end of file
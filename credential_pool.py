@@ -0,0 +1,225 @@
+import itertools
+import os
+import threading
+import time
+import zlib
+from typing import Optional, Dict, Any, Iterator, List, NamedTuple, Callable, TypeVar
+
+from requests import HTTPError
+
+from src.api.env import load_env
+from src.api.items_client import ItemsAPIClient
+from src.api.metrics import ClientHook, RequestEvent
+from src.models.schemas import ItemResponse, ItemsListResponse
+
+ROUTING_MODES = ("round_robin", "hash")
+
+T = TypeVar("T")
+
+
+class Credentials(NamedTuple):
+    username: str
+    password: str
+
+
+def _parse_credentials(entries: List[str], source: str) -> List[Credentials]:
+    credentials = []
+    for entry in entries:
+        entry = entry.strip()
+        if not entry or entry.startswith("#"):
+            continue
+        username, sep, password = entry.partition(":")
+        if not sep or not username:
+            raise ValueError(f"Expected 'email:password' in {source}, got {entry.split(':')[0]!r}...")
+        credentials.append(Credentials(username.strip(), password))
+    return credentials
+
+
+def load_credentials(path: Optional[str] = None) -> List[Credentials]:
+    """Учётные записи: файл (path или USER_CREDENTIALS_FILE, по строке "email:password"),
+    список USER_CREDENTIALS ("a@x.ru:pass1,b@x.ru:pass2") или одна USER_EMAIL/USER_PASSWORD
+    """
+    load_env()
+    path = path or os.getenv("USER_CREDENTIALS_FILE")
+    if path:
+        with open(path, encoding="utf-8") as f:
+            credentials = _parse_credentials(f.read().splitlines(), path)
+    elif os.getenv("USER_CREDENTIALS"):
+        credentials = _parse_credentials(os.environ["USER_CREDENTIALS"].split(","), "USER_CREDENTIALS")
+    else:
+        credentials = [Credentials(os.getenv("USER_EMAIL"), os.getenv("USER_PASSWORD"))]
+    if not credentials:
+        raise ValueError("No credentials configured")
+    return credentials
+
+
+class AccountStats(ClientHook):
+    """Счётчики запросов одной учётной записи"""
+
+    def __init__(self, username: str):
+        self.username = username
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.writes = 0
+        self.deletes = 0
+        self.busy = 0.0
+
+    def on_request(self, event: RequestEvent):
+        with self._lock:
+            self.requests += 1
+            self.busy += event.total
+            if event.status is None or event.status >= 400:
+                self.errors += 1
+
+    def on_item_written(self, item):
+        with self._lock:
+            self.writes += 1
+
+    def on_item_deleted(self, item_id: str):
+        with self._lock:
+            self.deletes += 1
+
+    def to_dict(self, elapsed: float) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "account": self.username,
+                "requests": self.requests,
+                "errors": self.errors,
+                "writes": self.writes,
+                "deletes": self.deletes,
+                "throughput": self.requests / elapsed if elapsed else 0.0,
+                "avg_ms": self.busy / self.requests * 1000 if self.requests else 0.0
+            }
+
+
+class ItemsClientPool:
+    """Пул клиентов Items API - по одному (свой токен и пул соединений) на учётную запись
+
+    Создания распределяются по записям по кругу (round_robin) или по хэшу
+    заголовка (hash - одинаковые данные всегда попадают к одному владельцу).
+    Чтение, обновление и удаление элемента всегда идут от записи, которая его
+    создала: владелец запоминается при создании и при обходе (iter_items).
+    Для неизвестного ID первой пробуется запись по хэшу ID, при 404 - остальные.
+    """
+
+    def __init__(
+            self,
+            credentials: Optional[List[Credentials]] = None,
+            routing: str = "round_robin",
+            **client_kwargs
+    ):
+        """client_kwargs - параметры ItemsAPIClient для каждой записи (hooks - общие для всех)"""
+        if routing not in ROUTING_MODES:
+            raise ValueError(f"routing must be one of {ROUTING_MODES}, got {routing!r}")
+        self.routing = routing
+        credentials = credentials or load_credentials()
+        shared_hooks = list(client_kwargs.pop("hooks", None) or [])
+        self.accounts = [AccountStats(c.username) for c in credentials]
+        self.clients = [
+            ItemsAPIClient(username=c.username, password=c.password, hooks=shared_hooks + [stats], **client_kwargs)
+            for c, stats in zip(credentials, self.accounts)
+        ]
+        self.base_url = self.clients[0].base_url
+        self._owners: Dict[str, int] = {}
+        self._owners_lock = threading.Lock()
+        self._round_robin = itertools.count()
+        self._started = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self.clients)
+
+    def _next(self, key: Optional[str] = None) -> int:
+        if self.routing == "hash" and key is not None:
+            return zlib.crc32(key.encode()) % len(self.clients)
+        return next(self._round_robin) % len(self.clients)
+
+    def _remember(self, item_id: str, index: int):
+        with self._owners_lock:
+            self._owners[item_id] = index
+
+    def owner_of(self, item_id: str) -> Optional[ItemsAPIClient]:
+        """Клиент записи-владельца, если он известен"""
+        index = self._owners.get(item_id)
+        return self.clients[index] if index is not None else None
+
+    def _call_owner(self, item_id: str, call: Callable[[ItemsAPIClient], T]) -> T:
+        index = self._owners.get(item_id)
+        if index is not None:
+            return call(self.clients[index])
+
+        first = zlib.crc32(item_id.encode()) % len(self.clients)
+        candidates = [first] + [i for i in range(len(self.clients)) if i != first]
+        for attempt, index in enumerate(candidates):
+            try:
+                result = call(self.clients[index])
+            except HTTPError as e:
+                not_found = e.response is not None and e.response.status_code == 404
+                if not_found and attempt < len(candidates) - 1:
+                    continue
+                raise
+            self._remember(item_id, index)
+            return result
+
+    def create_item(self, item_data: Dict[str, Any]) -> ItemResponse:
+        index = self._next(item_data.get("title"))
+        item = self.clients[index].create_item(item_data)
+        self._remember(item.id, index)
+        return item
+
+    def get_items(self, *args, **kwargs) -> ItemsListResponse:
+        """Страница списка одной из записей (у каждой записи - свои элементы)"""
+        return self.clients[self._next()].get_items(*args, **kwargs)
+
+    def iter_items(self, *args, **kwargs) -> Iterator[ItemResponse]:
+        """Элементы всех записей подряд; владельцы запоминаются для последующих запросов"""
+        for index, client in enumerate(self.clients):
+            for item in client.iter_items(*args, **kwargs):
+                self._remember(item.id, index)
+                yield item
+
+    def count_items(self, search: Optional[str] = None) -> int:
+        """Суммарное количество элементов всех записей"""
+        return sum(client.get_items(size=1, search=search).count for client in self.clients)
+
+    def get_item_by_id(self, item_id: str) -> ItemResponse:
+        return self._call_owner(item_id, lambda client: client.get_item_by_id(item_id))
+
+    def update_item(self, item_id: str, item_data: Dict[str, Any]) -> ItemResponse:
+        return self._call_owner(item_id, lambda client: client.update_item(item_id, item_data))
+
+    def delete_item(self, item_id: str) -> bool:
+        result = self._call_owner(item_id, lambda client: client.delete_item(item_id))
+        with self._owners_lock:
+            self._owners.pop(item_id, None)
+        return result
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Запросы, ошибки и пропускная способность по каждой записи"""
+        elapsed = time.monotonic() - self._started
+        return [account.to_dict(elapsed) for account in self.accounts]
+
+    def print_stats(self):
+        print(f"{'учётная запись':<32} | {'запросы':>8} | {'ошибки':>7} | {'запр/с':>7} | {'ср., мс':>8}")
+        print("-" * 74)
+        for row in self.stats():
+            print(f"{row['account'][:32]:<32} | {row['requests']:>8} | {row['errors']:>7} | "
+                  f"{row['throughput']:>7.1f} | {row['avg_ms']:>8.1f}")
+
+    def close(self):
+        for client in self.clients:
+            client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def make_client(**client_kwargs):
+    """ItemsAPIClient для одной учётной записи или ItemsClientPool, если их настроено несколько"""
+    credentials = load_credentials()
+    if len(credentials) == 1:
+        return ItemsAPIClient(username=credentials[0].username, password=credentials[0].password, **client_kwargs)
+    return ItemsClientPool(credentials, **client_kwargs)
@@ -0,0 +1,20 @@
+"""
+Ленивая загрузка .env: python-dotenv импортируется при первом обращении к настройкам
+"""
+import threading
+
+_lock = threading.Lock()
+_loaded = False
+
+
+def load_env():
+    """Однократная загрузка .env в os.environ (уже заданные переменные не перезаписываются)"""
+    global _loaded
+    if _loaded:
+        return
+    with _lock:
+        if not _loaded:
+            from dotenv import load_dotenv
+
+            load_dotenv()
+            _loaded = True
@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+Локальный stand-in сервер Items API для офлайн-прогонов и нагрузочных тестов
+
+Реализует эндпоинты, которые использует клиент:
+  POST   /api/v1/login/access-token
+  GET    /api/v1/items/            (page, size, sort_by, order, search)
+  GET    /api/v1/items/{id}
+  POST   /api/v1/items/
+  PUT    /api/v1/items/{id}
+  DELETE /api/v1/items/{id}
+
+Валидация тела запроса - по моделям ItemCreate/ItemUpdate из schemas.py.
+"""
+import base64
+import gzip
+import hashlib
+import json
+import secrets
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Dict, Any, List, Tuple, Type
+from urllib.parse import urlsplit, parse_qs
+
+from pydantic import BaseModel, ValidationError
+
+from src.models.schemas import ItemCreate, ItemUpdate
+
+API_PREFIX = "/api/v1"
+SORT_FIELDS = ("created_at", "updated_at", "title", "id")
+MAX_PAGE_SIZE = 1000
+MAX_BODY_BYTES = 1024 * 1024
+GZIP_MIN_BYTES = 1024
+TOKEN_TTL = 60 * 60
+
+
+class ApiError(Exception):
+    """Ошибка, которую сервер возвращает клиенту как JSON {"detail": ...}"""
+
+    def __init__(self, status: int, detail: Any):
+        super().__init__(detail)
+        self.status = status
+        self.detail = detail
+
+
+def _issue_jwt(subject: str, ttl: int = TOKEN_TTL) -> str:
+    """JWT-подобный токен с полем exp (подпись не проверяется, токен ищется в памяти)"""
+    def encode(part: Dict[str, Any]) -> str:
+        return base64.urlsafe_b64encode(json.dumps(part).encode()).decode().rstrip("=")
+
+    header = encode({"alg": "HS256", "typ": "JWT"})
+    payload = encode({"sub": subject, "exp": int(time.time()) + ttl})
+    return f"{header}.{payload}.{secrets.token_urlsafe(16)}"
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+# Поля, обязательные при создании: в ItemUpdate они Optional (можно не передавать), но не null
+NON_NULLABLE_FIELDS = tuple(name for name, field in ItemCreate.__fields__.items() if field.required)
+
+
+def _validate(model: Type[BaseModel], body: Any) -> Dict[str, Any]:
+    """Валидация как в FastAPI: строгие типы для строковых полей + ограничения Field"""
+    if not isinstance(body, dict):
+        raise ApiError(422, [{"loc": ["body"], "msg": "value is not a valid dict", "type": "type_error.dict"}])
+
+    errors: List[Dict[str, Any]] = []
+    for name, field in model.__fields__.items():
+        value = body.get(name)
+        is_str_field = isinstance(field.type_, type) and issubclass(field.type_, str)
+        if value is not None and is_str_field and not isinstance(value, str):
+            errors.append({"loc": ["body", name], "msg": "str type expected", "type": "type_error.str"})
+        elif value is None and name in body and name in NON_NULLABLE_FIELDS:
+            errors.append({"loc": ["body", name], "msg": "none is not an allowed value",
+                           "type": "type_error.none.not_allowed"})
+    if errors:
+        raise ApiError(422, errors)
+
+    try:
+        parsed = model.parse_obj(body)
+    except ValidationError as e:
+        raise ApiError(422, [dict(err, loc=["body", *err["loc"]]) for err in e.errors()])
+    return parsed.dict(exclude_unset=True)
+
+
+class ItemsStore:
+    """Потокобезопасное хранилище пользователей, токенов и элементов"""
+
+    def __init__(self, users: Optional[Dict[str, str]] = None):
+        self._lock = threading.Lock()
+        self.users: Dict[str, str] = dict(users or {})
+        self.tokens: Dict[str, str] = {}
+        self.items: Dict[str, Dict[str, Any]] = {}
+
+    def login(self, username: Optional[str], password: Optional[str]) -> str:
+        if not username or not password:
+            raise ApiError(422, [{"loc": ["body", "username"], "msg": "field required", "type": "value_error.missing"}])
+        with self._lock:
+            # Неизвестный пользователь регистрируется при первом логине
+            known_password = self.users.setdefault(username, password)
+            if known_password != password:
+                raise ApiError(400, "Incorrect email or password")
+            owner_id = str(uuid.uuid5(uuid.NAMESPACE_URL, username))
+            token = _issue_jwt(owner_id)
+            self.tokens[token] = owner_id
+            return token
+
+    def owner_for(self, authorization: Optional[str]) -> str:
+        if not authorization or not authorization.startswith("Bearer "):
+            raise ApiError(401, "Not authenticated")
+        owner_id = self.tokens.get(authorization[len("Bearer "):])
+        if owner_id is None:
+            raise ApiError(401, "Could not validate credentials")
+        return owner_id
+
+    def _get_owned(self, owner_id: str, item_id: str) -> Dict[str, Any]:
+        try:
+            uuid.UUID(item_id)
+        except ValueError:
+            raise ApiError(422, [{"loc": ["path", "id"], "msg": "value is not a valid uuid", "type": "type_error.uuid"}])
+        item = self.items.get(item_id)
+        if item is None or item["owner_id"] != owner_id:
+            raise ApiError(404, "Item not found")
+        return item
+
+    def list(
+            self,
+            owner_id: str,
+            page: int,
+            size: int,
+            sort_by: Optional[str],
+            order: str,
+            search: Optional[str]
+    ) -> Dict[str, Any]:
+        with self._lock:
+            items = [item for item in self.items.values() if item["owner_id"] == owner_id]
+        if search:
+            needle = search.lower()
+            items = [
+                item for item in items
+                if needle in (item["title"] or "").lower() or needle in (item["description"] or "").lower()
+            ]
+        key = sort_by or "created_at"
+        items.sort(key=lambda item: (item[key] or "", item["id"]), reverse=(order == "desc"))
+        start = (page - 1) * size
+        return {"data": [dict(item) for item in items[start:start + size]], "count": len(items)}
+
+    def get(self, owner_id: str, item_id: str) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._get_owned(owner_id, item_id))
+
+    def create(self, owner_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        now = _now_iso()
+        item = {
+            "id": str(uuid.uuid4()),
+            "title": data["title"],
+            "description": data.get("description"),
+            "owner_id": owner_id,
+            "created_at": now,
+            "updated_at": now
+        }
+        with self._lock:
+            self.items[item["id"]] = item
+            return dict(item)
+
+    def update(self, owner_id: str, item_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            item = self._get_owned(owner_id, item_id)
+            item.update(data)
+            item["updated_at"] = _now_iso()
+            return dict(item)
+
+    def delete(self, owner_id: str, item_id: str):
+        with self._lock:
+            self._get_owned(owner_id, item_id)
+            del self.items[item_id]
+
+
+class FakeItemsHandler(BaseHTTPRequestHandler):
+    """Обработчик HTTP/1.1 с keep-alive"""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server: "FakeItemsHTTPServer"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, payload: Any, conditional: bool = False):
+        """Ответ JSON; conditional=True - с ETag и 304 на совпавший If-None-Match"""
+        body = json.dumps(payload).encode()
+        extra_headers = {}
+        if conditional:
+            etag = f'"{hashlib.sha1(body).hexdigest()[:20]}"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+            extra_headers["ETag"] = etag
+
+        if len(body) >= GZIP_MIN_BYTES and "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body, compresslevel=5)
+            extra_headers["Content-Encoding"] = "gzip"
+            extra_headers["Vary"] = "Accept-Encoding"
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in extra_headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_BYTES:
+            # Тело не читаем - соединение закрывается после ответа
+            self.close_connection = True
+            raise ApiError(413, "Request entity too large")
+        return self.rfile.read(length) if length else b""
+
+    def _json_body(self) -> Any:
+        raw = self._body
+        try:
+            return json.loads(raw or b"null")
+        except (ValueError, RecursionError):
+            raise ApiError(422, [{"loc": ["body"], "msg": "JSON decode error", "type": "value_error.jsondecode"}])
+
+    def _route(self, method: str) -> Tuple[int, Any]:
+        url = urlsplit(self.path)
+        path = url.path
+        store = self.server.store
+
+        if path == f"{API_PREFIX}/login/access-token" and method == "POST":
+            form = parse_qs(self._body.decode())
+            token = store.login(form.get("username", [None])[0], form.get("password", [None])[0])
+            return 200, {"access_token": token, "token_type": "bearer"}
+
+        if path.rstrip("/") == f"{API_PREFIX}/items":
+            if method == "GET":
+                owner_id = store.owner_for(self.headers.get("Authorization"))
+                return 200, store.list(owner_id, *self._list_params(url.query))
+            if method == "POST":
+                owner_id = store.owner_for(self.headers.get("Authorization"))
+                return 200, store.create(owner_id, _validate(ItemCreate, self._json_body()))
+            raise ApiError(405, "Method Not Allowed")
+
+        if path.startswith(f"{API_PREFIX}/items/"):
+            item_id = path[len(f"{API_PREFIX}/items/"):].rstrip("/")
+            owner_id = store.owner_for(self.headers.get("Authorization"))
+            if method == "GET":
+                return 200, store.get(owner_id, item_id)
+            if method == "PUT":
+                data = _validate(ItemUpdate, self._json_body())
+                return 200, store.update(owner_id, item_id, data)
+            if method == "DELETE":
+                store.delete(owner_id, item_id)
+                return 200, {"message": "Item deleted successfully"}
+            raise ApiError(405, "Method Not Allowed")
+
+        raise ApiError(404, "Not Found")
+
+    @staticmethod
+    def _list_params(query: str) -> Tuple[int, int, Optional[str], str, Optional[str]]:
+        params = {name: values[-1] for name, values in parse_qs(query).items()}
+        errors = []
+        try:
+            page = int(params.get("page", 1))
+            size = int(params.get("size", 100))
+        except ValueError:
+            raise ApiError(422, [{"loc": ["query", "page"], "msg": "value is not a valid integer", "type": "type_error.integer"}])
+        if page < 1:
+            errors.append({"loc": ["query", "page"], "msg": "ensure this value is greater than 0", "type": "value_error.number.not_gt"})
+        if not 1 <= size <= MAX_PAGE_SIZE:
+            errors.append({"loc": ["query", "size"], "msg": f"ensure 1 <= size <= {MAX_PAGE_SIZE}", "type": "value_error.number"})
+        sort_by = params.get("sort_by") or None
+        if sort_by is not None and sort_by not in SORT_FIELDS:
+            errors.append({"loc": ["query", "sort_by"], "msg": f"unexpected value; permitted: {SORT_FIELDS}", "type": "value_error.const"})
+        order = params.get("order", "asc")
+        if order not in ("asc", "desc"):
+            errors.append({"loc": ["query", "order"], "msg": "unexpected value; permitted: 'asc', 'desc'", "type": "value_error.const"})
+        if errors:
+            raise ApiError(422, errors)
+        return page, size, sort_by, order, params.get("search") or None
+
+    def _handle(self, method: str):
+        try:
+            # Тело читается до любых проверок, иначе его остаток испортит следующий запрос keep-alive
+            self._body = self._read_body()
+            status, payload = self._route(method)
+        except ApiError as e:
+            status, payload = e.status, {"detail": e.detail}
+        except Exception as e:  # Сервер не должен падать, но 500 должен быть виден тестам
+            status, payload = 500, {"detail": f"Internal Server Error: {e}"}
+        self._send_json(status, payload, conditional=(method == "GET" and status == 200))
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_PUT(self):
+        self._handle("PUT")
+
+    def do_DELETE(self):
+        self._handle("DELETE")
+
+
+class FakeItemsHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, address: Tuple[str, int], store: ItemsStore):
+        super().__init__(address, FakeItemsHandler)
+        self.store = store
+
+
+class FakeItemsServer:
+    """Фоновый fake-сервер Items API
+
+    Использование:
+        with FakeItemsServer() as server:
+            os.environ["BASE_URL"] = server.url
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, users: Optional[Dict[str, str]] = None):
+        self.store = ItemsStore(users)
+        self._httpd = FakeItemsHTTPServer((host, port), self.store)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeItemsServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="fake-items-api", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Локальный fake-сервер Items API")
+    parser.add_argument("--host", default="127.0.0.1", help="Адрес (по умолчанию: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8000, help="Порт (по умолчанию: 8000)")
+    args = parser.parse_args()
+
+    server = FakeItemsServer(args.host, args.port)
+    print(f"🚀 Fake Items API: {server.url} (Ctrl+C для остановки)")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
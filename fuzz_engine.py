@@ -0,0 +1,356 @@
+import itertools
+import json
+import random
+import threading
+import time
+import uuid
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, NamedTuple, Tuple
+from urllib.parse import quote
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.api.rate_limiter import TokenBucket
+from src.models.payload_pool import field_limits
+from src.models.schemas import ItemCreate, ItemUpdate
+
+ITEMS_PATH = "/api/v1/items/"
+# Отсутствующее поле в теле запроса
+MISSING = object()
+
+# Один символ (одна кодовая точка) на алфавит: длина строки считается в кодовых точках, как в pydantic
+CHARSETS = (
+    ("ascii", "a"),
+    ("cyrillic", "ж"),
+    ("cjk", "漢"),
+    ("emoji", "😀"),
+    ("rtl", "א"),
+    ("zero-width", "​"),
+    ("combining", "́"),
+    ("space", " "),
+    ("nul", "\x00"),
+    ("surrogate", "\ud800")
+)
+WRONG_TYPES = (
+    ("int", 123),
+    ("zero", 0),
+    ("negative", -1),
+    ("bigint", 10 ** 30),
+    ("float", 1.5),
+    ("true", True),
+    ("false", False),
+    ("list", ["a"]),
+    ("empty-list", []),
+    ("object", {"a": "b"})
+)
+BAD_IDS = (
+    ("not-uuid", "not-a-uuid"),
+    ("zero", "0"),
+    ("uuid-35", "00000000-0000-0000-0000-00000000000"),
+    ("uuid-37", "00000000-0000-0000-0000-0000000000000"),
+    ("braces", "{00000000-0000-0000-0000-000000000000}"),
+    ("non-hex", "zzzzzzzz-zzzz-zzzz-zzzz-zzzzzzzzzzzz"),
+    ("long", "x" * 1000),
+    ("unicode", "ж" * 36),
+    ("sql", "' OR '1'='1"),
+    ("dots", ".."),
+    ("nul", "\x00"),
+    ("missing", "00000000-0000-0000-0000-000000000000")
+)
+# Тела запросов входят в ключ кассеты - случайных значений в случаях быть не должно
+FUZZ_NAMESPACE = uuid.UUID("6f0c5a52-3c1e-4b8e-9a57-2f1d4c0b7e11")
+EXTRA_ID = str(uuid.uuid5(FUZZ_NAMESPACE, "extra-fields:id"))
+EXTRA_OWNER_ID = str(uuid.uuid5(FUZZ_NAMESPACE, "extra-fields:owner_id"))
+
+
+class FuzzValue(NamedTuple):
+    label: str
+    value: Any
+    valid: Optional[bool]
+
+
+class FuzzCase(NamedTuple):
+    """Один запрос: valid - ожидается 2xx (True), 4xx (False) или любой ответ кроме 5xx (None)"""
+    name: str
+    method: str
+    path: str
+    body: Optional[bytes]
+    valid: Optional[bool]
+    content_type: str = "application/json"
+
+
+class FuzzResult(NamedTuple):
+    case: FuzzCase
+    status: Optional[int]
+    elapsed: float
+    error: Optional[str] = None
+    excerpt: str = ""
+
+
+def encode(payload: Any) -> bytes:
+    """JSON как есть (UTF-8); строки с одиночными суррогатами - через \\u-экранирование"""
+    try:
+        return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    except UnicodeEncodeError:
+        return json.dumps(payload).encode("ascii")
+
+
+def string_values(min_length: Optional[int], max_length: Optional[int]) -> List[FuzzValue]:
+    """Строки на границах длины (±1) для каждого алфавита"""
+    low = min_length or 0
+    lengths = {low - 1, low, low + 1}
+    if max_length is not None:
+        lengths |= {max_length - 1, max_length, max_length + 1}
+    values = [FuzzValue("empty", "", low == 0)] if 0 in lengths else []
+    for length in sorted(n for n in lengths if n > 0):
+        valid = low <= length and (max_length is None or length <= max_length)
+        values.extend(FuzzValue(f"{name}*{length}", char * length, valid) for name, char in CHARSETS)
+    return values
+
+
+def field_values(model) -> Dict[str, List[FuzzValue]]:
+    """Граничные значения и путаница типов для каждого поля модели из ограничений Field()"""
+    values = {}
+    for name, limit in field_limits(model).items():
+        values[name] = (
+            string_values(limit["min_length"], limit["max_length"])
+            + [FuzzValue("none", None, not limit["required"]), FuzzValue("missing", MISSING, not limit["required"])]
+            + [FuzzValue(label, value, False) for label, value in WRONG_TYPES]
+        )
+    return values
+
+
+def body_cases(model, method: str, path: str, combine: bool = True) -> List[FuzzCase]:
+    """Тела запросов для модели
+
+    Каждое значение каждого поля при базовых значениях остальных полей,
+    а с combine - ещё все сочетания, где хотя бы одно поле невалидно
+    (сочетания только из валидных значений почти не добавляют проверок,
+    но для POST каждое из них создаёт элемент).
+    """
+    values = field_values(model)
+    baseline = {name: next(v for v in options if v.valid and v.value not in ("", None, MISSING))
+                for name, options in values.items()}
+    names = list(values)
+    combos = []
+    for name in names:
+        for value in values[name]:
+            combos.append(dict(baseline, **{name: value}))
+    if combine:
+        seen = {tuple(combo[n].label for n in names) for combo in combos}
+        for product in itertools.product(*(values[n] for n in names)):
+            labels = tuple(v.label for v in product)
+            if labels not in seen and not all(v.valid for v in product):
+                seen.add(labels)
+                combos.append(dict(zip(names, product)))
+
+    cases = []
+    for combo in combos:
+        if method == "PUT":
+            # null в необязательном поле обновления: API вправе как принять, так и отклонить
+            # (заголовок у элемента не может быть пустым) - проверяется только отсутствие 5xx
+            combo = {n: v._replace(valid=None) if v.value is None and v.valid else v for n, v in combo.items()}
+        payload = {n: v.value for n, v in combo.items() if v.value is not MISSING}
+        name = f"{method} {model.__name__} " + ", ".join(f"{n}={v.label}" for n, v in combo.items())
+        cases.append(FuzzCase(name, method, path, encode(payload), _case_validity(combo.values())))
+    return cases
+
+
+def _case_validity(values) -> Optional[bool]:
+    """Ожидание для запроса: False - есть невалидное поле, None - есть неоднозначное, иначе True"""
+    validity = [v.valid for v in values]
+    if False in validity:
+        return False
+    return None if None in validity else True
+
+
+def raw_body_cases() -> List[FuzzCase]:
+    """Тела, которые ломают разбор JSON, а не валидацию полей"""
+    valid = {"title": "Fuzz item", "description": "Fuzz description"}
+    deep = b'{"title": ' + b"[" * 10000 + b"]" * 10000 + b"}"
+    return [
+        FuzzCase("POST raw broken-json", "POST", ITEMS_PATH, b'{"title": ', False),
+        FuzzCase("POST raw empty-body", "POST", ITEMS_PATH, b"", False),
+        FuzzCase("POST raw json-array", "POST", ITEMS_PATH, b"[]", False),
+        FuzzCase("POST raw json-null", "POST", ITEMS_PATH, b"null", False),
+        FuzzCase("POST raw json-string", "POST", ITEMS_PATH, b'"title"', False),
+        FuzzCase("POST raw invalid-utf8", "POST", ITEMS_PATH, b'{"title": "\xff\xfe"}', False),
+        FuzzCase("POST raw duplicate-keys", "POST", ITEMS_PATH, b'{"title": "Fuzz", "title": 5}', False),
+        FuzzCase("POST raw deep-nesting", "POST", ITEMS_PATH, deep, False),
+        FuzzCase("POST raw oversized", "POST", ITEMS_PATH, encode(dict(valid, title="a" * 2 * 1024 * 1024)), False),
+        FuzzCase("POST raw extra-fields", "POST", ITEMS_PATH,
+                 encode(dict(valid, id=EXTRA_ID, owner_id=EXTRA_OWNER_ID)), True),
+        FuzzCase("POST raw text-plain", "POST", ITEMS_PATH, encode(valid), None, "text/plain"),
+        FuzzCase("POST raw form-urlencoded", "POST", ITEMS_PATH, b"title=Fuzz", False,
+                 "application/x-www-form-urlencoded")
+    ]
+
+
+def id_cases(existing_id: Optional[str] = None) -> List[FuzzCase]:
+    """Невалидные и несуществующие ID для маршрутов /items/{id}"""
+    body = encode({"title": "Fuzz update"})
+    cases = []
+    for label, item_id in BAD_IDS:
+        path = f"{ITEMS_PATH}{quote(item_id, safe='')}"
+        cases.append(FuzzCase(f"GET id={label}", "GET", path, None, False))
+        cases.append(FuzzCase(f"PUT id={label}", "PUT", path, body, False))
+        cases.append(FuzzCase(f"DELETE id={label}", "DELETE", path, None, False))
+    if existing_id:
+        # Другая запись того же UUID: API может как найти элемент, так и отказать - но не упасть
+        for label, item_id in (("upper", existing_id.upper()), ("no-hyphens", existing_id.replace("-", ""))):
+            cases.append(FuzzCase(f"GET id=existing-{label}", "GET", f"{ITEMS_PATH}{item_id}", None, None))
+    return cases
+
+
+def build_cases(
+        existing_id: Optional[str] = None,
+        combine: bool = True,
+        max_cases: Optional[int] = None,
+        seed: int = 4203
+) -> List[FuzzCase]:
+    """Полный набор случаев; PUT-тела проверяются на существующем элементе (existing_id)
+
+    max_cases - детерминированная (seed) выборка из набора.
+    """
+    cases = body_cases(ItemCreate, "POST", ITEMS_PATH, combine) + raw_body_cases() + id_cases(existing_id)
+    if existing_id:
+        cases += body_cases(ItemUpdate, "PUT", f"{ITEMS_PATH}{existing_id}", combine)
+    if max_cases is not None and len(cases) > max_cases:
+        cases = random.Random(seed).sample(cases, max_cases)
+    return cases
+
+
+class FuzzReport:
+    """Результаты прогона, сгруппированные по статусу ответа"""
+
+    def __init__(self, results: List[FuzzResult], duration: float):
+        self.results = results
+        self.duration = duration
+
+    def by_status(self) -> Dict[Optional[int], List[FuzzResult]]:
+        groups = defaultdict(list)
+        for result in self.results:
+            groups[result.status].append(result)
+        return dict(groups)
+
+    @staticmethod
+    def _is_server_error(result: FuzzResult) -> bool:
+        return result.status is None or result.status >= 500
+
+    @property
+    def failures(self) -> List[Tuple[str, FuzzResult]]:
+        """5xx (и оборванные соединения) и 2xx на невалидные запросы"""
+        failures = []
+        for result in self.results:
+            if self._is_server_error(result):
+                failures.append(("server error", result))
+            elif result.case.valid is False and 200 <= result.status < 300:
+                failures.append(("unexpected 2xx", result))
+        return failures
+
+    @property
+    def rejected_valid(self) -> List[FuzzResult]:
+        """Валидные по schemas.py запросы, отклонённые API (строже схемы - не ошибка, но стоит знать)"""
+        return [
+            result for result in self.results
+            if result.case.valid is True and not self._is_server_error(result) and result.status >= 400
+        ]
+
+    @property
+    def created_ids(self) -> List[str]:
+        """ID элементов, созданных POST-запросами прогона (их нужно удалить)"""
+        ids = []
+        for result in self.results:
+            if result.case.method == "POST" and result.status is not None and 200 <= result.status < 300:
+                try:
+                    ids.append(json.loads(result.excerpt)["id"])
+                except (ValueError, KeyError, TypeError):
+                    pass
+        return ids
+
+    def summary(self, examples: int = 3) -> str:
+        lines = [f"{len(self.results)} requests in {self.duration:.2f}s "
+                 f"({len(self.results) / max(self.duration, 1e-9):.0f} req/s)"]
+        for status, results in sorted(self.by_status().items(), key=lambda kv: (kv[0] is None, kv[0] or 0)):
+            names = "; ".join(r.case.name for r in results[:examples])
+            lines.append(f"  {status if status is not None else 'error'}: {len(results)}  e.g. {names}")
+        counts = Counter(kind for kind, _ in self.failures)
+        lines.append(f"failures: {dict(counts) or 0}, rejected valid: {len(self.rejected_valid)}")
+        for kind, result in self.failures[:20]:
+            detail = result.error or result.excerpt[:200]
+            lines.append(f"  ❌ {kind}: {result.case.name} -> {result.status} {detail}")
+        return "\n".join(lines)
+
+
+class FuzzEngine:
+    """Параллельная отправка fuzz-случаев через общий пул keep-alive соединений"""
+
+    def __init__(
+            self,
+            base_url: str,
+            headers: Dict[str, str],
+            workers: int = 32,
+            rps: Optional[float] = None,
+            timeout: float = 10.0,
+            cassette=None
+    ):
+        self.base_url = base_url
+        self.headers = {k: v for k, v in headers.items() if k.lower() != "content-type"}
+        self.workers = workers
+        self.timeout = timeout
+        self._bucket = TokenBucket(rps) if rps else None
+        self._local = threading.local()
+        self._sessions: List[requests.Session] = []
+        self._sessions_lock = threading.Lock()
+        self._cassette = cassette
+
+    def _session(self) -> requests.Session:
+        """Своя сессия на поток (requests.Session не гарантирует потокобезопасность)"""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            if self._cassette is not None:
+                from src.api.cassette import mount_cassette
+
+                mount_cassette(session, self._cassette)
+            else:
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=1)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+            self._local.session = session
+            with self._sessions_lock:
+                self._sessions.append(session)
+        return session
+
+    def _send(self, case: FuzzCase) -> FuzzResult:
+        if self._bucket is not None:
+            self._bucket.acquire()
+        headers = dict(self.headers, **{"Content-Type": case.content_type})
+        started = time.perf_counter()
+        try:
+            response = self._session().request(
+                case.method, f"{self.base_url}{case.path}", data=case.body, headers=headers, timeout=self.timeout
+            )
+        except requests.RequestException as e:
+            return FuzzResult(case, None, time.perf_counter() - started, f"{type(e).__name__}: {e}")
+        return FuzzResult(case, response.status_code, time.perf_counter() - started, excerpt=response.text[:2000])
+
+    def run(self, cases: List[FuzzCase]) -> FuzzReport:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="fuzz") as executor:
+            results = list(executor.map(self._send, cases))
+        return FuzzReport(results, time.perf_counter() - started)
+
+    def close(self):
+        with self._sessions_lock:
+            for session in self._sessions:
+                session.close()
+            self._sessions.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
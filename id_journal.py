@@ -0,0 +1,276 @@
+import json
+import mmap
+import os
+import socket
+import struct
+import threading
+import time
+import uuid
+import zlib
+from pathlib import Path
+from typing import Optional, Dict, Any, List, NamedTuple, Set, Tuple
+
+from src.api.token_cache import TokenCache
+
+DEFAULT_JOURNAL_DIR = Path.home() / ".cache" / "items_api" / "journal"
+
+# Заголовок фиксированного размера (magic + JSON с владельцем журнала), затем записи по 24 байта
+_MAGIC = b"ITEMSJ1\n"
+HEADER_SIZE = 512
+_RECORD = struct.Struct("<c3xI16s")
+RECORD_SIZE = _RECORD.size
+CREATED = b"C"
+DELETED = b"D"
+
+
+def journal_dir() -> Path:
+    return Path(os.getenv("ITEMS_JOURNAL_DIR") or DEFAULT_JOURNAL_DIR)
+
+
+def _pack_id(item_id: str) -> Optional[bytes]:
+    """16 байт канонического UUID или None для любой другой записи ID"""
+    try:
+        packed = uuid.UUID(item_id)
+    except (ValueError, TypeError, AttributeError):
+        return None
+    return packed.bytes if str(packed) == item_id else None
+
+
+def _record(kind: bytes, packed_id: bytes) -> bytes:
+    return _RECORD.pack(kind, zlib.crc32(kind + packed_id), packed_id)
+
+
+class IdJournal:
+    """Журнал ID созданных элементов: переживает аварийное завершение процесса
+
+    Один файл на процесс и учётную запись (base URL + пользователь). Каждое
+    создание и удаление дописывается записью фиксированного размера через
+    O_APPEND - после kill процесса записи уже в ядре; fsync выполняется
+    пачкой в фоне раз в fsync_interval (защита от сбоя ОС). При закрытии
+    журнал без «живых» ID удаляется, иначе остаётся для recover (см. find_leaks).
+    """
+
+    _registry: Dict[Tuple[int, str], "IdJournal"] = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, base_url: str, username: Optional[str], directory: Optional[Path] = None,
+                 fsync_interval: float = 0.5):
+        self.base_url = base_url
+        self.username = username
+        self.pid = os.getpid()
+        directory = Path(directory or journal_dir())
+        directory.mkdir(parents=True, exist_ok=True)
+        key = TokenCache.make_key(base_url, username)[:16]
+        self.path = directory / f"{socket.gethostname()}-{self.pid}-{key}.journal"
+        self.fsync_interval = fsync_interval
+        self._lock = threading.Lock()
+        self._live: Set[bytes] = set()
+        self._dirty = False
+        self._closed = threading.Event()
+        self._refs = 0
+        self._warned_odd_id = False
+        self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+        if os.fstat(self._fd).st_size == 0:
+            os.write(self._fd, self._header())
+        self._flusher = threading.Thread(target=self._flush_loop, name="id-journal", daemon=True)
+        self._flusher.start()
+
+    @classmethod
+    def acquire(cls, base_url: str, username: Optional[str]) -> "IdJournal":
+        """Общий журнал процесса для учётной записи (парный вызов - release)"""
+        key = (os.getpid(), TokenCache.make_key(base_url, username))
+        with cls._registry_lock:
+            journal = cls._registry.get(key)
+            if journal is None:
+                journal = cls._registry[key] = cls(base_url, username)
+            journal._refs += 1
+            return journal
+
+    def _header(self) -> bytes:
+        owner = json.dumps({
+            "base_url": self.base_url,
+            "username": self.username,
+            "host": socket.gethostname(),
+            "pid": self.pid,
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%S%z")
+        }, ensure_ascii=False).encode()
+        if len(_MAGIC) + len(owner) + 1 > HEADER_SIZE:
+            raise ValueError("Journal header is too long (base URL or username)")
+        return (_MAGIC + owner + b"\n").ljust(HEADER_SIZE, b" ")
+
+    def _append(self, kind: bytes, item_id: str) -> Optional[bytes]:
+        packed = _pack_id(item_id)
+        if packed is None:
+            if not self._warned_odd_id:
+                self._warned_odd_id = True
+                print(f"⚠️ ID journal stores UUIDs only, skipping {item_id!r}")
+            return None
+        with self._lock:
+            if self._closed.is_set():
+                return None
+            os.write(self._fd, _record(kind, packed))
+            self._dirty = True
+        return packed
+
+    def created(self, item_id: str):
+        packed = self._append(CREATED, item_id)
+        if packed is not None:
+            with self._lock:
+                self._live.add(packed)
+
+    def deleted(self, item_id: str):
+        packed = _pack_id(item_id)
+        with self._lock:
+            owned = packed in self._live
+        # Удаление чужих элементов тоже отмечается - их мог создать другой процесс
+        if self._append(DELETED, item_id) is not None and owned:
+            with self._lock:
+                self._live.discard(packed)
+
+    def live_count(self) -> int:
+        with self._lock:
+            return len(self._live)
+
+    def flush(self):
+        with self._lock:
+            if not self._dirty or self._closed.is_set():
+                return
+            self._dirty = False
+            os.fsync(self._fd)
+
+    def _flush_loop(self):
+        while not self._closed.wait(self.fsync_interval):
+            self.flush()
+
+    def _close(self, remove: bool):
+        self.flush()
+        with self._lock:
+            if self._closed.is_set():
+                return
+            self._closed.set()
+            os.close(self._fd)
+            live = len(self._live)
+        if remove:
+            self.path.unlink(missing_ok=True)
+        elif live:
+            print(f"⚠️ {live} created items were not deleted, ID journal kept: {self.path}")
+
+    def release(self):
+        """Клиент больше не пишет в журнал; последний закрывает его"""
+        with self._registry_lock:
+            self._refs -= 1
+            if self._refs > 0:
+                return
+            self._registry.pop((self.pid, TokenCache.make_key(self.base_url, self.username)), None)
+        self._close(remove=self.live_count() == 0)
+
+    def forget(self):
+        """Созданные элементы оставлены намеренно (например, тестовые данные) - журнал не нужен"""
+        with self._registry_lock:
+            self._registry.pop((self.pid, TokenCache.make_key(self.base_url, self.username)), None)
+        with self._lock:
+            self._live.clear()
+        self._close(remove=True)
+
+    @classmethod
+    def forget_all(cls):
+        """forget для всех журналов процесса"""
+        with cls._registry_lock:
+            journals = [j for (pid, _), j in cls._registry.items() if pid == os.getpid()]
+        for journal in journals:
+            journal.forget()
+
+
+class JournalFile(NamedTuple):
+    path: Path
+    owner: Dict[str, Any]
+    created: List[str]
+    deleted: Set[str]
+
+
+def _unpack_id(packed: bytes) -> str:
+    return str(uuid.UUID(bytes=packed))
+
+
+def read_journal(path: Path) -> Optional[JournalFile]:
+    """Чтение журнала через mmap; оборванная последняя запись и записи с неверной CRC пропускаются"""
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < HEADER_SIZE:
+            return None
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if mm[:len(_MAGIC)] != _MAGIC:
+                return None
+            owner = json.loads(mm[len(_MAGIC):HEADER_SIZE].decode().strip())
+            end = HEADER_SIZE + (size - HEADER_SIZE) // RECORD_SIZE * RECORD_SIZE
+            created: List[str] = []
+            deleted: Set[str] = set()
+            with memoryview(mm) as view:
+                for kind, crc, packed in _RECORD.iter_unpack(view[HEADER_SIZE:end]):
+                    if zlib.crc32(kind + packed) != crc:
+                        continue
+                    if kind == CREATED:
+                        created.append(_unpack_id(packed))
+                    elif kind == DELETED:
+                        deleted.add(_unpack_id(packed))
+    return JournalFile(path, owner, created, deleted)
+
+
+def _process_alive(owner: Dict[str, Any]) -> bool:
+    """Жив ли процесс-владелец журнала (журналы с других хостов считаются живыми)"""
+    if owner.get("host") != socket.gethostname():
+        return True
+    pid = owner.get("pid")
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, TypeError):
+        return True
+    return True
+
+
+class Leaks(NamedTuple):
+    """Неудалённые элементы одной учётной записи и журналы, из которых они собраны"""
+    base_url: str
+    username: Optional[str]
+    item_ids: List[str]
+    paths: List[Path]
+
+
+def find_leaks(directory: Optional[Path] = None, force: bool = False) -> List[Leaks]:
+    """Живые ID из журналов завершившихся процессов, по учётным записям
+
+    Удаления учитываются из всех журналов (элемент мог удалить другой процесс,
+    например главный процесс xdist). force - включить и журналы работающих
+    процессов или других хостов.
+    """
+    directory = Path(directory or journal_dir())
+    groups: Dict[Tuple[str, Optional[str]], Dict[str, Any]] = {}
+    for path in sorted(directory.glob("*.journal")):
+        try:
+            journal = read_journal(path)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Unreadable ID journal {path}: {e}")
+            continue
+        if journal is None:
+            continue
+        key = (journal.owner.get("base_url"), journal.owner.get("username"))
+        group = groups.setdefault(key, {"created": {}, "deleted": set(), "paths": []})
+        group["deleted"] |= journal.deleted
+        if force or not _process_alive(journal.owner):
+            group["created"].update(dict.fromkeys(journal.created))
+            group["paths"].append(path)
+
+    return [
+        Leaks(base_url, username, [i for i in group["created"] if i not in group["deleted"]], group["paths"])
+        for (base_url, username), group in groups.items()
+        if group["paths"]
+    ]
+
+
+def remove_journals(paths: List[Path]):
+    for path in paths:
+        path.unlink(missing_ok=True)
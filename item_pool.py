@@ -0,0 +1,99 @@
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Deque, Dict, Any, List
+
+from requests import HTTPError
+
+from cleanup_registry import ALREADY_GONE_STATUSES
+from src.models.schemas import ItemResponse
+
+
+class ItemPool:
+    """Пул переиспользуемых элементов сессии вместо создания и удаления на каждый тест
+
+    Элементы создаются пачкой параллельно и выдаются тестам в аренду (lease).
+    По окончании аренды (release) элемент возвращается к исходным title и
+    description одним update_item; если вернуть не удалось (тест удалил
+    элемент или сервер не принял исходные значения), элемент выводится из
+    пула. Когда свободных элементов нет, пул создаёт ещё один. В конце
+    сессии (close) все элементы пула удаляются параллельно.
+    """
+
+    def __init__(self, client, make_data: Callable[[int], Dict[str, Any]], size: int = 4, workers: int = 8):
+        """make_data(index) - данные для создания index-го элемента пула"""
+        self.client = client
+        self.make_data = make_data
+        self.workers = workers
+        self._lock = threading.Lock()
+        self._free: Deque[ItemResponse] = deque()
+        self._baselines: Dict[str, Dict[str, Any]] = {}
+        self._next_index = 0
+        self.leases = 0
+        self.resets = 0
+        self.retired = 0
+        if size > 0:
+            with ThreadPoolExecutor(max_workers=min(workers, size), thread_name_prefix="item-pool") as executor:
+                self._free.extend(executor.map(lambda _: self._create(), range(size)))
+        print(f"♻️ Item pool: {size} items ready")
+
+    def _create(self) -> ItemResponse:
+        with self._lock:
+            index = self._next_index
+            self._next_index += 1
+        item = self.client.create_item(self.make_data(index))
+        with self._lock:
+            self._baselines[item.id] = {"title": item.title, "description": item.description}
+        return item
+
+    def lease(self) -> ItemResponse:
+        """Свободный элемент пула в исходном состоянии"""
+        with self._lock:
+            item = self._free.popleft() if self._free else None
+            self.leases += 1
+        return item if item is not None else self._create()
+
+    def _retire(self, item_id: str, reason: str):
+        print(f"⚠️ Pool item {item_id} retired: {reason}")
+        with self._lock:
+            self.retired += 1
+
+    def release(self, item: ItemResponse):
+        """Вернуть элемент в пул, восстановив исходные title и description"""
+        baseline = self._baselines[item.id]
+        try:
+            restored = self.client.update_item(item.id, baseline)
+        except Exception as e:
+            self._retire(item.id, str(e))
+            return
+        if restored.title != baseline["title"] or restored.description != baseline["description"]:
+            self._retire(item.id, "baseline was not restored")
+            return
+        with self._lock:
+            self._free.append(restored)
+            self.resets += 1
+
+    def _delete(self, item_id: str) -> bool:
+        try:
+            self.client.delete_item(item_id)
+        except HTTPError as e:
+            if e.response is not None and e.response.status_code in ALREADY_GONE_STATUSES:
+                return True
+            print(f"⚠️ Could not delete pool item {item_id}: {e}")
+            return False
+        except Exception as e:
+            print(f"⚠️ Could not delete pool item {item_id}: {e}")
+            return False
+        return True
+
+    def close(self) -> List[str]:
+        """Удалить все элементы пула (и выданные, и выведенные); возвращает ID, которые удалить не удалось"""
+        with self._lock:
+            item_ids = list(self._baselines)
+            self._free.clear()
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="item-pool") as executor:
+            deleted = list(executor.map(self._delete, item_ids))
+        leaked = [item_id for item_id, ok in zip(item_ids, deleted) if not ok]
+        print(f"\n♻️ Item pool: {len(item_ids)} items, {self.leases} leases, {self.resets} resets, "
+              f"{self.retired} retired, leaked {len(leaked)}")
+        return leaked
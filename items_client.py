@@ -1,39 +1,344 @@
 import requests
 import os
-from typing import Optional, Dict, Any
-from dotenv import load_dotenv
-
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, Iterator, List, Type, TypeVar, Union, TYPE_CHECKING
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from pydantic import BaseModel
+
+from src.api import json_codec
+from src.api.env import load_env
+from src.api.id_journal import IdJournal
+from src.api.metrics import ClientHook, RequestEvent
+from src.api.read_cache import ReadCache, CacheEntry
+from src.api.token_cache import TokenCache
+from src.models.columnar_items import ColumnarItems, ColumnarItemsList
 from src.models.schemas import (
     ItemCreate, ItemUpdate, ItemResponse,
     ItemsListResponse, TokenResponse, ErrorResponse
 )
 
-load_dotenv()
+if TYPE_CHECKING:
+    from src.api.cassette import Cassette
+    from src.api.retry_policy import RetryPolicy
+
+VALIDATION_MODES = ("full", "sampled", "none")
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+def build_model(model: Type[ModelT], payload: Dict[str, Any], validate: bool = True) -> ModelT:
+    """Модель из ответа API: с полной валидацией или через construct() без неё
+
+    Без валидации поля не приводятся к типам (created_at остаётся строкой),
+    вложенные элементы списка собираются тем же способом.
+    """
+    if validate:
+        return model.parse_obj(payload)
+    if model is ItemsListResponse:
+        return ItemsListResponse.construct(
+            **dict(payload, data=[ItemResponse.construct(**item) for item in payload["data"]])
+        )
+    return model.construct(**payload)
 
 
 class ItemsAPIClient:
     """Клиент для работы с Items API"""
 
-    def __init__(self):
+    def __init__(
+            self,
+            pool_connections: int = 10,
+            pool_maxsize: int = 10,
+            max_retries: int = 0,
+            keep_alive: bool = True,
+            pool_block: bool = False,
+            token_cache: bool = True,
+            validation: str = "full",
+            sample_rate: float = 0.1,
+            hooks: Optional[List[ClientHook]] = None,
+            cassette: Optional["Cassette"] = None,
+            read_cache: Optional[ReadCache] = None,
+            username: Optional[str] = None,
+            password: Optional[str] = None,
+            retry_policy: Optional["RetryPolicy"] = None,
+            journal: bool = True,
+            connect_timeout: Optional[float] = None,
+            read_timeout: Optional[float] = None
+    ):
+        """
+        pool_connections - сколько пулов (хостов) держать в кэше адаптера
+        pool_maxsize - максимум соединений на один хост
+        max_retries - повторы на уровне соединения (только идемпотентные методы)
+        keep_alive - переиспользовать соединения между запросами
+        pool_block - ждать свободное соединение вместо открытия лишнего
+        token_cache - брать токен из общего дискового кэша (TOKEN_CACHE_PATH)
+        validation - проверка входных данных и ответов:
+            full - всегда (pydantic), sampled - для доли sample_rate вызовов,
+            none - без проверки (модели собираются через construct)
+        hooks - хуки инструментирования (подключаются до логина, чтобы учесть и его)
+        cassette - запись запросов в JSONL-кассету или ответы из неё (record/replay)
+        read_cache - кэш чтения элементов и страниц списка (по умолчанию выключен)
+        username, password - учётная запись (по умолчанию USER_EMAIL, USER_PASSWORD)
+        retry_policy - повторы с backoff и хеджирование GET (по умолчанию - без повторов)
+        journal - журнал ID созданных элементов для уборки после аварийного завершения (ITEMS_JOURNAL_DIR)
+        connect_timeout, read_timeout - таймауты запроса в секундах
+            (по умолчанию ITEMS_CONNECT_TIMEOUT=5, ITEMS_READ_TIMEOUT=30)
+
+        Логин откладывается до первого запроса к API (или обращения к token/headers).
+        """
+        if validation not in VALIDATION_MODES:
+            raise ValueError(f"validation must be one of {VALIDATION_MODES}, got {validation!r}")
+        self.validation = validation
+        self.sample_rate = sample_rate
+        self.hooks: List[ClientHook] = list(hooks or [])
+        self.read_cache = read_cache
+        self.retry_policy = retry_policy
+        load_env()
         self.base_url = os.getenv("BASE_URL", "https://api.fast-api.senior-pomidorov.ru")
-        self.token = self._get_auth_token()
-        self.headers = {
-            "Authorization": f"Bearer {self.token}",
+        self.username = username or os.getenv("USER_EMAIL")
+        self._password = password or os.getenv("USER_PASSWORD")
+        # Без таймаута зависший запрос блокирует навсегда, а повторы по Timeout не срабатывают
+        self.timeout = (
+            connect_timeout if connect_timeout is not None else float(os.getenv("ITEMS_CONNECT_TIMEOUT", "5")),
+            read_timeout if read_timeout is not None else float(os.getenv("ITEMS_READ_TIMEOUT", "30"))
+        )
+        self.session = self._build_session(
+            pool_connections, pool_maxsize, max_retries, keep_alive, pool_block, cassette
+        )
+        self.token_cache = TokenCache() if token_cache else None
+        self.journal = IdJournal.acquire(self.base_url, self.username) if journal else None
+        self._token: Optional[str] = None
+        self._token_lock = threading.Lock()
+        self._base_headers = {
             "Content-Type": "application/json",
-            "Accept": "application/json"
+            "Accept": "application/json",
+            "Accept-Encoding": "gzip"
         }
         print(f"✅ API Client initialized for {self.base_url}")
 
+    @staticmethod
+    def _build_session(
+            pool_connections: int,
+            pool_maxsize: int,
+            max_retries: int,
+            keep_alive: bool,
+            pool_block: bool,
+            cassette: Optional["Cassette"] = None
+    ) -> requests.Session:
+        """Сессия с общим пулом keep-alive соединений"""
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=0.2,
+            allowed_methods=frozenset(["GET", "PUT", "DELETE", "HEAD", "OPTIONS"]),
+            raise_on_status=False
+        )
+        adapter_kwargs = dict(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=retry,
+            pool_block=pool_block
+        )
+        session = requests.Session()
+        if cassette is not None:
+            from src.api.cassette import mount_cassette
+
+            mount_cassette(session, cassette, **adapter_kwargs)
+        else:
+            adapter = HTTPAdapter(**adapter_kwargs)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+        session.headers["Connection"] = "keep-alive" if keep_alive else "close"
+        return session
+
+    def pool_stats(self) -> Dict[str, int]:
+        """Статистика пула: hits - запросы по уже открытому соединению, misses - новые соединения"""
+        requests_total = 0
+        connections = 0
+        pools = 0
+        adapters = {id(a): a for a in self.session.adapters.values()}
+        for adapter in adapters.values():
+            pool_manager = getattr(adapter, "poolmanager", None)
+            if pool_manager is None:
+                continue
+            for key in list(pool_manager.pools.keys()):
+                pool = pool_manager.pools.get(key)
+                if pool is None:
+                    continue
+                pools += 1
+                requests_total += pool.num_requests
+                connections += pool.num_connections
+        return {
+            "pools": pools,
+            "requests": requests_total,
+            "hits": max(requests_total - connections, 0),
+            "misses": connections
+        }
+
+    def close(self):
+        """Закрытие всех соединений пула"""
+        stats = self.pool_stats()
+        if self.retry_policy is not None:
+            self.retry_policy.close()
+        if self.journal is not None:
+            self.journal.release()
+            self.journal = None
+        self.session.close()
+        print(f"🔌 Connection pool closed (hits: {stats['hits']}, misses: {stats['misses']})")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _obtain_token(self, stale_token: Optional[str] = None) -> str:
+        """Токен из кэша (если он ещё действует) или новый логин"""
+        if self.token_cache is None:
+            return self._get_auth_token()
+        key = TokenCache.make_key(self.base_url, self.username)
+        return self.token_cache.get_or_fetch(key, self._get_auth_token, stale_token=stale_token)
+
+    @property
+    def token(self) -> str:
+        """Токен авторизации; логин выполняется при первом обращении (один на все потоки)"""
+        if self._token is None:
+            with self._token_lock:
+                if self._token is None:
+                    self._token = self._obtain_token()
+        return self._token
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        """Заголовки авторизованного запроса (копия)"""
+        return {**self._base_headers, "Authorization": f"Bearer {self.token}"}
+
+    def _refresh_token(self, rejected_token: str):
+        """Замена отвергнутого сервером токена (если другой поток его ещё не заменил)"""
+        with self._token_lock:
+            if self._token == rejected_token:
+                self._token = self._obtain_token(stale_token=rejected_token)
+
+    def add_hook(self, hook: ClientHook):
+        """Подключение хука инструментирования (например, MetricsCollector)"""
+        self.hooks.append(hook)
+
+    def _send(self, endpoint: str, method: str, url: str, **kwargs) -> requests.Response:
+        """Один HTTP-вызов; при подключённых хуках - с замером времени и объёма"""
+        kwargs.setdefault("timeout", self.timeout)
+        if not self.hooks:
+            return self.session.request(method, url, **kwargs)
+
+        connections_before = self.pool_stats()["misses"]
+        started = time.perf_counter()
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except requests.RequestException as e:
+            elapsed = time.perf_counter() - started
+            event = RequestEvent(endpoint, method, None, 0, 0, False, elapsed, 0.0, elapsed, type(e).__name__)
+            for hook in self.hooks:
+                hook.on_request(event)
+            raise
+        total = time.perf_counter() - started
+
+        body = response.request.body or b""
+        server = min(response.elapsed.total_seconds(), total)
+        event = RequestEvent(
+            endpoint=endpoint,
+            method=method,
+            status=response.status_code,
+            bytes_out=len(body.encode() if isinstance(body, str) else body),
+            bytes_in=len(response.content),
+            new_connection=self.pool_stats()["misses"] > connections_before,
+            server=server,
+            transfer=total - server,
+            total=total
+        )
+        for hook in self.hooks:
+            hook.on_request(event)
+        return response
+
+    def _request(
+            self,
+            method: str,
+            path: str,
+            endpoint: str,
+            headers: Optional[Dict[str, str]] = None,
+            **kwargs
+    ) -> requests.Response:
+        """Запрос к API с авторизацией; при 401 токен обновляется и запрос повторяется один раз"""
+        url = f"{self.base_url}{path}"
+
+        def send() -> requests.Response:
+            return self._send(endpoint, method, url, headers={**self.headers, **(headers or {})}, **kwargs)
+
+        def send_with_policy() -> requests.Response:
+            if self.retry_policy is None:
+                return send()
+            return self.retry_policy.execute(endpoint, method, send)
+
+        token = self.token
+        response = send_with_policy()
+
+        if response.status_code == 401:
+            print("🔐 Token rejected (401), refreshing...")
+            self._refresh_token(token)
+            response = send_with_policy()
+
+        return response
+
+    def _should_validate(self) -> bool:
+        if self.validation == "full":
+            return True
+        if self.validation == "none":
+            return False
+        return random.random() < self.sample_rate
+
+    def _check_input(self, model: Type[BaseModel], item_data: Dict[str, Any]):
+        """Валидация входных данных через Pydantic (с учётом режима валидации)"""
+        if self._should_validate():
+            model(**item_data)
+
+    def _parse(self, model: Type[ModelT], response: requests.Response, endpoint: str) -> ModelT:
+        if not self.hooks:
+            return build_model(model, json_codec.loads(response.content), validate=self._should_validate())
+
+        started = time.perf_counter()
+        result = build_model(model, json_codec.loads(response.content), validate=self._should_validate())
+        elapsed = time.perf_counter() - started
+        for hook in self.hooks:
+            hook.on_decode(endpoint, elapsed)
+        return result
+
+    @staticmethod
+    def _conditional_headers(entry: Optional[CacheEntry]) -> Optional[Dict[str, str]]:
+        if entry is not None and entry.etag:
+            return {"If-None-Match": entry.etag}
+        return None
+
+    def _item_written(self, item: ItemResponse, response: requests.Response):
+        """Write-through: новый ответ элемента в кэш (страницы списка - сбросить) и хукам"""
+        if self.read_cache is not None:
+            self.read_cache.put_item(item.id, item, response.headers.get("ETag"))
+            self.read_cache.invalidate_pages()
+        for hook in self.hooks:
+            hook.on_item_written(item)
+
     def _get_auth_token(self) -> str:
         """Получение токена авторизации"""
         auth_data = {
-            "username": os.getenv("USER_EMAIL"),
-            "password": os.getenv("USER_PASSWORD")
+            "username": self.username,
+            "password": self._password
         }
 
         print(f"🔐 Getting token for user: {auth_data['username']}")
 
-        response = requests.post(
+        response = self._send(
+            "login",
+            "POST",
             f"{self.base_url}/api/v1/login/access-token",
             data=auth_data,
             headers={"Content-Type": "application/x-www-form-urlencoded"}
@@ -49,21 +354,21 @@ class ItemsAPIClient:
     def create_item(self, item_data: Dict[str, Any]) -> ItemResponse:
         """POST /api/v1/items/ - создание элемента"""
         # Валидация входных данных через Pydantic
-        ItemCreate(**item_data)
+        self._check_input(ItemCreate, item_data)
 
         print(f"📝 Creating item: {item_data['title'][:30]}...")
 
-        response = requests.post(
-            f"{self.base_url}/api/v1/items/",
-            json=item_data,
-            headers=self.headers
-        )
+        response = self._request("POST", "/api/v1/items/", "create", data=json_codec.dumps(item_data))
 
         if response.status_code not in [200, 201]:
             print(f"❌ Create failed: {response.status_code} - {response.text}")
             response.raise_for_status()
 
-        return ItemResponse.parse_obj(response.json())
+        item = self._parse(ItemResponse, response, "create")
+        if self.journal is not None:
+            self.journal.created(item.id)
+        self._item_written(item, response)
+        return item
 
     def get_items(
             self,
@@ -71,76 +376,173 @@ class ItemsAPIClient:
             size: int = 10,
             sort_by: Optional[str] = None,
             order: str = "asc",
-            search: Optional[str] = None
-    ) -> ItemsListResponse:
-        """GET /api/v1/items/ - получение списка элементов"""
+            search: Optional[str] = None,
+            raw: bool = False
+    ) -> Union[ItemsListResponse, Dict[str, Any]]:
+        """GET /api/v1/items/ - получение списка элементов
+
+        raw=True - вернуть словарь из JSON без построения моделей (для доверенных bulk-путей)
+        """
         params = {"page": page, "size": size}
         if sort_by:
             params.update({"sort_by": sort_by, "order": order})
         if search:
             params["search"] = search
 
+        cache_key = (page, size, sort_by, order if sort_by else None, search)
+        cached = None
+        if self.read_cache is not None and not raw:
+            cached, fresh = self.read_cache.lookup_page(cache_key)
+            if fresh:
+                return cached.value
+
         print(f"📋 Getting items page {page}, size {size}")
 
-        response = requests.get(
-            f"{self.base_url}/api/v1/items/",
-            params=params,
-            headers=self.headers
+        response = self._request(
+            "GET", "/api/v1/items/", "list", headers=self._conditional_headers(cached), params=params
         )
 
+        if response.status_code == 304 and cached is not None:
+            self.read_cache.mark_revalidated(cache_key, cached, page=True)
+            return cached.value
+
         if response.status_code != 200:
             print(f"❌ Get items failed: {response.status_code} - {response.text}")
             response.raise_for_status()
 
-        return ItemsListResponse.parse_obj(response.json())
+        if raw:
+            return json_codec.loads(response.content)
+        items = self._parse(ItemsListResponse, response, "list")
+        if self.read_cache is not None:
+            self.read_cache.put_page(cache_key, items, response.headers.get("ETag"))
+        return items
+
+    def iter_items(
+            self,
+            size: int = 100,
+            sort_by: Optional[str] = None,
+            order: str = "asc",
+            search: Optional[str] = None,
+            prefetch: bool = True
+    ) -> Iterator[ItemResponse]:
+        """Ленивый обход всех страниц GET /api/v1/items/
+
+        Пока вызывающий код обрабатывает страницу N, страница N+1 уже
+        загружается в фоне. Если генератор закрыт раньше времени,
+        фоновая загрузка отменяется.
+        """
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+
+        def fetch(page_number: int) -> ItemsListResponse:
+            return self.get_items(page=page_number, size=size, sort_by=sort_by, order=order, search=search)
+
+        page = 1
+        seen = 0
+        pending = executor.submit(fetch, page) if executor else None
+        try:
+            while True:
+                current = pending.result() if executor else fetch(page)
+                seen += len(current.data)
+                last_page = (
+                    len(current.data) < size
+                    or seen >= current.count
+                    or current.has_next is False
+                )
+                pending = executor.submit(fetch, page + 1) if executor and not last_page else None
+
+                yield from current.data
+
+                if last_page:
+                    return
+                page += 1
+        finally:
+            if executor:
+                if pending is not None:
+                    pending.cancel()
+                executor.shutdown(wait=False)
+
+    def scan_items(
+            self,
+            size: int = 100,
+            sort_by: Optional[str] = None,
+            order: str = "asc",
+            search: Optional[str] = None
+    ) -> ColumnarItemsList:
+        """Все страницы GET /api/v1/items/ в колоночном виде - для полных выгрузок и снимков
+
+        Страницы разбираются без моделей, ItemResponse строится при обращении к строке.
+        count - из последней страницы, как у get_items.
+        """
+        items = ColumnarItems()
+        page = 1
+        while True:
+            response = self.get_items(page=page, size=size, sort_by=sort_by, order=order, search=search, raw=True)
+            items.extend(response["data"])
+            if len(response["data"]) < size or len(items) >= response["count"]:
+                return ColumnarItemsList(items, response["count"])
+            page += 1
 
     def update_item(self, item_id: int, item_data: Dict[str, Any]) -> ItemResponse:
         """PUT /api/v1/items/{id} - полное обновление элемента"""
         # Валидация входных данных через Pydantic
-        ItemUpdate(**item_data)
+        self._check_input(ItemUpdate, item_data)
 
         print(f"🔄 Updating item {item_id}")
 
-        response = requests.put(
-            f"{self.base_url}/api/v1/items/{item_id}",
-            json=item_data,
-            headers=self.headers
-        )
+        response = self._request("PUT", f"/api/v1/items/{item_id}", "update", data=json_codec.dumps(item_data))
 
         if response.status_code != 200:
             print(f"❌ Update failed: {response.status_code} - {response.text}")
             response.raise_for_status()
 
-        return ItemResponse.parse_obj(response.json())
+        item = self._parse(ItemResponse, response, "update")
+        self._item_written(item, response)
+        return item
 
     def delete_item(self, item_id: str) -> bool:
         """DELETE /api/v1/items/{id} - удаление элемента"""
         print(f"🗑️ Deleting item {item_id}")
 
-        response = requests.delete(
-            f"{self.base_url}/api/v1/items/{item_id}",
-            headers=self.headers
-        )
+        response = self._request("DELETE", f"/api/v1/items/{item_id}", "delete")
 
-        if response.status_code == 204:
-            print(f"✅ Item {item_id} deleted")
-            return True
+        if self.read_cache is not None:
+            self.read_cache.invalidate_item(item_id)
+            self.read_cache.invalidate_pages()
 
-        if response.status_code != 200:
+        if response.status_code not in [200, 204]:
             print(f"❌ Delete failed: {response.status_code} - {response.text}")
             response.raise_for_status()
 
+        if self.journal is not None:
+            self.journal.deleted(item_id)
+        for hook in self.hooks:
+            hook.on_item_deleted(item_id)
+
+        if response.status_code == 204:
+            print(f"✅ Item {item_id} deleted")
         return True
 
     def get_item_by_id(self, item_id: str) -> ItemResponse:
         """Получение элемента по ID (для проверки)"""
-        response = requests.get(
-            f"{self.base_url}/api/v1/items/{item_id}",
-            headers=self.headers
+        cached = None
+        if self.read_cache is not None:
+            cached, fresh = self.read_cache.lookup_item(item_id)
+            if fresh:
+                return cached.value
+
+        response = self._request(
+            "GET", f"/api/v1/items/{item_id}", "get", headers=self._conditional_headers(cached)
         )
 
+        if response.status_code == 304 and cached is not None:
+            self.read_cache.mark_revalidated(item_id, cached)
+            return cached.value
+
         if response.status_code != 200:
             print(f"❌ Get item failed: {response.status_code} - {response.text}")
             response.raise_for_status()
 
-        return ItemResponse.parse_obj(response.json())
\ No newline at end of file
+        item = self._parse(ItemResponse, response, "get")
+        if self.read_cache is not None:
+            self.read_cache.put_item(item_id, item, response.headers.get("ETag"))
+        return item
\ No newline at end of file
@@ -0,0 +1,243 @@
+import bisect
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, Any, List, NamedTuple, Tuple, Union
+
+from src.api.metrics import ClientHook
+
+# Порядок как у API (и fake_server): по полю, при равенстве - по id; desc - обратный порядок
+SORT_FIELDS = ("created_at", "title", "id")
+DEFAULT_SORT = "created_at"
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def timestamp_key(value: Union[str, datetime, None]) -> int:
+    """Время как целое число микросекунд (None - раньше любого значения, как "" у API)"""
+    if value is None:
+        return -1
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return (value - _EPOCH) // _MICROSECOND
+
+
+class SnapshotRow(NamedTuple):
+    id: str
+    title: str
+    description: Optional[str]
+    created_at: int
+
+
+def _sort_key(row: SnapshotRow, field: str) -> Tuple:
+    if field == "created_at":
+        return row.created_at, row.id
+    if field == "title":
+        return row.title, row.id
+    return (row.id,)
+
+
+def _field(item: Any, name: str) -> Any:
+    return item.get(name) if isinstance(item, dict) else getattr(item, name)
+
+
+def _loose_orderings(data: List[Any], field: str) -> List[List[Any]]:
+    """Допустимые последовательности значений поля сортировки (без tie-break по id)
+
+    Для title сопоставление БД неизвестно: подходит порядок и по кодовым точкам, и без учёта регистра.
+    """
+    if field == "created_at":
+        return [[timestamp_key(_field(item, field)) for item in data]]
+    values = [_field(item, field) or "" for item in data]
+    return [values, [value.casefold() for value in values]] if field == "title" else [values]
+
+
+class ItemsSnapshot(ClientHook):
+    """Локальный снимок коллекции элементов для проверки сортировки, поиска и пагинации
+
+    Коллекция загружается один раз (load), дальше снимок обновляется из записей,
+    сделанных через клиент, к которому он подключён хуком. Для каждого поля
+    сортировки хранится отсортированный список ключей (значение, id), поэтому
+    ожидаемая страница get_items(page, size, sort_by, order) - один срез списка,
+    а с search - фильтрация по тому же порядку без запросов к API.
+    Записи других клиентов (и xdist-воркеров) снимок не видит: для проверок
+    в общем окружении его стоит ограничивать своим префиксом (scope).
+    """
+
+    def __init__(self, scope: Optional[str] = None):
+        """scope - учитывать только элементы, подходящие под этот search (как у API)"""
+        self.scope = scope
+        self._lock = threading.Lock()
+        self._rows: Dict[str, SnapshotRow] = {}
+        self._indexes: Dict[str, List[Tuple]] = {field: [] for field in SORT_FIELDS}
+
+    @classmethod
+    def load(cls, client, scope: Optional[str] = None, page_size: int = 100) -> "ItemsSnapshot":
+        """Полная загрузка коллекции (сырые страницы, без моделей) и подписка на записи клиента"""
+        snapshot = cls(scope)
+        client.add_hook(snapshot)
+        rows = []
+        page = 1
+        while True:
+            response = client.get_items(page=page, size=page_size, search=scope, raw=True)
+            rows.extend(response["data"])
+            if len(response["data"]) < page_size or len(rows) >= response["count"]:
+                break
+            page += 1
+        snapshot.reset(rows)
+        print(f"📸 Snapshot loaded: {len(snapshot)} items" + (f" matching {scope!r}" if scope else ""))
+        return snapshot
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._rows
+
+    @staticmethod
+    def _row(item: Any) -> SnapshotRow:
+        return SnapshotRow(
+            id=_field(item, "id"),
+            title=_field(item, "title"),
+            description=_field(item, "description"),
+            created_at=timestamp_key(_field(item, "created_at"))
+        )
+
+    @staticmethod
+    def _matches(row: SnapshotRow, needle: str) -> bool:
+        return needle in row.title.lower() or needle in (row.description or "").lower()
+
+    def reset(self, items: List[Any]):
+        """Замена содержимого снимка (словари из JSON или ItemResponse)"""
+        rows = {row.id: row for row in map(self._row, items)}
+        with self._lock:
+            self._rows = rows
+            self._indexes = {
+                field: sorted(_sort_key(row, field) for row in rows.values())
+                for field in SORT_FIELDS
+            }
+
+    def _remove(self, row: SnapshotRow):
+        for field, index in self._indexes.items():
+            key = _sort_key(row, field)
+            position = bisect.bisect_left(index, key)
+            if position < len(index) and index[position] == key:
+                del index[position]
+
+    def on_item_written(self, item: Any):
+        row = self._row(item)
+        in_scope = self.scope is None or self._matches(row, self.scope.lower())
+        with self._lock:
+            previous = self._rows.pop(row.id, None)
+            if previous is not None:
+                self._remove(previous)
+            if in_scope:
+                self._rows[row.id] = row
+                for field, index in self._indexes.items():
+                    bisect.insort(index, _sort_key(row, field))
+
+    def on_item_deleted(self, item_id: str):
+        with self._lock:
+            previous = self._rows.pop(item_id, None)
+            if previous is not None:
+                self._remove(previous)
+
+    def _ordered_ids(self, sort_by: Optional[str], search: Optional[str]) -> List[str]:
+        index = self._indexes[sort_by or DEFAULT_SORT]
+        if not search:
+            return [key[-1] for key in index]
+        needle = search.lower()
+        rows = self._rows
+        return [key[-1] for key in index if self._matches(rows[key[-1]], needle)]
+
+    def expected(
+            self,
+            page: int = 1,
+            size: int = 10,
+            sort_by: Optional[str] = None,
+            order: str = "asc",
+            search: Optional[str] = None
+    ) -> Tuple[List[str], int]:
+        """(ID элементов ожидаемой страницы по порядку, ожидаемый count)"""
+        if sort_by is not None and sort_by not in SORT_FIELDS:
+            raise ValueError(f"sort_by must be one of {SORT_FIELDS}, got {sort_by!r}")
+        # Без sort_by клиент не передаёт order, и API сортирует по умолчанию (asc)
+        descending = sort_by is not None and order == "desc"
+        start = (page - 1) * size
+        with self._lock:
+            if not search:
+                index = self._indexes[sort_by or DEFAULT_SORT]
+                total = len(index)
+                if descending:
+                    keys = index[max(total - start - size, 0):max(total - start, 0)][::-1]
+                else:
+                    keys = index[start:start + size]
+                return [key[-1] for key in keys], total
+            ids = self._ordered_ids(sort_by, search)
+        if descending:
+            ids.reverse()
+        return ids[start:start + size], len(ids)
+
+    def verify(
+            self,
+            response: Union[Dict[str, Any], Any],
+            page: int = 1,
+            size: int = 10,
+            sort_by: Optional[str] = None,
+            order: str = "asc",
+            search: Optional[str] = None,
+            exact: bool = True
+    ) -> List[str]:
+        """Расхождения ответа get_items с ожидаемой страницей (пустой список - всё совпало)
+
+        Точный порядок (tie-break по id, порядок строк по кодовым точкам, сортировка
+        по умолчанию) гарантирует только fake_server; exact=False проверяет лишь
+        состав страницы и монотонность по полю сортировки.
+        """
+        data = _field(response, "data")
+        if not exact:
+            return self._verify_loose(data, page, size, sort_by, order, search)
+        expected_ids, expected_count = self.expected(page, size, sort_by, order, search)
+        actual_ids = [_field(item, "id") for item in data]
+        count = _field(response, "count")
+        problems = []
+        if count != expected_count:
+            problems.append(f"count: expected {expected_count}, got {count}")
+        if actual_ids != expected_ids:
+            missing = [item_id for item_id in expected_ids if item_id not in actual_ids]
+            unexpected = [item_id for item_id in actual_ids if item_id not in expected_ids]
+            problems.append(
+                f"page {page} (size={size}, sort_by={sort_by}, order={order}, search={search!r}): "
+                f"expected {expected_ids}, got {actual_ids}; missing {missing}, unexpected {unexpected}"
+            )
+        return problems
+
+    def _verify_loose(
+            self,
+            data: List[Any],
+            page: int,
+            size: int,
+            sort_by: Optional[str],
+            order: str,
+            search: Optional[str]
+    ) -> List[str]:
+        with self._lock:
+            matching = set(self._ordered_ids(sort_by, search))
+        actual_ids = [_field(item, "id") for item in data]
+        where = f"page {page} (size={size}, sort_by={sort_by}, order={order}, search={search!r})"
+        problems = []
+        unexpected = [item_id for item_id in actual_ids if item_id not in matching]
+        if unexpected:
+            problems.append(f"{where}: unexpected {unexpected}")
+        if len(set(actual_ids)) != len(actual_ids):
+            problems.append(f"{where}: duplicate IDs in {actual_ids}")
+        expected_len = min(size, max(len(matching) - (page - 1) * size, 0))
+        if len(actual_ids) != expected_len:
+            problems.append(f"{where}: expected {expected_len} items, got {len(actual_ids)}")
+        if sort_by is not None:
+            orderings = _loose_orderings(data, sort_by)
+            if all(keys != sorted(keys, reverse=order == "desc") for keys in orderings):
+                problems.append(f"{where}: not ordered by {sort_by}: {orderings[0]}")
+        return problems
@@ -0,0 +1,38 @@
+"""
+JSON-кодек клиента: самый быстрый из установленных (orjson -> ujson -> json)
+"""
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+def _stdlib_dumps(obj: Any) -> bytes:
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _stdlib_loads(data: Union[bytes, str]) -> Any:
+    return json.loads(data)
+
+
+CODECS = {"json": (_stdlib_dumps, _stdlib_loads)}
+
+if ujson is not None:
+    CODECS["ujson"] = (
+        lambda obj: ujson.dumps(obj, ensure_ascii=False).encode("utf-8"),
+        ujson.loads
+    )
+
+if orjson is not None:
+    CODECS["orjson"] = (orjson.dumps, orjson.loads)
+
+NAME = next(name for name in ("orjson", "ujson", "json") if name in CODECS)
+dumps, loads = CODECS[NAME]
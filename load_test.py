@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Нагрузочный прогон Items API со смешанным CRUD-профилем
+"""
+import json
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import defaultdict
+from contextlib import redirect_stdout
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+current_dir = Path(__file__).parent
+sys.path.insert(0, str(current_dir))
+
+from src.api.credential_pool import make_client
+from src.api.id_journal import IdJournal
+from src.api.items_client import ItemsAPIClient
+from src.api.metrics import LatencyHistogram, MetricsCollector
+from src.api.rate_limiter import TokenBucket
+from src.api.retry_policy import RetryPolicy
+
+OPERATIONS = ("create", "list", "get", "update", "delete")
+DEFAULT_MIX = "create=2,list=4,get=3,update=1,delete=1"
+SORT_FIELDS = ("created_at", "title")
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    """Разбор профиля вида "create=2,list=4,get=3" в веса операций"""
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise ValueError(f"Unknown operation {name!r}, expected one of {OPERATIONS}")
+        weights[name] = float(weight or 1)
+    if not any(weights.values()):
+        raise ValueError("Workload mix must have at least one positive weight")
+    return weights
+
+
+class LoadRunner:
+    """Генератор нагрузки: потоки выполняют случайные операции по весам профиля"""
+
+    def __init__(
+            self,
+            client: ItemsAPIClient,
+            mix: Dict[str, float],
+            concurrency: int,
+            rps: Optional[float],
+            page_size: int,
+            seed: Optional[int] = None
+    ):
+        self.client = client
+        self.operations = list(mix)
+        self.weights = [mix[name] for name in self.operations]
+        self.concurrency = concurrency
+        self.bucket = TokenBucket(rps, burst=concurrency) if rps else None
+        self.page_size = page_size
+        self.random = random.Random(seed)
+        self.prefix = f"Load Item {uuid.uuid4().hex[:8]}"
+        self._lock = threading.Lock()
+        self._live_ids: List[str] = []
+        self.latency: Dict[str, LatencyHistogram] = defaultdict(LatencyHistogram)
+        self.counts: Dict[str, int] = defaultdict(int)
+        self.errors: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+    def _take_id(self, remove: bool = False) -> Optional[str]:
+        with self._lock:
+            if not self._live_ids:
+                return None
+            index = self.random.randrange(len(self._live_ids))
+            if remove:
+                self._live_ids[index], self._live_ids[-1] = self._live_ids[-1], self._live_ids[index]
+                return self._live_ids.pop()
+            return self._live_ids[index]
+
+    def _run_operation(self, operation: str) -> str:
+        """Выполнить операцию; возвращает фактически выполненную (без ID - create)"""
+        if operation == "list":
+            self.client.get_items(
+                page=self.random.randint(1, 5),
+                size=self.page_size,
+                sort_by=self.random.choice(SORT_FIELDS + (None,)),
+                order=self.random.choice(("asc", "desc")),
+                search=self.prefix if self.random.random() < 0.3 else None
+            )
+            return operation
+
+        if operation in ("get", "update", "delete"):
+            item_id = self._take_id(remove=(operation == "delete"))
+            if item_id is not None:
+                if operation == "get":
+                    self.client.get_item_by_id(item_id)
+                elif operation == "update":
+                    self.client.update_item(item_id, {"title": f"{self.prefix} updated"})
+                else:
+                    self.client.delete_item(item_id)
+                return operation
+
+        item = self.client.create_item({
+            "title": f"{self.prefix} #{self.random.randrange(10 ** 6)}",
+            "description": "load test"
+        })
+        with self._lock:
+            self._live_ids.append(item.id)
+        return "create"
+
+    def _worker(self, deadline: float):
+        while time.monotonic() < deadline:
+            if self.bucket is not None:
+                self.bucket.acquire()
+            operation = self.random.choices(self.operations, self.weights)[0]
+            started = time.perf_counter()
+            try:
+                operation = self._run_operation(operation)
+                error = None
+            except Exception as e:
+                response = getattr(e, "response", None)
+                error = str(response.status_code) if response is not None else type(e).__name__
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.counts[operation] += 1
+                self.latency[operation].record(elapsed)
+                if error is not None:
+                    self.errors[operation][error] += 1
+
+    def run(self, duration: float) -> float:
+        started = time.monotonic()
+        deadline = started + duration
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            for _ in range(self.concurrency):
+                executor.submit(self._worker, deadline)
+        return time.monotonic() - started
+
+    def cleanup(self):
+        """Удаление элементов, оставшихся после прогона"""
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            for item_id in self._live_ids:
+                executor.submit(self.client.delete_item, item_id)
+        self._live_ids.clear()
+
+    def report(self, elapsed: float) -> Dict:
+        operations = {}
+        for name in sorted(self.counts):
+            count = self.counts[name]
+            error_count = sum(self.errors[name].values())
+            operations[name] = {
+                "count": count,
+                "throughput": count / elapsed,
+                "errors": error_count,
+                "error_rate": error_count / count if count else 0.0,
+                "errors_by_status": dict(self.errors[name]),
+                "latency": self.latency[name].summary()
+            }
+        total = sum(self.counts.values())
+        errors = sum(op["errors"] for op in operations.values())
+        return {
+            "summary": {
+                "duration_s": elapsed,
+                "operations": total,
+                "throughput": total / elapsed if elapsed else 0.0,
+                "error_rate": errors / total if total else 0.0
+            },
+            "operations": operations
+        }
+
+
+def print_report(report: Dict):
+    summary = report["summary"]
+    print("=" * 78)
+    print(f"📊 {summary['operations']} операций за {summary['duration_s']:.1f} c: "
+          f"{summary['throughput']:.1f} оп/с, ошибок {summary['error_rate'] * 100:.2f}%")
+    print(f"{'операция':<8} | {'кол-во':>7} | {'оп/с':>7} | {'ошибки':>7} | "
+          f"{'p50, мс':>8} | {'p95, мс':>8} | {'p99, мс':>8}")
+    print("-" * 78)
+    for name, op in report["operations"].items():
+        latency = op["latency"]
+        print(f"{name:<8} | {op['count']:>7} | {op['throughput']:>7.1f} | {op['error_rate'] * 100:>6.2f}% | "
+              f"{latency.get('p50_ms', 0):>8.1f} | {latency.get('p95_ms', 0):>8.1f} | {latency.get('p99_ms', 0):>8.1f}")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Нагрузочный прогон Items API со смешанным профилем операций",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Примеры использования:
+  python load_test.py --duration 60 --concurrency 16
+  python load_test.py --rps 200 --mix "create=1,list=5,get=4" -o results.json
+  python load_test.py --retries 3 --hedge
+        """
+    )
+    parser.add_argument("--mix", default=DEFAULT_MIX,
+                        help=f"Веса операций (по умолчанию: {DEFAULT_MIX})")
+    parser.add_argument("-d", "--duration", type=float, default=30,
+                        help="Длительность прогона в секундах (по умолчанию: 30)")
+    parser.add_argument("-c", "--concurrency", type=int, default=8,
+                        help="Количество параллельных потоков (по умолчанию: 8)")
+    parser.add_argument("--rps", type=float, default=None,
+                        help="Целевая частота операций в секунду (по умолчанию: без ограничения)")
+    parser.add_argument("--page-size", type=int, default=20,
+                        help="Размер страницы для list (по умолчанию: 20)")
+    parser.add_argument("--seed", type=int, default=None, help="Seed для воспроизводимого профиля")
+    parser.add_argument("-o", "--output", default="load_results.json",
+                        help="Файл с результатами (по умолчанию: load_results.json)")
+    parser.add_argument("--keep", action="store_true", help="Не удалять созданные элементы после прогона")
+    parser.add_argument("--retries", type=int, default=1,
+                        help="Попыток на запрос с backoff и бюджетом повторов (по умолчанию: 1 - без повторов)")
+    parser.add_argument("--hedge", action="store_true",
+                        help="Хеджировать GET: дублировать запрос, не ответивший за p95 эндпоинта")
+    args = parser.parse_args()
+
+    metrics = MetricsCollector()
+    policy = None
+    if args.retries > 1 or args.hedge:
+        policy = RetryPolicy(max_attempts=args.retries, hedge=args.hedge, hedge_workers=args.concurrency * 2)
+    # Несколько учётных записей (USER_CREDENTIALS) - пул клиентов, нагрузка распределяется между ними
+    client = make_client(
+        pool_maxsize=args.concurrency,
+        validation="none",
+        hooks=[metrics],
+        retry_policy=policy
+    )
+    runner = LoadRunner(client, parse_mix(args.mix), args.concurrency, args.rps, args.page_size, args.seed)
+
+    print(f"🚀 Нагрузка на {client.base_url}: {args.duration:.0f} c, {args.concurrency} потоков, "
+          f"лимит {args.rps if args.rps else '∞'} оп/с, профиль {args.mix}")
+
+    started_at = time.strftime("%Y-%m-%dT%H:%M:%S%z")
+    # Построчный вывод клиента на каждый запрос искажает замеры
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        elapsed = runner.run(args.duration)
+        if not args.keep:
+            runner.cleanup()
+        else:
+            # Элементы оставлены намеренно - не считать их утечкой
+            IdJournal.forget_all()
+
+    report = runner.report(elapsed)
+    report["config"] = {
+        "base_url": client.base_url,
+        "mix": parse_mix(args.mix),
+        "duration_s": args.duration,
+        "concurrency": args.concurrency,
+        "rps": args.rps,
+        "page_size": args.page_size,
+        "seed": args.seed,
+        "retries": args.retries,
+        "hedge": args.hedge,
+        "started_at": started_at
+    }
+    report["endpoints"] = metrics.snapshot()
+    if policy is not None:
+        report["retry_policy"] = policy.stats()
+    if hasattr(client, "stats"):
+        report["accounts"] = client.stats()
+    client.close()
+
+    print_report(report)
+    if policy is not None:
+        print(f"🔁 Повторы: {report['retry_policy']}")
+    if hasattr(client, "print_stats"):
+        print()
+        client.print_stats()
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"💾 Результаты: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
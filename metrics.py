@@ -0,0 +1,184 @@
+import bisect
+import json
+import math
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, Iterator, List, NamedTuple
+
+
+class RequestEvent(NamedTuple):
+    """Один HTTP-вызов клиента
+
+    server - от отправки запроса до получения заголовков ответа
+             (для нового соединения сюда входит TCP/TLS-рукопожатие)
+    transfer - чтение тела ответа и его обработка в requests
+    """
+    endpoint: str
+    method: str
+    status: Optional[int]
+    bytes_out: int
+    bytes_in: int
+    new_connection: bool
+    server: float
+    transfer: float
+    total: float
+    error: Optional[str] = None
+
+
+class ClientHook:
+    """Базовый класс хуков инструментирования ItemsAPIClient (все методы необязательны)"""
+
+    def on_request(self, event: RequestEvent):
+        pass
+
+    def on_decode(self, endpoint: str, seconds: float):
+        pass
+
+    def on_item_written(self, item):
+        """Элемент создан или обновлён через клиент (ItemResponse из ответа API)"""
+        pass
+
+    def on_item_deleted(self, item_id: str):
+        pass
+
+
+class LatencyHistogram:
+    """Гистограмма латентности с логарифмическими бакетами (~5% точность)
+
+    Память фиксирована и не зависит от количества наблюдений.
+    """
+
+    GROWTH = 1.05
+    MIN_VALUE = 1e-5  # 10 мкс
+    MAX_VALUE = 120.0
+
+    _bounds: List[float] = []
+
+    def __init__(self):
+        if not LatencyHistogram._bounds:
+            buckets = int(math.log(self.MAX_VALUE / self.MIN_VALUE, self.GROWTH)) + 1
+            LatencyHistogram._bounds = [self.MIN_VALUE * self.GROWTH ** i for i in range(buckets + 1)]
+        self.counts = [0] * (len(self._bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        self.counts[bisect.bisect_left(self._bounds, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+    def percentile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(q / 100 * self.count))
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                upper = self._bounds[index] if index < len(self._bounds) else self.max
+                return min(upper, self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        """Сводка в миллисекундах"""
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "mean_ms": self.total / self.count * 1000,
+            "min_ms": self.min * 1000,
+            "p50_ms": self.percentile(50) * 1000,
+            "p95_ms": self.percentile(95) * 1000,
+            "p99_ms": self.percentile(99) * 1000,
+            "max_ms": self.max * 1000
+        }
+
+
+class EndpointStats:
+    """Накопленные метрики одного эндпоинта"""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors_by_status: Dict[str, int] = defaultdict(int)
+        self.bytes_out = 0
+        self.bytes_in = 0
+        self.new_connections = 0
+        self.total = LatencyHistogram()
+        self.server = LatencyHistogram()
+        self.transfer = LatencyHistogram()
+        self.decode = LatencyHistogram()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "errors_by_status": dict(self.errors_by_status),
+            "bytes_out": self.bytes_out,
+            "bytes_in": self.bytes_in,
+            "new_connections": self.new_connections,
+            "latency": {
+                "total": self.total.summary(),
+                "server": self.server.summary(),
+                "transfer": self.transfer.summary(),
+                "decode": self.decode.summary()
+            }
+        }
+
+
+class MetricsCollector(ClientHook):
+    """Хук, собирающий счётчики и гистограммы по эндпоинтам (login, list, get, create, update, delete)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.endpoints: Dict[str, EndpointStats] = defaultdict(EndpointStats)
+        self._scopes: List["MetricsCollector"] = []
+
+    @contextmanager
+    def scope(self) -> Iterator["MetricsCollector"]:
+        """Отдельный сборщик для части прогона (например, одного теста); общий продолжает копить всё"""
+        scoped = MetricsCollector()
+        with self._lock:
+            self._scopes.append(scoped)
+        try:
+            yield scoped
+        finally:
+            with self._lock:
+                self._scopes.remove(scoped)
+
+    def on_request(self, event: RequestEvent):
+        with self._lock:
+            scopes = list(self._scopes)
+            stats = self.endpoints[event.endpoint]
+            stats.requests += 1
+            if event.status is None or event.status >= 400:
+                stats.errors_by_status[str(event.status or event.error)] += 1
+            stats.bytes_out += event.bytes_out
+            stats.bytes_in += event.bytes_in
+            stats.new_connections += int(event.new_connection)
+            stats.total.record(event.total)
+            stats.server.record(event.server)
+            stats.transfer.record(event.transfer)
+        for scoped in scopes:
+            scoped.on_request(event)
+
+    def on_decode(self, endpoint: str, seconds: float):
+        with self._lock:
+            scopes = list(self._scopes)
+            self.endpoints[endpoint].decode.record(seconds)
+        for scoped in scopes:
+            scoped.on_decode(endpoint, seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {name: stats.to_dict() for name, stats in sorted(self.endpoints.items())}
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        return json.dumps(self.snapshot(), indent=indent, ensure_ascii=False)
+
+    def reset(self):
+        with self._lock:
+            self.endpoints.clear()
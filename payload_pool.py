@@ -0,0 +1,119 @@
+import hashlib
+import itertools
+import json
+import os
+import threading
+import zlib
+from pathlib import Path
+from typing import Optional, Dict, Any, List
+
+from src.models.schemas import ItemCreate
+
+DEFAULT_CACHE_DIR = Path(".payload_cache")
+CACHE_FORMAT_VERSION = 1
+BOUNDARY_BASE = {"title": "Boundary item", "description": "Boundary description"}
+
+
+def field_limits(model=ItemCreate) -> Dict[str, Dict[str, Optional[int]]]:
+    """Ограничения длины строковых полей модели из Field(min_length=..., max_length=...)"""
+    limits = {}
+    for name, field in model.__fields__.items():
+        limits[name] = {
+            "min_length": getattr(field.field_info, "min_length", None),
+            "max_length": getattr(field.field_info, "max_length", None),
+            "required": field.required
+        }
+    return limits
+
+
+def boundary_payloads(model=ItemCreate) -> List[Dict[str, Any]]:
+    """Валидные граничные варианты: минимальная/максимальная длина и None для необязательных полей"""
+    limits = field_limits(model)
+    base = BOUNDARY_BASE
+    payloads = []
+    for name, limit in limits.items():
+        if limit["min_length"]:
+            payloads.append(dict(base, **{name: "m" * limit["min_length"]}))
+        if limit["max_length"]:
+            payloads.append(dict(base, **{name: "M" * limit["max_length"]}))
+        if not limit["required"]:
+            payloads.append(dict(base, **{name: None}))
+    return payloads
+
+
+def generate_payloads(count: int, seed: int) -> List[Dict[str, Any]]:
+    """count валидных payload'ов ItemCreate одним пакетом из фиксированного seed"""
+    from faker import Faker
+
+    fake = Faker()
+    fake.seed_instance(seed)
+    max_title = field_limits()["title"]["max_length"] or 100
+    max_description = field_limits()["description"]["max_length"] or 500
+    return [
+        {
+            "title": fake.sentence(nb_words=3)[:min(50, max_title)],
+            "description": fake.text(max_nb_chars=min(200, max_description))
+        }
+        for _ in range(count)
+    ]
+
+
+class PayloadPool:
+    """Пул заранее сгенерированных payload'ов для фикстур и заполнения данных
+
+    Payload'ы генерируются один раз из seed и кэшируются на диск (ключ - seed,
+    размер пула и ограничения полей в schemas.py), повторные запуски Faker не
+    используют вовсе. take() раздаёт payload'ы по кругу, pick(key) - всегда один
+    и тот же payload для одного ключа (например, nodeid теста), take_boundary() -
+    граничные варианты по ограничениям schemas.py.
+    """
+
+    def __init__(self, count: int = 1000, seed: int = 4203, cache_dir: Optional[str] = None):
+        self.count = count
+        self.seed = seed
+        self.cache_dir = Path(cache_dir or os.getenv("PAYLOAD_CACHE_DIR") or DEFAULT_CACHE_DIR)
+        self.payloads = self._load_or_generate()
+        self.boundary = boundary_payloads()
+        self._cycle = itertools.cycle(range(len(self.payloads)))
+        self._lock = threading.Lock()
+
+    @property
+    def cache_path(self) -> Path:
+        schema_hash = hashlib.sha1(
+            json.dumps([CACHE_FORMAT_VERSION, field_limits()], sort_keys=True).encode()
+        ).hexdigest()[:10]
+        return self.cache_dir / f"payloads-{self.seed}-{self.count}-{schema_hash}.json"
+
+    def _load_or_generate(self) -> List[Dict[str, Any]]:
+        path = self.cache_path
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            pass
+
+        payloads = generate_payloads(self.count, self.seed)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(payloads, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        return payloads
+
+    def take(self) -> Dict[str, Any]:
+        """Следующий payload (копия, её можно изменять)"""
+        with self._lock:
+            index = next(self._cycle)
+        return dict(self.payloads[index])
+
+    def pick(self, key: str) -> Dict[str, Any]:
+        """Детерминированный payload для ключа - не зависит от порядка вызовов"""
+        return dict(self.payloads[zlib.crc32(key.encode()) % len(self.payloads)])
+
+    def take_boundary(self, title_prefix: str = "") -> List[Dict[str, Any]]:
+        """Граничные payload'ы (копии); префикс добавляется только к заголовкам не на границе длины"""
+        return [
+            dict(payload, title=title_prefix + payload["title"])
+            if payload["title"] == BOUNDARY_BASE["title"] else dict(payload)
+            for payload in self.boundary
+        ]
@@ -0,0 +1,314 @@
+"""
+Плагин pytest: контроль регрессий производительности по сохранённому baseline
+
+Записывает длительность каждого теста (фаза call) и латентность каждого
+эндпоинта клиента (через ClientHook, фикстура perf_gate) в JSON-baseline
+и сравнивает с ним следующие прогоны:
+  тест     - длительность больше p95 baseline * (1 + tolerance) + floor
+  эндпоинт - медиана или p95 прогона больше соответствующих значений
+             baseline * (1 + tolerance) + floor
+Сравнение выполняется только при min_samples замеров в baseline (и в
+прогоне - для эндпоинтов): у теста один замер на прогон, поэтому его
+baseline копится за несколько прогонов с --perf-mode=record.
+
+    pytest --perf-baseline=perf_baseline.json --perf-mode=record   # пополнить baseline
+    pytest --perf-baseline=perf_baseline.json                      # сравнить (предупреждение)
+    pytest --perf-baseline=perf_baseline.json --perf-fail          # регрессия - падение прогона
+"""
+import json
+import math
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Optional, Dict, Any, List
+
+import pytest
+
+from src.api.metrics import ClientHook, RequestEvent
+
+# Сколько последних замеров хранить в baseline
+MAX_TEST_SAMPLES = 20
+MAX_ENDPOINT_SAMPLES = 2000
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Перцентиль по ближайшему рангу"""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 3)
+
+
+class PerfGate(ClientHook):
+    """Замеры прогона и их сравнение с baseline (регистрируется как плагин на время сессии)"""
+
+    def __init__(
+            self,
+            path: str,
+            mode: str = "compare",
+            tolerance: float = 0.2,
+            floor_ms: float = 5.0,
+            min_samples: int = 5,
+            fail: bool = False,
+            is_worker: bool = False
+    ):
+        self.path = path
+        self.mode = mode
+        self.tolerance = tolerance
+        self.floor = floor_ms / 1000
+        self.min_samples = min_samples
+        self.fail = fail
+        self.is_worker = is_worker
+        self.baseline = self._load()
+        self._lock = threading.Lock()
+        self.tests: Dict[str, float] = {}
+        self.endpoints: Dict[str, List[float]] = defaultdict(list)
+        self._test_endpoints: Dict[str, List[float]] = defaultdict(list)
+        self.results: List[Dict[str, Any]] = []
+
+    def _load(self) -> Dict[str, Any]:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                baseline = json.load(f)
+        except FileNotFoundError:
+            baseline = {}
+        baseline.setdefault("tests", {})
+        baseline.setdefault("endpoints", {})
+        return baseline
+
+    def on_request(self, event: RequestEvent):
+        if event.status is None:
+            return
+        with self._lock:
+            self.endpoints[event.endpoint].append(event.total)
+            self._test_endpoints[event.endpoint].append(event.total)
+
+    def start_test(self):
+        with self._lock:
+            self._test_endpoints.clear()
+
+    def _limit(self, baseline_value: float) -> float:
+        return baseline_value * (1 + self.tolerance) + self.floor
+
+    def compare_test(self, nodeid: str, duration: float) -> Dict[str, Any]:
+        """Длительность теста против p95 его прошлых прогонов"""
+        history = self.baseline["tests"].get(nodeid, [])
+        result = {"kind": "test", "name": nodeid, "current_ms": _ms(duration), "baseline_samples": len(history)}
+        if len(history) < self.min_samples:
+            result["status"] = "new" if not history else "insufficient"
+            return result
+        baseline_p95 = percentile(history, 95)
+        result.update(
+            baseline_p50_ms=_ms(percentile(history, 50)),
+            baseline_p95_ms=_ms(baseline_p95),
+            limit_ms=_ms(self._limit(baseline_p95)),
+            status="regressed" if duration > self._limit(baseline_p95) else "ok"
+        )
+        return result
+
+    def compare_endpoint(self, name: str, samples: List[float]) -> Dict[str, Any]:
+        """Медиана и p95 эндпоинта против baseline"""
+        history = self.baseline["endpoints"].get(name, [])
+        result = {"kind": "endpoint", "name": name, "samples": len(samples), "baseline_samples": len(history)}
+        if not samples:
+            result["status"] = "insufficient"
+            return result
+        current_p50, current_p95 = percentile(samples, 50), percentile(samples, 95)
+        result.update(current_p50_ms=_ms(current_p50), current_p95_ms=_ms(current_p95))
+        if len(history) < self.min_samples or len(samples) < self.min_samples:
+            result["status"] = "new" if not history else "insufficient"
+            return result
+        baseline_p50, baseline_p95 = percentile(history, 50), percentile(history, 95)
+        regressed = current_p50 > self._limit(baseline_p50) or current_p95 > self._limit(baseline_p95)
+        result.update(
+            baseline_p50_ms=_ms(baseline_p50),
+            baseline_p95_ms=_ms(baseline_p95),
+            status="regressed" if regressed else "ok"
+        )
+        return result
+
+    def test_report(self, nodeid: str, duration: float) -> Dict[str, Any]:
+        """Сравнение для одного теста: сам тест и эндпоинты, вызванные в нём (для Allure)"""
+        with self._lock:
+            called = {name: list(samples) for name, samples in self._test_endpoints.items()}
+        return {
+            "test": self.compare_test(nodeid, duration),
+            "endpoints": [self.compare_endpoint(name, samples) for name, samples in sorted(called.items())]
+        }
+
+    def record_test(self, nodeid: str, duration: float):
+        with self._lock:
+            self.tests[nodeid] = duration
+
+    def merge_endpoints(self, endpoints: Dict[str, List[float]]):
+        """Замеры эндпоинтов xdist-воркера"""
+        with self._lock:
+            for name, samples in endpoints.items():
+                self.endpoints[name].extend(samples)
+
+    def evaluate(self) -> List[Dict[str, Any]]:
+        """Итоговое сравнение прогона: все тесты и все эндпоинты"""
+        with self._lock:
+            tests = dict(self.tests)
+            endpoints = {name: list(samples) for name, samples in self.endpoints.items()}
+        self.results = (
+            [self.compare_test(nodeid, duration) for nodeid, duration in sorted(tests.items())]
+            + [self.compare_endpoint(name, samples) for name, samples in sorted(endpoints.items())]
+        )
+        return self.results
+
+    def regressions(self) -> List[Dict[str, Any]]:
+        return [result for result in self.results if result["status"] == "regressed"]
+
+    def save(self):
+        """Добавить замеры прогона в baseline (храним последние MAX_*_SAMPLES)"""
+        with self._lock:
+            for nodeid, duration in self.tests.items():
+                history = self.baseline["tests"].setdefault(nodeid, [])
+                history.append(round(duration, 6))
+                del history[:-MAX_TEST_SAMPLES]
+            for name, samples in self.endpoints.items():
+                history = self.baseline["endpoints"].setdefault(name, [])
+                history.extend(round(sample, 6) for sample in samples)
+                del history[:-MAX_ENDPOINT_SAMPLES]
+        self.baseline["updated_at"] = time.strftime("%Y-%m-%dT%H:%M:%S%z")
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.baseline, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    # Хуки pytest
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_call(self, item):
+        self.start_test()
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_makereport(self, item, call):
+        """Сравнение теста для Allure (прикрепляет pytest_runtest_makereport в conftest.py)"""
+        if call.when == "call":
+            item._perf_report = self.test_report(item.nodeid, call.duration)
+
+    def pytest_runtest_logreport(self, report):
+        """Длительность прошедших тестов (в главный процесс приходят и отчёты xdist-воркеров)"""
+        if report.when == "call" and report.passed and not self.is_worker:
+            self.record_test(report.nodeid, report.duration)
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node, error):
+        """Замеры эндпоинтов xdist-воркера переносятся в главный процесс"""
+        endpoints = getattr(node, "workeroutput", {}).get("perf_endpoints")
+        if endpoints:
+            self.merge_endpoints(endpoints)
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_sessionfinish(self, session, exitstatus):
+        if self.is_worker:
+            session.config.workeroutput["perf_endpoints"] = dict(self.endpoints)
+            return
+        if self.mode == "record":
+            self.save()
+            return
+        self.evaluate()
+        if self.fail and self.regressions() and session.exitstatus == pytest.ExitCode.OK:
+            session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.is_worker:
+            return
+        if self.mode == "record":
+            terminalreporter.write_line(
+                f"⏱️ Perf baseline updated: {self.path} ({len(self.tests)} tests, {len(self.endpoints)} endpoints)"
+            )
+            return
+
+        compared = [result for result in self.results if result["status"] in ("ok", "regressed")]
+        regressions = self.regressions()
+        terminalreporter.write_sep("=", "perf gate", red=bool(regressions and self.fail), yellow=bool(regressions))
+        terminalreporter.write_line(
+            f"⏱️ Compared {len(compared)} of {len(self.results)} tests and endpoints with {self.path} "
+            f"(tolerance {self.tolerance:.0%} + {self.floor * 1000:.0f} ms, min samples {self.min_samples})"
+        )
+        for result in regressions:
+            if result["kind"] == "test":
+                terminalreporter.write_line(
+                    f"🐢 test {result['name']}: {result['current_ms']:.1f} ms > limit {result['limit_ms']:.1f} ms "
+                    f"(baseline p95 {result['baseline_p95_ms']:.1f} ms)"
+                )
+            else:
+                terminalreporter.write_line(
+                    f"🐢 endpoint {result['name']}: p50 {result['current_p50_ms']:.1f} ms "
+                    f"(baseline {result['baseline_p50_ms']:.1f}), p95 {result['current_p95_ms']:.1f} ms "
+                    f"(baseline {result['baseline_p95_ms']:.1f})"
+                )
+        if not regressions:
+            terminalreporter.write_line("✅ No performance regressions")
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("perf-gate", "Контроль регрессий производительности")
+    group.addoption(
+        "--perf-baseline",
+        default=os.getenv("PERF_BASELINE"),
+        help="JSON-baseline латентности тестов и эндпоинтов (или PERF_BASELINE); без него плагин выключен"
+    )
+    group.addoption(
+        "--perf-mode",
+        choices=("compare", "record"),
+        default=os.getenv("PERF_MODE", "compare"),
+        help="compare - сравнить с baseline, record - добавить замеры прогона в baseline (по умолчанию: compare)"
+    )
+    group.addoption(
+        "--perf-fail",
+        action="store_true",
+        default=os.getenv("PERF_FAIL", "").lower() in ("1", "true", "yes"),
+        help="Регрессия роняет прогон (по умолчанию - только предупреждение)"
+    )
+    group.addoption(
+        "--perf-tolerance",
+        type=float,
+        default=float(os.getenv("PERF_TOLERANCE", "0.2")),
+        help="Допустимый рост относительно baseline (по умолчанию: 0.2 - 20%%)"
+    )
+    group.addoption(
+        "--perf-floor-ms",
+        type=float,
+        default=float(os.getenv("PERF_FLOOR_MS", "5")),
+        help="Абсолютный допуск в мс, ниже которого разница считается шумом (по умолчанию: 5)"
+    )
+    group.addoption(
+        "--perf-min-samples",
+        type=int,
+        default=int(os.getenv("PERF_MIN_SAMPLES", "5")),
+        help="Минимум замеров для сравнения (по умолчанию: 5)"
+    )
+
+
+def pytest_configure(config):
+    path = config.getoption("--perf-baseline")
+    if not path:
+        return
+    gate = PerfGate(
+        path,
+        mode=config.getoption("--perf-mode"),
+        tolerance=config.getoption("--perf-tolerance"),
+        floor_ms=config.getoption("--perf-floor-ms"),
+        min_samples=config.getoption("--perf-min-samples"),
+        fail=config.getoption("--perf-fail"),
+        is_worker=hasattr(config, "workerinput")
+    )
+    config.pluginmanager.register(gate, "perf_gate_session")
+
+
+def get_gate(config) -> Optional[PerfGate]:
+    """PerfGate прогона или None, если плагин выключен (нет --perf-baseline)"""
+    return config.pluginmanager.get_plugin("perf_gate_session")
+
+
+@pytest.fixture(scope="session")
+def perf_gate(pytestconfig) -> Optional[PerfGate]:
+    """Хук клиента для замеров эндпоинтов (None без --perf-baseline)"""
+    return get_gate(pytestconfig)
@@ -0,0 +1,112 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Hashable, NamedTuple, Tuple
+
+
+class CacheEntry(NamedTuple):
+    value: Any
+    etag: Optional[str]
+    stored_at: float
+
+
+class _LRU:
+    """Ограниченный по размеру LRU-словарь (без собственной блокировки)"""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.entries: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[CacheEntry]:
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+        return entry
+
+    def put(self, key: Hashable, entry: CacheEntry):
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def pop(self, key: Hashable):
+        self.entries.pop(key, None)
+
+
+class ReadCache:
+    """Клиентский кэш чтения для ItemsAPIClient (включается явно)
+
+    Отдельные LRU для элементов (по ID) и страниц списка (по параметрам запроса).
+    Запись свежее ttl секунд отдаётся без запроса к API; устаревшая запись с ETag
+    перепроверяется условным GET (If-None-Match -> 304). Любая запись через клиент
+    обновляет кэш элемента и сбрасывает все страницы списка.
+    Возвращаемые модели общие для всех читателей - их не следует изменять.
+    """
+
+    def __init__(self, max_items: int = 1024, max_pages: int = 128, ttl: float = 30.0):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._items = _LRU(max_items)
+        self._pages = _LRU(max_pages)
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+
+    def _lookup(self, lru: _LRU, key: Hashable) -> Tuple[Optional[CacheEntry], bool]:
+        """(запись, свежая ли она); устаревшая запись с ETag возвращается для перепроверки"""
+        with self._lock:
+            entry = lru.get(key)
+            if entry is not None and time.monotonic() - entry.stored_at < self.ttl:
+                self.hits += 1
+                return entry, True
+            self.misses += 1
+            if entry is not None and entry.etag is None:
+                lru.pop(key)
+                return None, False
+            return entry, False
+
+    def lookup_item(self, item_id: str) -> Tuple[Optional[CacheEntry], bool]:
+        return self._lookup(self._items, item_id)
+
+    def lookup_page(self, key: Hashable) -> Tuple[Optional[CacheEntry], bool]:
+        return self._lookup(self._pages, key)
+
+    def put_item(self, item_id: str, value: Any, etag: Optional[str] = None):
+        with self._lock:
+            self._items.put(item_id, CacheEntry(value, etag, time.monotonic()))
+
+    def put_page(self, key: Hashable, value: Any, etag: Optional[str] = None):
+        with self._lock:
+            self._pages.put(key, CacheEntry(value, etag, time.monotonic()))
+
+    def mark_revalidated(self, key: Hashable, entry: CacheEntry, page: bool = False):
+        """Сервер ответил 304: запись снова свежая"""
+        with self._lock:
+            self.revalidated += 1
+            (self._pages if page else self._items).put(key, entry._replace(stored_at=time.monotonic()))
+
+    def invalidate_item(self, item_id: str):
+        with self._lock:
+            self._items.pop(item_id)
+
+    def invalidate_pages(self):
+        with self._lock:
+            self._pages.entries.clear()
+
+    def clear(self):
+        with self._lock:
+            self._items.entries.clear()
+            self._pages.entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "revalidated": self.revalidated,
+                "evictions": self._items.evictions + self._pages.evictions,
+                "items": len(self._items.entries),
+                "pages": len(self._pages.entries)
+            }
@@ -0,0 +1,227 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from typing import Optional, Dict, Callable
+
+import requests
+
+from src.api.metrics import LatencyHistogram
+from src.api.rate_limiter import parse_retry_after
+
+IDEMPOTENT_METHODS = frozenset(["GET", "PUT", "DELETE", "HEAD", "OPTIONS"])
+# Ошибки, при которых запрос гарантированно не ушёл на сервер (его можно повторить даже для POST)
+NOT_SENT_ERRORS = (requests.exceptions.ConnectTimeout,)
+
+
+class RetryBudget:
+    """Бюджет повторов: каждый запрос добавляет ratio токена, каждый повтор или хедж тратит один
+
+    В установившемся режиме дополнительных запросов не больше ratio от основных,
+    поэтому при деградации API повторы не умножают нагрузку. max_tokens - запас
+    на старте и максимальная «пачка» повторов.
+    """
+
+    def __init__(self, ratio: float = 0.1, max_tokens: float = 10.0):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self._tokens = max_tokens
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        with self._lock:
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return True
+            return False
+
+    @property
+    def tokens(self) -> float:
+        return self._tokens
+
+
+class _EndpointLatency:
+    """Латентность эндпоинта в скользящем окне из двух гистограмм (текущая и предыдущая)"""
+
+    def __init__(self, window: int):
+        self.window = window
+        self.current = LatencyHistogram()
+        self.previous: Optional[LatencyHistogram] = None
+        self._cached: Dict[float, float] = {}
+
+    def record(self, seconds: float):
+        self.current.record(seconds)
+        if self.current.count >= self.window:
+            self.previous, self.current = self.current, LatencyHistogram()
+        if self.current.count % 50 == 0:
+            self._cached.clear()
+
+    def percentile(self, q: float, min_samples: int) -> Optional[float]:
+        value = self._cached.get(q)
+        if value is None:
+            source = self.previous if self.previous is not None else self.current
+            if source.count < min_samples:
+                return None
+            value = self._cached[q] = source.percentile(q)
+        return value
+
+
+class RetryPolicy:
+    """Повторы с экспоненциальной задержкой и хеджирование GET для ItemsAPIClient
+
+    Повторяются только идемпотентные методы (GET/PUT/DELETE) - при ошибке
+    соединения или статусе из retry_statuses, с задержкой «full jitter»
+    (Retry-After, если сервер его прислал, имеет приоритет). POST повторяется
+    только если запрос точно не был отправлен (таймаут подключения).
+    Хедж: если GET не ответил за наблюдаемый hedge_quantile (p95) эндпоинта,
+    отправляется копия, возвращается первый ответ. Начатый HTTP-запрос requests
+    прервать не умеет, поэтому проигравший дочитывается в фоне и закрывается,
+    а ещё не отправленный хедж отменяется. Повторы и хеджи тратят общий бюджет.
+    """
+
+    def __init__(
+            self,
+            max_attempts: int = 3,
+            base_delay: float = 0.1,
+            max_delay: float = 2.0,
+            retry_statuses=(429, 502, 503, 504),
+            budget: Optional[RetryBudget] = None,
+            hedge: bool = False,
+            hedge_quantile: float = 95,
+            hedge_min_samples: int = 20,
+            hedge_workers: int = 32,
+            latency_window: int = 1000
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_statuses = frozenset(retry_statuses)
+        self.budget = budget or RetryBudget()
+        self.hedge = hedge
+        self.hedge_quantile = hedge_quantile
+        self.hedge_min_samples = hedge_min_samples
+        self.latency_window = latency_window
+        self._executor = ThreadPoolExecutor(max_workers=hedge_workers, thread_name_prefix="hedge") if hedge else None
+        self._lock = threading.Lock()
+        self._latency: Dict[str, _EndpointLatency] = {}
+        self.random = random.Random()
+        self.retries = 0
+        self.retries_denied = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def backoff(self, attempt: int) -> float:
+        """Задержка перед повтором номер attempt+1: случайная в [0, base * 2^attempt]"""
+        return self.random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def hedge_delay(self, endpoint: str) -> Optional[float]:
+        """Через сколько секунд отправлять хедж (None - пока мало наблюдений)"""
+        with self._lock:
+            latency = self._latency.get(endpoint)
+            return latency.percentile(self.hedge_quantile, self.hedge_min_samples) if latency else None
+
+    def _timed(self, endpoint: str, send: Callable[[], requests.Response]) -> requests.Response:
+        started = time.perf_counter()
+        response = send()
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            latency = self._latency.get(endpoint)
+            if latency is None:
+                latency = self._latency[endpoint] = _EndpointLatency(self.latency_window)
+            latency.record(elapsed)
+        return response
+
+    @staticmethod
+    def _discard(future: Future):
+        """Ответ проигравшего запроса больше не нужен - вернуть соединение в пул"""
+        if not future.cancelled() and future.exception() is None:
+            future.result().close()
+
+    def _hedged(self, endpoint: str, send: Callable[[], requests.Response]) -> requests.Response:
+        delay = self.hedge_delay(endpoint)
+        if delay is None:
+            return self._timed(endpoint, send)
+
+        primary = self._executor.submit(self._timed, endpoint, send)
+        done, _ = wait([primary], timeout=delay)
+        if done or not self.budget.withdraw():
+            return primary.result()
+
+        with self._lock:
+            self.hedges += 1
+        backup = self._executor.submit(self._timed, endpoint, send)
+        done, _ = wait([primary, backup], return_when=FIRST_COMPLETED)
+        succeeded = [f for f in (primary, backup) if f in done and f.exception() is None]
+        if succeeded:
+            winner = succeeded[0]
+        else:
+            # Первый завершившийся запрос упал - ждём второй (если упали оба - ошибка первичного)
+            pending = [f for f in (primary, backup) if f not in done]
+            if not pending:
+                return primary.result()
+            winner = pending[0]
+            wait([winner])
+        loser = backup if winner is primary else primary
+        if not loser.cancel():
+            loser.add_done_callback(self._discard)
+        if winner is backup:
+            with self._lock:
+                self.hedge_wins += 1
+        return winner.result()
+
+    def _retry_delay(self, attempt: int, response: Optional[requests.Response]) -> float:
+        delay = self.backoff(attempt)
+        if response is not None and response.headers.get("Retry-After"):
+            delay = max(delay, parse_retry_after(response.headers["Retry-After"]))
+        return delay
+
+    def _may_retry(self, attempt: int) -> bool:
+        if attempt + 1 >= self.max_attempts:
+            return False
+        if not self.budget.withdraw():
+            with self._lock:
+                self.retries_denied += 1
+            return False
+        with self._lock:
+            self.retries += 1
+        return True
+
+    def execute(self, endpoint: str, method: str, send: Callable[[], requests.Response]) -> requests.Response:
+        """Выполнение запроса send() по политике"""
+        idempotent = method in IDEMPOTENT_METHODS
+        hedged = self.hedge and method == "GET"
+        self.budget.deposit()
+        attempt = 0
+        while True:
+            try:
+                response = self._hedged(endpoint, send) if hedged else self._timed(endpoint, send)
+            except requests.RequestException as e:
+                retryable = idempotent and isinstance(e, (requests.ConnectionError, requests.Timeout))
+                if not (retryable or isinstance(e, NOT_SENT_ERRORS)) or not self._may_retry(attempt):
+                    raise
+                time.sleep(self._retry_delay(attempt, None))
+            else:
+                if not idempotent or response.status_code not in self.retry_statuses or not self._may_retry(attempt):
+                    return response
+                delay = self._retry_delay(attempt, response)
+                response.close()
+                time.sleep(delay)
+            attempt += 1
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "retries": self.retries,
+                "retries_denied": self.retries_denied,
+                "hedges": self.hedges,
+                "hedge_wins": self.hedge_wins,
+                "budget_tokens": round(self.budget.tokens, 2)
+            }
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
@@ -0,0 +1,60 @@
+import asyncio
+import pytest
+import allure
+
+try:
+    from src.api.async_items_client import AsyncItemsAPIClient
+except ImportError:
+    print("⚠️  Warning: Could not import AsyncItemsAPIClient. Make sure src/ directory exists.")
+
+
+@allure.epic("Items API")
+@allure.feature("Async Client")
+class TestItemsAsync:
+
+    @pytest.fixture(autouse=True)
+    def skip_with_cassette(self, cassette):
+        if cassette is not None:
+            pytest.skip("httpx-клиент не пишется в кассету requests")
+
+    @allure.title("CRUD через асинхронный клиент")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_async_crud(self, item_data, account):
+        """Создание, чтение, обновление и удаление элемента асинхронным клиентом"""
+        async def scenario():
+            async with AsyncItemsAPIClient(username=account.username, password=account.password) as client:
+                item = await client.create_item(item_data)
+                assert item.title == item_data["title"], f"Expected title {item_data['title']}, got {item.title}"
+
+                updated = await client.update_item(item.id, {"title": "Async Updated"})
+                assert updated.title == "Async Updated", f"Expected 'Async Updated', got {updated.title}"
+
+                retrieved = await client.get_item_by_id(item.id)
+                assert retrieved.id == item.id
+
+                assert await client.delete_item(item.id) is True
+
+        asyncio.run(scenario())
+
+    @allure.title("Массовое создание и удаление с ограничением параллелизма")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_async_bulk(self, payload_pool, title_prefix, account):
+        """create_many/delete_many под семафором"""
+        payloads = []
+        for _ in range(10):
+            payload = payload_pool.take()
+            payload["title"] = title_prefix + payload["title"]
+            payloads.append(payload)
+
+        async def scenario():
+            async with AsyncItemsAPIClient(
+                    concurrency=5, username=account.username, password=account.password
+            ) as client:
+                created = await client.create_many(payloads)
+                assert len(created) == len(payloads)
+                assert [item.title for item in created] == [p["title"] for p in payloads]
+
+                deleted = await client.delete_many(item.id for item in created)
+                assert all(result is True for result in deleted)
+
+        asyncio.run(scenario())
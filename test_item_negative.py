@@ -1,10 +1,6 @@
 import pytest
 import allure
-import requests
 import os
-from dotenv import load_dotenv
-
-load_dotenv()
 
 
 @allure.epic("Items API")
@@ -17,9 +13,9 @@ class TestItemsNegative:
 
     @allure.title("Создание элемента без токена (401 Unauthorized)")
     @allure.severity(allure.severity_level.CRITICAL)
-    def test_create_item_without_token(self, base_url, item_data):
+    def test_create_item_without_token(self, base_url, item_data, http_session):
         """Попытка создания элемента без токена"""
-        response = requests.post(
+        response = http_session.post(
             f"{base_url}/api/v1/items/",
             json=item_data,
             headers={"Content-Type": "application/json"}
@@ -30,9 +26,9 @@ class TestItemsNegative:
 
     @allure.title("Получение списка без токена (401 Unauthorized)")
     @allure.severity(allure.severity_level.CRITICAL)
-    def test_get_items_without_token(self, base_url):
+    def test_get_items_without_token(self, base_url, http_session):
         """Попытка получения списка без токена"""
-        response = requests.get(
+        response = http_session.get(
             f"{base_url}/api/v1/items/",
             headers={"Content-Type": "application/json"}
         )
@@ -42,11 +38,11 @@ class TestItemsNegative:
 
     @allure.title("Создание элемента с пустым заголовком")
     @allure.severity(allure.severity_level.NORMAL)
-    def test_create_item_empty_title(self, api_client):
+    def test_create_item_empty_title(self, api_client, http_session):
         """Отправка невалидных данных - пустой заголовок"""
         invalid_data = {"title": "", "description": "Valid description"}
 
-        response = requests.post(
+        response = http_session.post(
             f"{api_client.base_url}/api/v1/items/",
             json=invalid_data,
             headers=api_client.headers
@@ -58,14 +54,14 @@ class TestItemsNegative:
 
     @allure.title("Создание элемента со слишком длинным заголовком")
     @allure.severity(allure.severity_level.NORMAL)
-    def test_create_item_long_title(self, api_client):
+    def test_create_item_long_title(self, api_client, cleanup_registry, http_session):
         """Заголовок > 100 символов"""
         invalid_data = {
             "title": "A" * 101,
             "description": "Valid description"
         }
 
-        response = requests.post(
+        response = http_session.post(
             f"{api_client.base_url}/api/v1/items/",
             json=invalid_data,
             headers=api_client.headers
@@ -74,10 +70,10 @@ class TestItemsNegative:
         # Если API принимает длинные заголовки (200) - это нормально
         if response.status_code == 200:
             print("✓ API принимает длинные заголовки")
-            # Удаляем созданный элемент
+            # Удаляем созданный элемент в конце сессии
             item_id = response.json().get("id")
             if item_id:
-                api_client.delete_item(item_id)
+                cleanup_registry.register(item_id)
         else:
             # Иначе должна быть ошибка валидации
             assert response.status_code in [400, 422], f"Expected 400/422, got {response.status_code}"
@@ -85,13 +81,13 @@ class TestItemsNegative:
 
     @allure.title("Обновление несуществующего элемента")
     @allure.severity(allure.severity_level.NORMAL)
-    def test_update_nonexistent_item(self, api_client):
+    def test_update_nonexistent_item(self, api_client, http_session):
         """Попытка обновления элемента с несуществующим ID"""
         update_data = {"title": "Updated", "description": "Updated"}
         # Используем невалидный UUID
         non_existent_id = "00000000-0000-0000-0000-000000000000"
 
-        response = requests.put(
+        response = http_session.put(
             f"{api_client.base_url}/api/v1/items/{non_existent_id}",
             json=update_data,
             headers=api_client.headers
@@ -103,12 +99,12 @@ class TestItemsNegative:
 
     @allure.title("Удаление несуществующего элемента")
     @allure.severity(allure.severity_level.NORMAL)
-    def test_delete_nonexistent_item(self, api_client):
+    def test_delete_nonexistent_item(self, api_client, http_session):
         """Попытка удаления элемента с несуществующим ID"""
         # Используем невалидный UUID
         non_existent_id = "00000000-0000-0000-0000-000000000000"
 
-        response = requests.delete(
+        response = http_session.delete(
             f"{api_client.base_url}/api/v1/items/{non_existent_id}",
             headers=api_client.headers
         )
@@ -119,7 +115,7 @@ class TestItemsNegative:
 
     @allure.title("Двойное удаление элемента")
     @allure.severity(allure.severity_level.NORMAL)
-    def test_double_delete_item(self, api_client, item_data):
+    def test_double_delete_item(self, api_client, item_data, http_session):
         """Удаление элемента дважды"""
         # Создаем элемент
         item = api_client.create_item(item_data)
@@ -128,7 +124,7 @@ class TestItemsNegative:
         api_client.delete_item(item.id)
 
         # Второе удаление
-        response = requests.delete(
+        response = http_session.delete(
             f"{api_client.base_url}/api/v1/items/{item.id}",
             headers=api_client.headers
         )
@@ -140,7 +136,7 @@ class TestItemsNegative:
 
     @allure.title("Создание элемента с описанием None")
     @allure.severity(allure.severity_level.NORMAL)
-    def test_create_item_none_description(self, api_client):
+    def test_create_item_none_description(self, api_client, cleanup_registry):
         """Description = None (должно работать)"""
         valid_data = {"title": "Valid Title", "description": None}
 
@@ -149,13 +145,13 @@ class TestItemsNegative:
         assert item.title == "Valid Title"
         assert item.description is None
 
-        # Очистка
-        api_client.delete_item(item.id)
+        # Очистка в конце сессии
+        cleanup_registry.register(item.id)
         print("✓ Создание с description=None работает")
 
     @allure.title("Проверка отсутствия 500 ошибок")
     @allure.severity(allure.severity_level.CRITICAL)
-    def test_no_500_on_client_errors(self, api_client, base_url):
+    def test_no_500_on_client_errors(self, api_client, base_url, http_session):
         """Убедиться, что нет 500 ошибок при ошибках пользователя"""
         test_cases = [
             ("POST с неверными типами данных", "POST", f"{base_url}/api/v1/items/", {"title": 123, "description": 456}),
@@ -165,15 +161,212 @@ class TestItemsNegative:
 
         for name, method, url, data in test_cases:
             if method == "POST":
-                response = requests.post(url, json=data, headers=api_client.headers)
+                response = http_session.post(url, json=data, headers=api_client.headers)
             elif method == "PUT":
-                response = requests.put(url, json=data, headers=api_client.headers)
+                response = http_session.put(url, json=data, headers=api_client.headers)
             elif method == "DELETE":
-                response = requests.delete(url, headers=api_client.headers)
+                response = http_session.delete(url, headers=api_client.headers)
 
             # Проверяем, что нет 500 ошибки
             assert response.status_code != 500, f"500 ошибка для {name}"
             # Должна быть клиентская ошибка (4xx)
             assert 400 <= response.status_code < 500, f"Не клиентская ошибка ({response.status_code}) для {name}"
 
-            print(f"✓ Нет 500 ошибки для: {name}")
\ No newline at end of file
+            print(f"✓ Нет 500 ошибки для: {name}")
+
+    @allure.title("Fuzz по ограничениям схем: нет 5xx и 2xx на невалидные данные")
+    @allure.severity(allure.severity_level.CRITICAL)
+    def test_fuzz_no_server_errors(self, api_client, cleanup_registry, cassette, offline_api):
+        """Тысячи граничных запросов (длины ±1, None, типы, unicode, тела, ID) параллельно"""
+        import requests
+        from fuzz_engine import FuzzEngine, ITEMS_PATH, build_cases
+
+        # Отдельный элемент без префикса воркера: PUT-случаи переписывают его заголовок
+        target_data = {"title": "Fuzz target", "description": None}
+        if cassette is not None and cassette.mode == "replay":
+            # Кассета могла быть записана без fuzz (против BASE_URL без FUZZ_REAL_API)
+            probe = requests.Request("POST", f"{api_client.base_url}{ITEMS_PATH}", json=target_data).prepare()
+            if probe not in cassette:
+                pytest.skip("В кассете нет fuzz-обменов (запись с --fake-api или FUZZ_REAL_API=1)")
+        # ~4k запросов в 32 потока, тела до 2 МБ - общий API только по явному согласию
+        elif not offline_api and os.getenv("FUZZ_REAL_API", "").lower() not in ("1", "true", "yes"):
+            pytest.skip("Fuzz против BASE_URL включается FUZZ_REAL_API=1 (с --fake-api - всегда)")
+
+        target = api_client.create_item(target_data)
+        cleanup_registry.register(target.id)
+
+        cases = build_cases(existing_id=target.id, max_cases=int(os.getenv("FUZZ_MAX_CASES", "5000")))
+        with FuzzEngine(
+                api_client.base_url,
+                api_client.headers,
+                workers=int(os.getenv("FUZZ_WORKERS", "32")),
+                cassette=cassette
+        ) as engine:
+            report = engine.run(cases)
+
+        for item_id in report.created_ids:
+            cleanup_registry.register(item_id)
+
+        summary = report.summary()
+        print(summary)
+        allure.attach(summary, name="Fuzz report", attachment_type=allure.attachment_type.TEXT)
+        assert not report.failures, summary
+
+    @allure.title("Fuzz-случаи записываются в кассету и воспроизводятся из неё")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_fuzz_cassette_roundtrip(self, tmp_path):
+        """Суррогаты, глубокая вложенность и большие тела не ломают запись и replay кассеты"""
+        import requests
+        from fake_server import FakeItemsServer
+        from fuzz_engine import FuzzEngine, body_cases, raw_body_cases
+        from src.api.cassette import Cassette
+        from src.models.schemas import ItemCreate
+
+        def make_cases():
+            # Случаи строятся заново для replay - как в отдельном процессе pytest
+            return raw_body_cases() + [
+                case for case in body_cases(ItemCreate, "POST", "/api/v1/items/", combine=False)
+                if "surrogate" in case.name or "cjk" in case.name
+            ]
+
+        path = tmp_path / "fuzz.jsonl"
+
+        with FakeItemsServer() as server:
+            token = requests.post(
+                f"{server.url}/api/v1/login/access-token",
+                data={"username": "fuzz@example.com", "password": "fuzz-password"}
+            ).json()["access_token"]
+            headers = {"Authorization": f"Bearer {token}"}
+
+            with allure.step("Запись"):
+                cassette = Cassette(str(path), "record")
+                with FuzzEngine(server.url, headers, workers=4, cassette=cassette) as engine:
+                    recorded = engine.run(make_cases())
+                cassette.close()
+
+        with allure.step("Воспроизведение без сервера"):
+            cassette = Cassette(str(path), "replay")
+            with FuzzEngine(server.url, headers, workers=4, cassette=cassette) as engine:
+                replayed = engine.run(make_cases())
+            cassette.close()
+
+        statuses = {result.case.name: result.status for result in recorded.results}
+        assert None not in statuses.values(), recorded.summary()
+        assert {result.case.name: result.status for result in replayed.results} == statuses
+
+
+@allure.epic("Items API")
+@allure.feature("Retry Policy")
+class TestRetryPolicy:
+    """Повторы, бюджет и хеджирование RetryPolicy на заглушке отправки (без сети)"""
+
+    @staticmethod
+    def stub_send(statuses, delays=()):
+        """send() для RetryPolicy.execute: статусы ответов по порядку вызовов; calls - число вызовов"""
+        import io
+        import time
+        import requests
+
+        calls = []
+
+        def send():
+            index = len(calls)
+            calls.append(index)
+            if index < len(delays):
+                time.sleep(delays[index])
+            status = statuses[min(index, len(statuses) - 1)]
+            if isinstance(status, Exception):
+                raise status
+            response = requests.Response()
+            response.status_code = status
+            response.raw = io.BytesIO(b"")
+            response.reason = str(index)
+            return response
+
+        return send, calls
+
+    @allure.title("GET повторяется на retry-статусах до успеха")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_retry_on_retryable_status(self):
+        from src.api.retry_policy import RetryBudget, RetryPolicy
+
+        policy = RetryPolicy(max_attempts=3, base_delay=0, budget=RetryBudget(ratio=0.1, max_tokens=10))
+        send, calls = self.stub_send([503, 429, 200])
+
+        response = policy.execute("list", "GET", send)
+
+        assert response.status_code == 200
+        assert len(calls) == 3, f"Expected 3 attempts, got {len(calls)}"
+        stats = policy.stats()
+        assert stats["retries"] == 2 and stats["retries_denied"] == 0, stats
+        # Запрос пополнил бюджет на ratio (до потолка), два повтора потратили по токену
+        assert stats["budget_tokens"] == 8.0, stats
+
+    @allure.title("POST не повторяется, если запрос мог дойти до сервера")
+    @allure.severity(allure.severity_level.CRITICAL)
+    def test_no_retry_for_post(self):
+        import requests
+        from src.api.retry_policy import RetryPolicy
+
+        policy = RetryPolicy(max_attempts=3, base_delay=0)
+        send, calls = self.stub_send([503, 200])
+        assert policy.execute("create", "POST", send).status_code == 503
+        assert len(calls) == 1, f"POST on 503 was retried: {len(calls)} attempts"
+
+        send, calls = self.stub_send([requests.exceptions.ReadTimeout("read"), 200])
+        with pytest.raises(requests.exceptions.ReadTimeout):
+            policy.execute("create", "POST", send)
+        assert len(calls) == 1, f"POST after read timeout was retried: {len(calls)} attempts"
+
+        # Таймаут подключения - запрос не ушёл, повтор безопасен
+        send, calls = self.stub_send([requests.exceptions.ConnectTimeout("connect"), 201])
+        assert policy.execute("create", "POST", send).status_code == 201
+        assert len(calls) == 2
+        assert policy.stats()["retries"] == 1
+
+    @allure.title("Исчерпанный бюджет останавливает повторы")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_retry_budget_exhausted(self):
+        from src.api.retry_policy import RetryBudget, RetryPolicy
+
+        policy = RetryPolicy(max_attempts=5, base_delay=0, budget=RetryBudget(ratio=0.0, max_tokens=1))
+        send, calls = self.stub_send([503])
+
+        assert policy.execute("list", "GET", send).status_code == 503
+        assert len(calls) == 2, f"Expected 1 attempt + 1 budgeted retry, got {len(calls)}"
+        stats = policy.stats()
+        assert stats["retries"] == 1 and stats["retries_denied"] == 1, stats
+        assert stats["budget_tokens"] == 0, stats
+
+        send, calls = self.stub_send([503])
+        policy.execute("list", "GET", send)
+        assert len(calls) == 1, "Retried with an empty budget"
+        assert policy.stats()["retries_denied"] == 2
+
+    @allure.title("Хедж GET возвращает первый пришедший ответ")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_hedged_get_returns_first_response(self):
+        import time
+        from src.api.retry_policy import RetryPolicy
+
+        policy = RetryPolicy(base_delay=0, hedge=True, hedge_min_samples=5)
+        try:
+            # Набор наблюдений: p95 эндпоинта ~ 10 мс
+            warmup, _ = self.stub_send([200], delays=[0.01] * 5)
+            for _ in range(5):
+                policy.execute("get", "GET", warmup)
+            assert policy.stats()["hedges"] == 0
+
+            # Первичный запрос зависает, хедж уходит после p95 и отвечает сразу
+            send, calls = self.stub_send([200], delays=[1.0])
+            started = time.perf_counter()
+            response = policy.execute("get", "GET", send)
+            elapsed = time.perf_counter() - started
+
+            assert len(calls) == 2, f"Expected primary + hedge, got {len(calls)}"
+            assert response.reason == "1", "Response of the hung primary request was returned"
+            assert elapsed < 0.5, f"Hedged GET took {elapsed:.3f}s"
+            stats = policy.stats()
+            assert stats["hedges"] == 1 and stats["hedge_wins"] == 1, stats
+        finally:
+            policy.close()
@@ -7,13 +7,23 @@ from typing import Dict, Any
 @allure.feature("Positive Tests")
 class TestItemsPositive:
 
+    @pytest.fixture
+    def listed_items(self, request, api_client, items_snapshot, payload_pool, title_prefix, cleanup_registry):
+        """Снимок, в котором не меньше пяти элементов воркера - чтобы было что листать и сортировать"""
+        for i in range(5 - len(items_snapshot)):
+            data = payload_pool.pick(f"{request.node.nodeid}:{i}")
+            data["title"] = title_prefix + data["title"]
+            cleanup_registry.register(api_client.create_item(data).id)
+        return items_snapshot
+
     @allure.title("Создание нового элемента (валидные данные)")
     @allure.severity(allure.severity_level.CRITICAL)
     @allure.description("Тестирование POST /api/v1/items/ с валидными данными")
-    def test_create_item(self, api_client, item_data: Dict[str, Any]):
+    def test_create_item(self, api_client, item_data: Dict[str, Any], cleanup_registry):
         """POST /api/v1/items/ - создание нового элемента"""
         with allure.step("Создание элемента через API"):
             item = api_client.create_item(item_data)
+            cleanup_registry.register(item.id)
 
         with allure.step("Проверка ответа"):
             assert item.id is not None, "Item ID should not be None"
@@ -35,6 +45,19 @@ class TestItemsPositive:
             attachment_type=allure.attachment_type.TEXT
         )
 
+    @allure.title("Создание элементов с граничными значениями полей")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_create_item_boundary_values(self, api_client, cleanup_registry, payload_pool, title_prefix):
+        """Минимальная и максимальная длина полей, None для необязательных (должно работать)"""
+        for data in payload_pool.take_boundary(title_prefix):
+            item = api_client.create_item(data)
+            cleanup_registry.register(item.id)
+
+            assert item.title == data["title"], f"Expected title of length {len(data['title'])}, got {item.title!r}"
+            assert item.description == data["description"], \
+                f"Expected description {data['description']!r:.30}, got {item.description!r:.30}"
+        print("✓ Граничные значения полей принимаются")
+
     @allure.title("Получение списка элементов")
     @allure.severity(allure.severity_level.CRITICAL)
     def test_get_items_structure(self, api_client):
@@ -72,7 +95,7 @@ class TestItemsPositive:
 
     @allure.title("Проверка пагинации")
     @allure.severity(allure.severity_level.NORMAL)
-    def test_pagination(self, api_client):
+    def test_pagination(self, api_client, listed_items, title_prefix, offline_api):
         """GET /api/v1/items/ - проверка пагинации"""
         # Проверяем что параметры page и size работают
         with allure.step("Получение с разными размерами страниц"):
@@ -111,9 +134,19 @@ class TestItemsPositive:
             attachment_type=allure.attachment_type.TEXT
         )
 
+        with allure.step("Сверка страниц со снимком"):
+            # Точный срез - только против fake-сервера, у общего API порядок при равенстве не задан
+            seen_ids = []
+            for page in (1, 2, 3):
+                response = api_client.get_items(page=page, size=2, search=title_prefix)
+                problems = listed_items.verify(response, page=page, size=2, search=title_prefix, exact=offline_api)
+                assert not problems, "\n".join(problems)
+                seen_ids.extend(item.id for item in response.data)
+            assert len(seen_ids) == len(set(seen_ids)), f"Pages overlap: {seen_ids}"
+
     @allure.title("Проверка сортировки")
     @allure.severity(allure.severity_level.NORMAL)
-    def test_sorting(self, api_client):
+    def test_sorting(self, api_client, listed_items, title_prefix, offline_api):
         """GET /api/v1/items/ - проверка сортировки"""
         with allure.step("Проверка параметров сортировки"):
             # Пытаемся отсортировать разными способами
@@ -146,9 +179,35 @@ class TestItemsPositive:
             attachment_type=allure.attachment_type.TEXT
         )
 
+        with allure.step("Сверка порядка со снимком"):
+            for sort_by in ("created_at", "title"):
+                for order in ("asc", "desc"):
+                    response = api_client.get_items(sort_by=sort_by, order=order, search=title_prefix)
+                    problems = listed_items.verify(
+                        response, sort_by=sort_by, order=order, search=title_prefix, exact=offline_api
+                    )
+                    assert not problems, "\n".join(problems)
+
+    @allure.title("Колоночная выгрузка совпадает со списком")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_scan_items_columnar(self, api_client, listed_items, title_prefix):
+        """scan_items (колоночно, по страницам) - те же элементы, что и get_items"""
+        with allure.step("Выгрузка по страницам из двух элементов"):
+            scanned = api_client.scan_items(size=2, search=title_prefix)
+
+        with allure.step("Сверка с get_items"):
+            listed = api_client.get_items(size=100, search=title_prefix)
+            assert scanned.count == listed.count, f"Expected count {listed.count}, got {scanned.count}"
+            assert len(scanned.data) == len(listed.data), \
+                f"Expected {len(listed.data)} rows, got {len(scanned.data)}"
+            # Порядок при равных created_at у реального API не гарантирован - сверяем по ID
+            expected = {item.id: item.dict() for item in listed.data}
+            actual = {item.id: item.dict() for item in scanned.data}
+            assert actual == expected, "Columnar rows differ from get_items"
+
     @allure.title("Полное обновление элемента")
     @allure.severity(allure.severity_level.CRITICAL)
-    def test_update_item(self, api_client, created_item):
+    def test_update_item(self, api_client, pooled_item):
         """PUT /api/v1/items/{id} - полное обновление"""
         update_data = {
             "title": "Updated Title",
@@ -156,7 +215,7 @@ class TestItemsPositive:
         }
 
         with allure.step("Обновление элемента"):
-            updated_item = api_client.update_item(created_item.id, update_data)
+            updated_item = api_client.update_item(pooled_item.id, update_data)
 
         with allure.step("Проверка обновленных данных"):
             assert updated_item.title == update_data[
@@ -165,7 +224,7 @@ class TestItemsPositive:
                 "description"], f"Expected description {update_data['description']}, got {updated_item.description}"
 
         with allure.step("Получение элемента для проверки"):
-            retrieved_item = api_client.get_item_by_id(created_item.id)
+            retrieved_item = api_client.get_item_by_id(pooled_item.id)
             assert retrieved_item.title == update_data[
                 "title"], f"Expected title {update_data['title']}, got {retrieved_item.title}"
             assert retrieved_item.description == update_data[
@@ -173,9 +232,9 @@ class TestItemsPositive:
 
         allure.attach(
             f"Update test results:\n"
-            f"Original title: {created_item.title}\n"
+            f"Original title: {pooled_item.title}\n"
             f"Updated title: {updated_item.title}\n"
-            f"Original description: {created_item.description}\n"
+            f"Original description: {pooled_item.description}\n"
             f"Updated description: {updated_item.description}",
             name="Update Results",
             attachment_type=allure.attachment_type.TEXT
@@ -183,22 +242,22 @@ class TestItemsPositive:
 
     @allure.title("Частичное обновление элемента")
     @allure.severity(allure.severity_level.NORMAL)
-    def test_partial_update(self, api_client, created_item):
+    def test_partial_update(self, api_client, pooled_item):
         """PUT /api/v1/items/{id} - обновление только заголовка"""
         update_data = {"title": "Only Title Updated"}
 
         with allure.step("Частичное обновление"):
-            updated_item = api_client.update_item(created_item.id, update_data)
+            updated_item = api_client.update_item(pooled_item.id, update_data)
 
         with allure.step("Проверка частичного обновления"):
             assert updated_item.title == update_data[
                 "title"], f"Expected title {update_data['title']}, got {updated_item.title}"
             # Описание должно остаться прежним
-            assert updated_item.description == created_item.description, f"Description changed unexpectedly: {updated_item.description}"
+            assert updated_item.description == pooled_item.description, f"Description changed unexpectedly: {updated_item.description}"
 
     @allure.title("Удаление элемента")
     @allure.severity(allure.severity_level.CRITICAL)
-    def test_delete_item(self, api_client, item_data):
+    def test_delete_item(self, api_client, item_data, http_session):
         """DELETE /api/v1/items/{id} - удаление элемента"""
         with allure.step("Создание элемента для удаления"):
             item = api_client.create_item(item_data)
@@ -209,8 +268,7 @@ class TestItemsPositive:
             assert delete_result is True, "Delete should return True"
 
         with allure.step("Проверка, что элемент удален"):
-            import requests
-            response = requests.get(
+            response = http_session.get(
                 f"{api_client.base_url}/api/v1/items/{item_id}",
                 headers=api_client.headers
             )
@@ -225,4 +283,104 @@ class TestItemsPositive:
             f"Status after delete: {response.status_code}",
             name="Delete Results",
             attachment_type=allure.attachment_type.TEXT
-        )
\ No newline at end of file
+        )
+
+
+@allure.epic("Items API")
+@allure.feature("Read Cache")
+class TestReadCache:
+    """Кэш чтения клиента против отдельного fake-сервера: счётчики кэша и реальные GET"""
+
+    @pytest.fixture
+    def cached_client(self, monkeypatch):
+        """(клиент с ReadCache(max_items=2, ttl=0.2), счётчик GET-запросов по эндпоинтам)"""
+        from collections import Counter
+        from fake_server import FakeItemsServer
+        from src.api.items_client import ItemsAPIClient
+        from src.api.metrics import ClientHook
+        from src.api.read_cache import ReadCache
+
+        class GetCounter(ClientHook):
+            def __init__(self):
+                self.gets = Counter()
+                self.statuses = Counter()
+
+            def on_request(self, event):
+                if event.method == "GET":
+                    self.gets[event.endpoint] += 1
+                    self.statuses[event.status] += 1
+
+        counter = GetCounter()
+        with FakeItemsServer() as server:
+            monkeypatch.setenv("BASE_URL", server.url)
+            client = ItemsAPIClient(
+                read_cache=ReadCache(max_items=2, max_pages=8, ttl=0.2),
+                hooks=[counter],
+                token_cache=False,
+                journal=False,
+                username="cache@example.com",
+                password="cache-password"
+            )
+            yield client, counter
+            client.close()
+
+    @allure.title("Свежая запись - без запроса, устаревшая - перепроверка ETag (304)")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_ttl_and_etag_revalidation(self, cached_client):
+        import time
+
+        client, counter = cached_client
+        item = client.create_item({"title": "Cached item", "description": None})
+        client.read_cache.invalidate_item(item.id)
+
+        first = client.get_item_by_id(item.id)
+        assert counter.gets["get"] == 1
+        assert client.get_item_by_id(item.id) is first, "Fresh entry was not served from cache"
+        assert counter.gets["get"] == 1, "Fresh entry caused a request"
+
+        time.sleep(0.25)
+        assert client.get_item_by_id(item.id) is first, "Revalidated entry was replaced"
+        assert counter.gets["get"] == 2 and counter.statuses[304] == 1, "Stale entry was not revalidated with 304"
+
+        stats = client.read_cache.stats()
+        assert (stats["hits"], stats["misses"], stats["revalidated"]) == (1, 2, 1), stats
+
+    @allure.title("Обновление и удаление сбрасывают закэшированные GET")
+    @allure.severity(allure.severity_level.CRITICAL)
+    def test_write_invalidates_cached_get(self, cached_client):
+        from requests import HTTPError
+
+        client, counter = cached_client
+        item = client.create_item({"title": "Before update", "description": None})
+
+        client.get_items(size=5)
+        client.get_items(size=5)
+        assert counter.gets["list"] == 1, "Second list call was not served from cache"
+
+        client.update_item(item.id, {"title": "After update"})
+        listed = client.get_items(size=5)
+        assert counter.gets["list"] == 2, "Update did not invalidate cached pages"
+        assert [i.title for i in listed.data] == ["After update"]
+        assert client.get_item_by_id(item.id).title == "After update"
+
+        client.delete_item(item.id)
+        with pytest.raises(HTTPError) as error:
+            client.get_item_by_id(item.id)
+        assert error.value.response.status_code == 404, "Deleted item was served from cache"
+        assert client.get_items(size=5).count == 0
+
+    @allure.title("LRU вытесняет самый давно использованный элемент")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_lru_eviction(self, cached_client):
+        client, counter = cached_client
+        first, second, third = (client.create_item({"title": f"LRU {n}", "description": None}) for n in range(3))
+
+        stats = client.read_cache.stats()
+        assert stats["items"] == 2 and stats["evictions"] == 1, stats
+
+        client.get_item_by_id(third.id)
+        client.get_item_by_id(second.id)
+        assert counter.gets["get"] == 0, "Cached items caused requests"
+        client.get_item_by_id(first.id)
+        assert counter.gets["get"] == 1, "Evicted item was not fetched again"
+        assert client.read_cache.stats()["evictions"] == 2
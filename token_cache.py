@@ -0,0 +1,111 @@
+import base64
+import hashlib
+import json
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Optional, Dict, Any
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+DEFAULT_CACHE_PATH = Path.home() / ".cache" / "items_api" / "tokens.json"
+
+
+def jwt_expiry(token: str) -> Optional[float]:
+    """Время истечения токена (поле exp из payload JWT) или None"""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        claims = json.loads(base64.urlsafe_b64decode(payload))
+        return float(claims["exp"])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+class TokenCache:
+    """Дисковый кэш токенов доступа, общий для всех процессов
+
+    Ключ - base URL + пользователь. Чтение и обновление выполняются под
+    файловой блокировкой, поэтому параллельные процессы (xdist, несколько
+    запусков скрипта) выполняют один логин на всех.
+
+    refresh_margin - за сколько секунд до exp считать токен устаревшим
+    default_ttl - срок жизни токена, если в нём нет exp
+    """
+
+    def __init__(
+            self,
+            path: Optional[str] = None,
+            refresh_margin: float = 60.0,
+            default_ttl: float = 15 * 60
+    ):
+        self.path = Path(path or os.getenv("TOKEN_CACHE_PATH") or DEFAULT_CACHE_PATH)
+        self.lock_path = self.path.with_name(self.path.name + ".lock")
+        self.refresh_margin = refresh_margin
+        self.default_ttl = default_ttl
+
+    @staticmethod
+    def make_key(base_url: str, username: Optional[str]) -> str:
+        return hashlib.sha256(f"{base_url.rstrip('/')}|{username or ''}".encode()).hexdigest()
+
+    @contextmanager
+    def _locked(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_path, "a+") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+                else:
+                    lock_file.seek(0)
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def _read(self) -> Dict[str, Any]:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _write(self, entries: Dict[str, Any]):
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        # Токены - только для владельца: права задаются при создании (остаток прошлого запуска удаляем)
+        tmp_path.unlink(missing_ok=True)
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with open(fd, "w", encoding="utf-8") as f:
+            json.dump(entries, f)
+        os.replace(tmp_path, self.path)
+
+    def _is_fresh(self, entry: Optional[Dict[str, Any]]) -> bool:
+        return bool(entry) and entry["expires_at"] - self.refresh_margin > time.time()
+
+    def get_or_fetch(self, key: str, fetch: Callable[[], str], stale_token: Optional[str] = None) -> str:
+        """Вернуть свежий токен из кэша или получить новый через fetch()
+
+        stale_token - токен, который сервер уже отверг (401): он не будет
+        возвращён, даже если по exp ещё считается действующим.
+        """
+        with self._locked():
+            entries = self._read()
+            entry = entries.get(key)
+            if self._is_fresh(entry) and entry["token"] != stale_token:
+                return entry["token"]
+
+            token = fetch()
+            expires_at = jwt_expiry(token) or time.time() + self.default_ttl
+            entries = {k: v for k, v in entries.items() if self._is_fresh(v)}
+            entries[key] = {"token": token, "expires_at": expires_at}
+            self._write(entries)
+            return token